@@ -1,15 +1,54 @@
+'''
+Re-exporting modules for easier access.
 
+Re-exports are resolved lazily (PEP 562): the submodule is only imported the first time one
+of its names is accessed. This keeps e.g. `from aspen import PhysicsConstants` from pulling in
+matplotlib and building the colormaps in colors.py.
+'''
 
-# Re-exporting modules for easier access
-from .constants_conversions import PhysicsConstants, AstroConstantsAndUsefulNumbers, ConversionsAndDerivedUnits, WorldData
+import importlib
 
-# Color dictionaries 
-from .colors import SMC_COLORS, NORTHWESTERN_COLORS, UCB_COLORS, ORUST_COLORS
+# Public name -> submodule that defines it
+_LAZY_ATTRS: dict[str, str] = {
+    # Constants and conversions
+    "PhysicsConstants": "constants_conversions",
+    "AstroConstantsAndUsefulNumbers": "constants_conversions",
+    "ConversionsAndDerivedUnits": "constants_conversions",
+    "WorldData": "constants_conversions",
 
-# Color maps 
-from .colors import SMC_cmap, NU_cmap, UCB_cmap, teal2_cmap, ORUST_cmap
+    # Color dictionaries
+    "SMC_COLORS": "colors",
+    "NORTHWESTERN_COLORS": "colors",
+    "UCB_COLORS": "colors",
+    "ORUST_COLORS": "colors",
 
-# Simple calculations
-from .simple_calculations import scientific_notation
+    # Color maps
+    "SMC_cmap": "colors",
+    "NU_cmap": "colors",
+    "UCB_cmap": "colors",
+    "teal2_cmap": "colors",
+    "ORUST_cmap": "colors",
 
+    # Simple calculations
+    "scientific_notation": "simple_calculations",
+}
 
+_SUBMODULES: tuple[str, ...] = ("constants_conversions", "constants_cgs", "constants_natural", "constants_geometric",
+                                "colors", "plotting", "simple_calculations")
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value  # cache so __getattr__ is skipped next time
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | set(_SUBMODULES))
@@ -0,0 +1,202 @@
+'''
+Parallel batch rendering of per-assessment histograms (gen_IntegerHisto) in a process pool.
+
+Every worker uses the Agg backend, renders each job into its own figure inside a matplotlib rc_context
+(so no pyplot or rcParams state leaks between jobs), closes the figure afterwards, and is recycled
+after max_tasks_per_child jobs to keep memory bounded. Failures are captured per job (with traceback)
+and never abort the batch. A worker that dies (e.g. killed for memory) breaks its whole pool: the
+failure is recorded for the job it was running, and the jobs that had not started go to a fresh pool.
+
+e.g.,
+from aspen.batch import render_histograms
+
+jobs = [(scores_q1, Qinfo, letters, bins, ticks, 'q1.png'), (scores_q2, Qinfo, letters, bins, ticks, 'q2.png')]
+results = render_histograms(jobs, cbar='smc_cmap', workers=8)
+failed = [r for r in results if not r.ok]
+'''
+
+import contextlib
+import multiprocessing
+import os
+import time
+import traceback
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+DEFAULT_MAX_TASKS_PER_CHILD: int = 50
+
+
+@dataclass
+class HistogramJob:
+    """
+    One gen_IntegerHisto call. maxScore defaults to Qinfo["numPoints"].
+    cbar may be a colormap, or a name ('SMC_cmap' attribute or registered 'smc_cmap') resolved in the worker.
+    theme may be a themes.Theme or a themes.THEMES name (e.g. 'ucb').
+    """
+    scores: Sequence[float]
+    Qinfo: dict
+    letters: dict
+    bins: object
+    tick_list: list
+    outname: str
+    title: str = ''
+    maxScore: int | None = None
+    cbar: object = None
+    theme: object = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one job: wall time in seconds, and the error / traceback if it failed."""
+    index: int
+    outname: str
+    seconds: float
+    error: str | None = None
+    traceback: str | None = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_STARTED = None  # in a worker: queue on which each job announces its index when it starts
+
+
+def _worker_init(started=None) -> None:
+    global _STARTED
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    _STARTED = started
+
+
+def _resolve_cmap(cbar):
+    if not isinstance(cbar, str):
+        return cbar
+    import matplotlib
+    from . import colors
+    if cbar in colors._LAZY_CMAPS:
+        return getattr(colors, cbar)
+    colors.register_aspen_colormaps()
+    return matplotlib.colormaps[cbar]
+
+
+def _render_one(index: int, job: HistogramJob, default_cbar, rc: dict | None, default_theme=None) -> BatchResult:
+    """Render a single job in a fresh figure (runs inside a worker process)."""
+    import numpy as np
+    import matplotlib.pyplot as plt
+    from .plotting import gen_IntegerHisto
+    from .themes import get_theme
+
+    if _STARTED is not None:
+        _STARTED.put(index)  # so a worker crash can be blamed on this job only
+    t0 = time.perf_counter()
+    fig = None
+    try:
+        theme = get_theme(job.theme if job.theme is not None else default_theme)
+        with theme.context() if theme is not None else contextlib.nullcontext(), plt.rc_context(rc):
+            fig = plt.figure()
+            maxScore = job.Qinfo["numPoints"] if job.maxScore is None else job.maxScore
+            cbar = _resolve_cmap(job.cbar if job.cbar is not None else default_cbar)
+            gen_IntegerHisto(np.array(job.scores, dtype=float), maxScore, job.Qinfo, job.letters, job.title,
+                             job.bins, job.tick_list, cbar, outname=job.outname)
+        return BatchResult(index, job.outname, time.perf_counter() - t0)
+    except Exception as err:
+        return BatchResult(index, job.outname, time.perf_counter() - t0, error=repr(err),
+                           traceback=traceback.format_exc())
+    finally:
+        if fig is not None:
+            plt.close(fig)
+        plt.close('all')
+
+
+def _as_job(job) -> HistogramJob:
+    """Accept a HistogramJob or a (scores, Qinfo, letters, bins, ticks, outname[, title]) tuple."""
+    return job if isinstance(job, HistogramJob) else HistogramJob(*job)
+
+
+def _run_pool(ids: Sequence[int], jobs: list[HistogramJob], results: list, workers: int, cbar, rc,
+              theme) -> tuple[list[int], list[int], BaseException | None]:
+    """
+    Run jobs[ids] in a fresh pool, filling results. If a worker dies, returns the unfinished jobs that
+    had started (one of them crashed the worker) and those that never started, and the pool's error.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    started = ctx.SimpleQueue()
+    broken = None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_worker_init,
+                             initargs=(started,)) as pool:
+        futures = {pool.submit(_render_one, i, jobs[i], cbar, rc, theme): i for i in ids}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except BrokenProcessPool as err:  # every pending future fails, not only the crashed job's
+                broken = err
+                break
+            except Exception as err:
+                results[i] = BatchResult(i, jobs[i].outname, float('nan'), error=repr(err),
+                                         traceback=traceback.format_exc())
+    if broken is None:
+        started.close()
+        return [], [], None
+    ran = set()
+    while not started.empty():
+        ran.add(started.get())
+    started.close()
+    unfinished = [i for i in ids if results[i] is None]
+    return [i for i in unfinished if i in ran], [i for i in unfinished if i not in ran], broken
+
+
+def render_histograms(jobs: Iterable, cbar='SMC_cmap', workers: int | None = None, rc: dict | None = None,
+                      theme=None, max_tasks_per_child: int = DEFAULT_MAX_TASKS_PER_CHILD,
+                      verbose: bool = True) -> list[BatchResult]:
+    """
+    Render many gen_IntegerHisto jobs in parallel processes.
+
+    Args:
+        jobs (iterable): HistogramJob objects or (scores, Qinfo, letters, bins, ticks, outname[, title]) tuples.
+        cbar (colormap or str, opt = 'SMC_cmap'): Colormap for jobs that do not set their own.
+        workers (int, optional): Worker processes (default os.cpu_count()).
+        rc (dict, optional): rcParams applied to every job (e.g. plotting.common_rcParams), on top of the theme.
+        theme (Theme or str, optional): themes.Theme (or THEMES name) for jobs that do not set their own.
+        max_tasks_per_child (int, opt = DEFAULT_MAX_TASKS_PER_CHILD): Jobs before a worker is replaced (bounds memory).
+        verbose (bool, opt = True): Print a one-line summary.
+
+    Returns:
+        list[BatchResult]: One result per job, in job order.
+    """
+    jobs = [_as_job(j) for j in jobs]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    results: list[BatchResult | None] = [None]*len(jobs)
+
+    t0 = time.perf_counter()
+    # Fresh 'spawn' workers (no inherited pyplot state). Each pool handles at most max_tasks_per_child
+    # jobs per worker and is then replaced, which bounds memory. (Recycling whole pools rather than using
+    # ProcessPoolExecutor(max_tasks_per_child=...), which can deadlock on Python 3.11.)
+    # A dead worker breaks its pool: the jobs that were running are rerun alone (so only the one that
+    # crashes fails), and the jobs that never started go back to the front of the queue.
+    wave = max(1, workers*max_tasks_per_child)
+    todo = list(range(len(jobs)))
+    while todo:
+        running, not_run, broken = _run_pool(todo[:wave], jobs, results, workers, cbar, rc, theme)
+        todo = todo[wave:]
+        if broken is None:
+            continue
+        if not running:  # died before any job started: find the culprit one job at a time
+            running, not_run = not_run, []
+        for i in running:
+            if len(running) > 1:
+                alone, never, broken = _run_pool([i], jobs, results, 1, cbar, rc, theme)
+                if not alone and not never:
+                    continue
+            results[i] = BatchResult(i, jobs[i].outname, float('nan'), error=repr(broken),
+                                     traceback=''.join(traceback.format_exception(broken)))
+        todo = not_run + todo
+
+    if verbose:
+        failed = sum(not r.ok for r in results)
+        print(f'Rendered {len(jobs) - failed}/{len(jobs)} histograms in {time.perf_counter() - t0:.1f} s '
+              f'({failed} failed)')
+    return results
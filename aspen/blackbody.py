@@ -0,0 +1,154 @@
+'''
+Planck blackbody spectra on large (temperature, wavelength) grids.
+
+B_lambda(T) = 2 h c^2 / lambda^5 / (exp(hc / (lambda k T)) - 1), in SI (W m^-2 sr^-1 m^-1).
+
+The exponent is evaluated with expm1 and, in the Wien tail, as exp(-x) / (1 - exp(-x)), so nothing
+overflows: very large x simply underflows to 0. Grids are evaluated in blocks of temperatures sized
+to a memory budget, optionally straight into a caller-provided (or memory-mapped) output array.
+
+e.g.,
+import numpy as np
+import aspen.blackbody as bb
+
+T = np.logspace(3, 5, 20_000)            # K
+lam = np.linspace(1e-7, 3e-6, 50_000)    # m
+out = np.lib.format.open_memmap('B.npy', mode='w+', dtype=np.float64, shape=(T.size, lam.size))
+bb.planck_grid(T, lam, out=out, memory_budget=256*2**20)
+'''
+
+import numpy as np
+
+from .constants_conversions import PhysicsConstants
+
+_H = PhysicsConstants.H_PLANCK
+_C = PhysicsConstants.C_LIGHT
+_K = PhysicsConstants.K_BOLTZMANN
+_SIGMA = PhysicsConstants.SB_CONSTANT
+
+DEFAULT_MEMORY_BUDGET: int = 128 * 2**20  # bytes of float64 scratch per block
+
+# Beyond this hc/(lambda k T) the Wien form is used (exp(-x) is then exact enough and avoids exp overflow)
+_WIEN_SWITCH: float = 30.0
+
+
+def _planck_block(T: np.ndarray, lam: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """B_lambda for a (nT, 1) temperature column and (1, nlam) wavelength row, written into out."""
+    x = np.empty(out.shape, dtype=np.float64)
+    np.divide(_H*_C/(_K*lam), T, out=x)  # hc / (lambda k T)
+    prefac = 2*_H*_C**2/lam**5  # (1, nlam)
+
+    wien = x > _WIEN_SWITCH
+    # Rayleigh-Jeans / peak side: 1/expm1(x)
+    with np.errstate(over='ignore', divide='ignore'):
+        np.divide(prefac, np.expm1(np.where(wien, 0.0, x)), out=out, where=~wien)
+    # Wien tail: exp(-x)/(1 - exp(-x)), exp(-x) underflows gracefully to 0
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    np.multiply(prefac, x/(1 - x), out=out, where=wien)
+    return out
+
+
+def _block_rows(num_wavelengths: int, memory_budget: int) -> int:
+    """Temperatures per block so that the ~6 float64 scratch arrays of a block fit the budget."""
+    return max(1, int(memory_budget // (6*8*max(num_wavelengths, 1))))
+
+
+def planck_grid(temperatures: np.ndarray, wavelengths: np.ndarray, out: np.ndarray | None = None,
+                memory_budget: int = DEFAULT_MEMORY_BUDGET) -> np.ndarray:
+    """
+    Spectral radiance B_lambda on a temperature x wavelength grid, evaluated in blocks.
+
+    Args:
+        temperatures (array_like): Temperatures in K (nT,).
+        wavelengths (array_like): Wavelengths in m (nlam,).
+        out (np.ndarray, optional): Preallocated (nT, nlam) output, e.g. np.memmap or np.lib.format.open_memmap.
+        memory_budget (int, opt = DEFAULT_MEMORY_BUDGET): Bytes of scratch memory per block.
+
+    Returns:
+        np.ndarray: B_lambda in W m^-2 sr^-1 m^-1, shape (nT, nlam) (out, if given).
+    """
+    T = np.asarray(temperatures, dtype=np.float64).reshape(-1)
+    lam = np.asarray(wavelengths, dtype=np.float64).reshape(1, -1)
+    assert np.all(T > 0) and np.all(lam > 0), "Temperatures and wavelengths must be positive"
+    if out is None:
+        out = np.empty((T.size, lam.size), dtype=np.float64)
+    assert out.shape == (T.size, lam.size), f"out has shape {out.shape}, expected {(T.size, lam.size)}"
+
+    rows = _block_rows(lam.size, memory_budget)
+    block = np.empty((min(rows, T.size), lam.size), dtype=np.float64)
+    for start in range(0, T.size, rows):
+        stop = min(start + rows, T.size)
+        res = _planck_block(T[start:stop, None], lam, block[:stop - start])
+        out[start:stop] = res
+    return out
+
+
+def planck(temperature: np.ndarray, wavelength: np.ndarray) -> np.ndarray:
+    """
+    B_lambda(T) with ordinary NumPy broadcasting (no blocking), W m^-2 sr^-1 m^-1.
+    """
+    T, lam = np.broadcast_arrays(np.asarray(temperature, dtype=np.float64),
+                                 np.asarray(wavelength, dtype=np.float64))
+    return _planck_block(T, lam, np.empty(T.shape, dtype=np.float64))
+
+
+def band_radiance(temperatures: np.ndarray, wavelengths: np.ndarray, transmission: np.ndarray | None = None,
+                  memory_budget: int = DEFAULT_MEMORY_BUDGET) -> np.ndarray:
+    """
+    Radiance integrated over a bandpass, int T(lambda) B_lambda dlambda (trapezoid), in blocks.
+
+    Args:
+        temperatures (array_like): Temperatures in K (nT,).
+        wavelengths (array_like): Bandpass wavelength samples in m, increasing (nlam,).
+        transmission (array_like, optional): Filter transmission at each wavelength (default 1).
+        memory_budget (int, opt = DEFAULT_MEMORY_BUDGET): Bytes of scratch memory per block.
+
+    Returns:
+        np.ndarray: Band radiance in W m^-2 sr^-1 (nT,).
+    """
+    T = np.asarray(temperatures, dtype=np.float64).reshape(-1)
+    lam = np.asarray(wavelengths, dtype=np.float64).reshape(-1)
+    weights = np.ones_like(lam) if transmission is None else np.asarray(transmission, dtype=np.float64)
+    assert weights.shape == lam.shape, "transmission must match wavelengths"
+
+    # Trapezoid weights folded with the transmission: one matrix-vector product per block
+    dlam = np.diff(lam)
+    trap = np.zeros_like(lam)
+    trap[:-1] += 0.5*dlam
+    trap[1:] += 0.5*dlam
+    trap *= weights
+
+    result = np.empty(T.size, dtype=np.float64)
+    rows = _block_rows(lam.size, memory_budget)
+    block = np.empty((min(rows, T.size), lam.size), dtype=np.float64)
+    for start in range(0, T.size, rows):
+        stop = min(start + rows, T.size)
+        res = _planck_block(T[start:stop, None], lam[None, :], block[:stop - start])
+        np.dot(res, trap, out=result[start:stop])
+    return result
+
+
+def band_luminosity(temperatures: np.ndarray, radii: np.ndarray, wavelengths: np.ndarray,
+                    transmission: np.ndarray | None = None, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> np.ndarray:
+    """
+    Luminosity of spherical blackbodies within a bandpass, L = 4 pi R^2 * pi * band_radiance, in W.
+
+    Args:
+        temperatures (array_like): Temperatures in K (nT,).
+        radii (array_like): Radii in m, broadcast against temperatures.
+        wavelengths, transmission, memory_budget: As in band_radiance.
+
+    Returns:
+        np.ndarray: Band luminosities in W (nT,).
+    """
+    radiance = band_radiance(temperatures, wavelengths, transmission, memory_budget)
+    return 4*np.pi**2*np.asarray(radii, dtype=np.float64)**2*radiance
+
+
+def bolometric_luminosity(temperatures: np.ndarray, radii: np.ndarray) -> np.ndarray:
+    """
+    Bolometric luminosity of spherical blackbodies, L = 4 pi R^2 sigma T^4, in W.
+    """
+    T = np.asarray(temperatures, dtype=np.float64)
+    return 4*np.pi*np.asarray(radii, dtype=np.float64)**2*_SIGMA*T**4
@@ -0,0 +1,185 @@
+'''
+Fast colorization of large arrays into uint8 RGBA, without a matplotlib figure.
+
+Data are normalized (linear, log or asinh), quantized to integer indices into a uint8 lookup table
+built from a colormap (e.g. the ListedColormaps from make_color_map), and gathered straight into an
+(H, W, 4) uint8 output. The array is processed in blocks of rows (float64 scratch for the
+normalized values only), so there is no float RGBA intermediate and scratch memory is bounded by
+the block size.
+
+Mapping follows matplotlib's conventions: values below vmin / above vmax take the colormap's
+under / over colors, NaN (and non-positive values under log) take the bad color.
+
+e.g.,
+import aspen.colorize as cz
+from aspen import SMC_cmap
+
+rgba = cz.colorize(slice_8k, SMC_cmap, norm='asinh', vmin=0, vmax=1e3)
+'''
+
+from dataclasses import dataclass
+
+import numpy as np
+from matplotlib.colors import Colormap
+
+NORMS: tuple[str, ...] = ("linear", "log", "asinh")
+DEFAULT_BLOCK_PIXELS: int = 2**20  # pixels per block of rows
+
+
+@dataclass(frozen=True)
+class ColorLUT:
+    """
+    uint8 RGBA lookup table for a colormap: rows 0..N-1 are the colormap,
+    then the under, over and bad colors (rows N, N+1, N+2).
+    """
+    rgba: np.ndarray
+    name: str
+
+    @property
+    def num_colors(self) -> int:
+        return self.rgba.shape[0] - 3
+
+    @property
+    def under_index(self) -> int:
+        return self.num_colors
+
+    @property
+    def over_index(self) -> int:
+        return self.num_colors + 1
+
+    @property
+    def bad_index(self) -> int:
+        return self.num_colors + 2
+
+
+def make_lut(cmap: Colormap) -> ColorLUT:
+    """
+    Precompute the uint8 lookup table of a colormap (do this once and reuse it across calls).
+
+    Args:
+        cmap (Colormap): e.g. a ListedColormap from make_color_map, or any registered matplotlib colormap.
+
+    Returns:
+        ColorLUT: The lookup table, including under / over / bad colors.
+    """
+    N = cmap.N
+    rgba = np.empty((N + 3, 4), dtype=np.uint8)
+    rgba[:N] = cmap(np.arange(N), bytes=True)
+    for row, color in ((N, cmap.get_under()), (N + 1, cmap.get_over()), (N + 2, cmap.get_bad())):
+        rgba[row] = (np.asarray(color) * 255).astype(np.uint8)  # same float->byte rule as matplotlib
+    rgba.flags.writeable = False
+    return ColorLUT(rgba=rgba, name=cmap.name)
+
+
+def _forward(values: np.ndarray, norm: str, linear_width: float) -> np.ndarray:
+    """Apply the normalization's transform (before scaling to [0, 1])."""
+    if norm == "linear":
+        return values
+    if norm == "log":
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log10(values)  # non-positive -> -inf / nan, handled as bad
+    return np.arcsinh(values / linear_width)
+
+
+def data_limits(array: np.ndarray, norm: str = "linear") -> tuple[float, float]:
+    """
+    Default vmin / vmax of an array (finite values; strictly positive values for log).
+    """
+    data = np.asarray(array)
+    valid = np.isfinite(data)
+    if norm == "log":
+        valid &= data > 0
+    if not valid.any():
+        raise ValueError("No valid data to set the color limits from")
+    return float(np.min(data, where=valid, initial=np.inf)), float(np.max(data, where=valid, initial=-np.inf))
+
+
+def lut_indices(array: np.ndarray, num_colors: int, norm: str = "linear", vmin: float | None = None,
+                vmax: float | None = None, linear_width: float = 1.0, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Quantize data into lookup-table indices (see ColorLUT for the under / over / bad rows).
+
+    Args:
+        array (array_like): Data of any shape.
+        num_colors (int): Number of colormap entries N.
+        norm (str, opt = "linear"): One of NORMS.
+        vmin, vmax (float, optional): Color limits (default: data_limits).
+        linear_width (float, opt = 1.0): Scale of the linear region for asinh.
+        out (np.ndarray, optional): intp output, same shape as array.
+
+    Returns:
+        np.ndarray: Integer indices in [0, N + 2].
+    """
+    assert norm in NORMS, f"Unknown norm {norm}, options: {NORMS}"
+    if vmin is None or vmax is None:
+        dmin, dmax = data_limits(array, norm)
+        vmin = dmin if vmin is None else vmin
+        vmax = dmax if vmax is None else vmax
+    assert vmax > vmin, f"vmax ({vmax}) must be greater than vmin ({vmin})"
+    if norm == "log":
+        assert vmin > 0, f"vmin must be positive for a log norm: {vmin}"
+
+    data = np.asarray(array)
+    lo, hi = (float(v) for v in _forward(np.array([vmin, vmax], dtype=np.float64), norm, linear_width))
+    # float64, so data with a large offset relative to vmax - vmin keeps its precision; the scratch
+    # is one block (see colorize)
+    t = _forward(data.astype(np.float64), norm, linear_width)
+    t -= lo
+    t *= num_colors / (hi - lo)
+
+    if out is None:
+        out = np.empty(t.shape, dtype=np.intp)
+    with np.errstate(invalid='ignore'):
+        bad = ~np.isfinite(t)
+        np.floor(t, out=t)
+        np.clip(t, 0, num_colors - 1, out=t)  # x == vmax maps to the top color, like matplotlib
+        t[bad] = 0
+        out[...] = t
+        out[data < vmin] = num_colors
+        out[data > vmax] = num_colors + 1
+    out[bad] = num_colors + 2
+    return out
+
+
+def colorize(array: np.ndarray, cmap: Colormap | ColorLUT, norm: str = "linear", vmin: float | None = None,
+             vmax: float | None = None, linear_width: float = 1.0, out: np.ndarray | None = None,
+             block_pixels: int = DEFAULT_BLOCK_PIXELS) -> np.ndarray:
+    """
+    Map a 2D (or any-D) array to uint8 RGBA through a colormap lookup table.
+
+    Args:
+        array (array_like): Data, shape S (np.memmap is fine; it is read block by block).
+        cmap (Colormap or ColorLUT): Colormap, or a precomputed make_lut(cmap).
+        norm (str, opt = "linear"): "linear", "log" or "asinh".
+        vmin, vmax (float, optional): Color limits (default: finite data range; positive range for log).
+        linear_width (float, opt = 1.0): Scale of the linear region for asinh.
+        out (np.ndarray, optional): uint8 output of shape S + (4,), e.g. a preallocated image buffer.
+        block_pixels (int, opt = DEFAULT_BLOCK_PIXELS): Pixels normalized per block (bounds scratch memory).
+
+    Returns:
+        np.ndarray: uint8 RGBA image of shape S + (4,) (out, if given).
+    """
+    lut = cmap if isinstance(cmap, ColorLUT) else make_lut(cmap)
+    data = array if isinstance(array, np.ndarray) else np.asarray(array)  # keeps np.memmap lazy
+    if vmin is None or vmax is None:
+        dmin, dmax = data_limits(data, norm)
+        vmin = dmin if vmin is None else vmin
+        vmax = dmax if vmax is None else vmax
+
+    if out is None:
+        out = np.empty(data.shape + (4,), dtype=np.uint8)
+    assert out.shape == data.shape + (4,) and out.dtype == np.uint8, \
+        f"out must be uint8 with shape {data.shape + (4,)}, got {out.dtype} {out.shape}"
+
+    if data.ndim == 0:
+        idx = lut_indices(data, lut.num_colors, norm, vmin, vmax, linear_width)
+        out[...] = lut.rgba[idx]
+        return out
+
+    row_pixels = max(1, data[0].size) if data.ndim > 1 else 1
+    rows = max(1, block_pixels // row_pixels)
+    for start in range(0, data.shape[0], rows):
+        block = data[start:start + rows]
+        idx = lut_indices(block, lut.num_colors, norm, vmin, vmax, linear_width)
+        np.take(lut.rgba, idx, axis=0, out=out[start:start + rows])
+    return out
@@ -2,11 +2,13 @@
 Colorbar generation and nice colorbars for matplotlib
 '''
 
+import threading
+from functools import lru_cache
+
 import numpy as np
 from matplotlib.colors import ListedColormap, to_rgba
 from cycler import cycler
 
-import matplotlib.pyplot as plt
 import matplotlib 
 
 """
@@ -116,11 +118,45 @@ RED_cycler = cycler(color=AARON_RED_THEME.values())
 
 
 
+# Number of distinct make_color_map inputs whose interpolated RGBA tables are kept
+COLOR_MAP_CACHE_SIZE: int = 64
+
+
+@lru_cache(maxsize=COLOR_MAP_CACHE_SIZE)
+def _color_map_rgba(listColors: tuple[tuple[float, ...], ...], num_points: int,
+                    leftColor: tuple[float, ...] | None, rightColor: tuple[float, ...] | None) -> np.ndarray:
+    """Interpolated (num_points, 4) RGBA table for make_color_map, memoized and read-only."""
+
+    # Convert to RGBA
+    colors_RGBA: np.ndarray = np.array([to_rgba(c) for c in listColors])
+
+    # Will hold RGBA values 
+    vals: np.ndarray = np.ones((num_points, 4))
+
+    for i in range(4):
+        vals[:, i] = np.interp(np.linspace(0, 1, num=num_points), 
+                                np.linspace(0, 1, num=len(listColors)), colors_RGBA[:, i])
+
+    # Override left and right colors if specified 
+    if leftColor is not None:
+        vals[0, :] = to_rgba(leftColor)  # set the first color (left end)
+
+    if rightColor is not None:
+        vals[-1, :] = to_rgba(rightColor)
+
+    vals.flags.writeable = False
+    return vals
+
+
 def make_color_map(listColors: list[str], num_points: int = 1024, cmap_name: str = 'custom',
                     leftColor: str | None = None, rightColor: str | None = None ) -> ListedColormap:
     """
     Create a colormap from a list of colors by linearly interpolating across RGB values.
 
+    The interpolated RGBA table is memoized by (colors as RGBA, num_points, leftColor, rightColor)
+    in a bounded LRU cache (COLOR_MAP_CACHE_SIZE entries); every call still returns a new
+    ListedColormap, so changing one (set_bad, ...) never affects another.
+
     Args:
         listColors (list of str): List of color hex codes or color names.
         num_points (int, opt = 1024): Number of interpolated color points in the resulting colormap.
@@ -137,51 +173,102 @@ def make_color_map(listColors: list[str], num_points: int = 1024, cmap_name: str
     assert num_points>=num_provided_colors , f"Really... num_points ({num_points}) \
                                                 < num_provided_colors ({num_provided_colors})!?" 
 
-    # Convert to RGBA
-    colors_RGBA: list[tuple[float, float, float, float]] = [to_rgba(c) for c in listColors]
+    # RGBA tuples as the cache key, so lists / array rows (unhashable) and names of the same color all work
+    vals = _color_map_rgba(tuple(to_rgba(c) for c in listColors), int(num_points),
+                           None if leftColor is None else to_rgba(leftColor),
+                           None if rightColor is None else to_rgba(rightColor))
 
-    # Will hold RGBA values 
-    vals: np.ndarray = np.ones((num_points, 4))
+    return( ListedColormap(vals.copy(),name=cmap_name) )
 
-    for i in range(4):
-        vals[:, i] = np.interp(np.linspace(0, 1, num=num_points), 
-                                np.linspace(0, 1, num=num_provided_colors), [c[i] for c in colors_RGBA])
+# e.g., 
+# My_Cmap = make_color_map(['#ff0000', '#00ff00', '#0000ff'], num_points=256, cmap_name='my_cmap', leftColor='#ffffff', rightColor='#000000')
+# matplotlib.colormaps.register(My_Cmap, name='my_cmap')
 
-    # Override left and right colors if specified 
-    if leftColor is not None:
-        left_RGBA = to_rgba(leftColor)
-        vals[0, :] = left_RGBA  # set the first color (left end)
 
-    if rightColor is not None:
-        right_RGBA = to_rgba(rightColor)
-        vals[-1, :] = right_RGBA
+# Named colormaps 
+# =-=-=-=-=-=--==-=-==-=-=-=-==-=-===-=-=-
+# Built on first access (e.g. colors.SMC_cmap or `from aspen import SMC_cmap`), not at import.
+# Maps flagged for registration are registered with matplotlib when first built.
+# Module attribute -> (make_color_map args, make_color_map kwargs, register with matplotlib)
+_LAZY_CMAPS: dict[str, tuple[list[str], dict, bool]] = {
+    # ORUST Colormaps
+    "ORUST_cmap": ([ORUST_COLORS['teal'], ORUST_COLORS['red'], ORUST_COLORS['purple'], ORUST_COLORS['blue'], ORUST_COLORS['mint'], ORUST_COLORS['brightteal']],
+                   dict(cmap_name='orust_cmap'), True),
+    # Saint Mary's College Colormaps 
+    "SMC_cmap": ([SMC_COLORS['red'],SMC_COLORS['origsilver'],SMC_COLORS['navy']],
+                 dict(cmap_name='smc_cmap'), True),
+    # Northwestern Colormap (decent sequential map)
+    "NU_cmap": (['#ffffff',NORTHWESTERN_COLORS['lightestpurple'],NORTHWESTERN_COLORS['lighterpurple'],NORTHWESTERN_COLORS['lightpurple'],NORTHWESTERN_COLORS['purple'],NORTHWESTERN_COLORS['darkpurple'],NORTHWESTERN_COLORS['darkestpurple']],
+                dict(cmap_name='nu'), True),
+    # UC Berkeley Colormap (decent diverging map)
+    "UCB_cmap": ([UCB_COLORS['blue'],UCB_COLORS['lightgray'],UCB_COLORS['gold']],
+                 dict(cmap_name='ucb'), True),
+    # Teal Theme Colormap, overwrites left as white and right as burnt orange. Entire colormap is shades of teal. 
+    "deep_sea_cmap": ([ '#a5cece','#7cb8b8','#52a5a5', '#369090','#2e7c7c', '#1b4854', '#09212b'],
+                      dict(cmap_name='deep_sea', leftColor = '#ffffff', rightColor='#aa3e24'), False),
+    # Teal Theme without the left and right colors, just shades of teal
+    "deep_sea_cmap2": ([ '#a5cece','#7cb8b8','#52a5a5', '#369090','#2e7c7c', '#1b4854', '#09212b'],
+                       dict(cmap_name='deep_sea2'), False),
+    # Teal Theme Colormap (Teals to Orange/Pinks)
+    "teal2_cmap": ([ '#023438','#045866','#187188', '#068e92','#fe3967', '#fe6583', '#f19100', '#f1c000'],
+                   dict(cmap_name='ocean_sunset'), False),
+}
 
-    return( ListedColormap(vals,name=cmap_name) )
 
-# e.g., 
-# My_Cmap = make_color_map(['#ff0000', '#00ff00', '#0000ff'], num_points=256, cmap_name='my_cmap', leftColor='#ffffff', rightColor='#000000')
-# matplotlib.colormaps.register(My_Cmap, name='my_cmap')
+_CMAP_LOCK = threading.Lock()  # one thread builds and registers a named colormap, the others wait for it
+
+
+def _build_cmap(name: str) -> ListedColormap:
+    """Build (once) one of the named colormaps, cache it as a module attribute, register it if flagged."""
+    cmap = globals().get(name)
+    if cmap is None:
+        with _CMAP_LOCK:
+            cmap = globals().get(name)
+            if cmap is None:
+                listColors, kwargs, register = _LAZY_CMAPS[name]
+                cmap = make_color_map(listColors, **kwargs)
+                if register and cmap.name not in matplotlib.colormaps:
+                    matplotlib.colormaps.register(cmap)
+                globals()[name] = cmap
+    return cmap
+
+
+def register_aspen_colormaps() -> None:
+    """
+    Build and register every named colormap flagged for registration (e.g. so 'smc_cmap' can be
+    passed by name to imshow before SMC_cmap has been touched).
+    """
+    for name, (_, _, register) in _LAZY_CMAPS.items():
+        if register:
+            _build_cmap(name)
+    return None
+
+
+def __getattr__(name: str):
+    if name in _LAZY_CMAPS:
+        return _build_cmap(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_CMAPS))
 
 
-# ORUST Colormaps
-ORUST_cmap: ListedColormap = make_color_map([ORUST_COLORS['teal'], ORUST_COLORS['red'], ORUST_COLORS['purple'], ORUST_COLORS['blue'], ORUST_COLORS['mint'], ORUST_COLORS['brightteal']], cmap_name='orust_cmap')
-#matplotlib.colormaps.register(ORUST_cmap, name='orust_cmap')
-matplotlib.colormaps.register(ORUST_cmap)
+# Default color schemes 
+# =-=-=-=-=-=--==-=-==-=-=-=-==-=-===-=-=-
+# matplotlib.rcParams is the same object as plt.rcParams (no pyplot import needed here).
+# These change the process-wide defaults; aspen.themes applies a scheme to single figures instead.
 
 def use_orust_colors_default():
     """
     Set the default color cycle to the ORUST color scheme.
     """
-    plt.rcParams.update({
-        'image.cmap' : 'orust_cmap',
+    matplotlib.rcParams.update({
+        'image.cmap' : _build_cmap('ORUST_cmap').name,
         'axes.prop_cycle' : ORUST_cycler,
     })
     return None
 
-# Saint Mary's College Colormaps 
-SMC_cmap: ListedColormap = make_color_map([SMC_COLORS['red'],SMC_COLORS['origsilver'],SMC_COLORS['navy']], cmap_name='smc_cmap')
-#matplotlib.colormaps.register(SMC_cmap, name='smc_cmap')
-matplotlib.colormaps.register(SMC_cmap)
 
 def use_smc_colors_default():
     """
@@ -192,50 +279,30 @@ def use_smc_colors_default():
     original_rc_params = plt.rcParams.copy()
     plt.rcParams.update(original_rc_params)    restores to copy 
     """
-    plt.rcParams.update({
-        'image.cmap' : 'smc_cmap',
+    matplotlib.rcParams.update({
+        'image.cmap' : _build_cmap('SMC_cmap').name,
         'axes.prop_cycle' : SMC_cycler,
     })
     return None
 
 
-# Northwestern Colormap (decent sequential map)
-NU_cmap: ListedColormap = make_color_map(['#ffffff',NORTHWESTERN_COLORS['lightestpurple'],NORTHWESTERN_COLORS['lighterpurple'],NORTHWESTERN_COLORS['lightpurple'],NORTHWESTERN_COLORS['purple'],NORTHWESTERN_COLORS['darkpurple'],NORTHWESTERN_COLORS['darkestpurple']], cmap_name='nu')
-#matplotlib.colormaps.register(NU_cmap, name='nu_cmap')
-matplotlib.colormaps.register(NU_cmap)
-
 def use_nu_colors_default():
     """
     Set the default color cycle to the Northwestern color scheme.
     """
-    plt.rcParams.update({
-        'image.cmap' : 'nu_cmap',
+    matplotlib.rcParams.update({
+        'image.cmap' : _build_cmap('NU_cmap').name,
         'axes.prop_cycle' : NU_cycler,
     })
     return None
 
 
-# UC Berkeley Colormap (decent diverging map)
-UCB_cmap: ListedColormap = make_color_map([UCB_COLORS['blue'],UCB_COLORS['lightgray'],UCB_COLORS['gold']], cmap_name='ucb')
-#matplotlib.colormaps.register(UCB_cmap, name='ucb_cmap')
-matplotlib.colormaps.register(UCB_cmap)
-
 def use_ucb_colors_default():
     """
     Set the default color cycle to the UC Berkeley color scheme.
     """
-    plt.rcParams.update({
-        'image.cmap' : 'ucb_cmap',
+    matplotlib.rcParams.update({
+        'image.cmap' : _build_cmap('UCB_cmap').name,
         'axes.prop_cycle' : UCB_cycler,
     })
     return None
-
-
-# Teal Theme Colormap, overwrites left as white and right as burnt orange. Entire colormap is shades of teal. 
-deep_sea_cmap: ListedColormap = make_color_map([ '#a5cece','#7cb8b8','#52a5a5', '#369090','#2e7c7c', '#1b4854', '#09212b'], cmap_name='deep_sea', leftColor = '#ffffff', rightColor='#aa3e24')
-
-# Teal Theme without the left and right colors, just shades of teal
-deep_sea_cmap2: ListedColormap = make_color_map([ '#a5cece','#7cb8b8','#52a5a5', '#369090','#2e7c7c', '#1b4854', '#09212b'], cmap_name='deep_sea2')
-
-# Teal Theme Colormap (Teals to Orange/Pinks)
-teal2_cmap: ListedColormap = make_color_map([ '#023438','#045866','#187188', '#068e92','#fe3967', '#fe6583', '#f19100', '#f1c000'], cmap_name='ocean_sunset')
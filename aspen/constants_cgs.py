@@ -0,0 +1,15 @@
+'''
+Physical and astronomical constants in CGS-Gaussian units (cm, g, s; statC, G) as plain module-level
+floats, with the names of PhysicsConstants / AstroConstantsAndUsefulNumbers. Computed once at import
+from the SI values (see unit_systems), so inner loops need no conversion factors or instances.
+
+e.g.,
+from aspen.constants_cgs import G_NEWTON, M_SUN, E_CHARGE   # 6.674e-8 cm^3/g/s^2, 1.989e33 g, 4.803e-10 statC
+'''
+
+from .unit_systems import cgs_constants
+
+_values = cgs_constants()
+globals().update(_values)
+
+__all__ = list(_values)
@@ -0,0 +1,16 @@
+'''
+Physical and astronomical constants in geometric units (G = c = 1, lengths in meters) as plain
+module-level floats, with the names of PhysicsConstants / AstroConstantsAndUsefulNumbers.
+Masses, times and energies are all in meters; electromagnetic constants are Gaussian based.
+Computed once at import from the SI values (see unit_systems).
+
+e.g.,
+from aspen.constants_geometric import M_SUN, SOLAR_YEAR   # 1477 m, 9.46e15 m
+'''
+
+from .unit_systems import geometric_constants
+
+_values = geometric_constants()
+globals().update(_values)
+
+__all__ = list(_values)
@@ -0,0 +1,16 @@
+'''
+Physical and astronomical constants in natural units (hbar = c = 1, energies in eV) as plain
+module-level floats, with the names of PhysicsConstants / AstroConstantsAndUsefulNumbers.
+Masses are in eV, lengths and times in 1/eV; electromagnetic constants are Gaussian (E_CHARGE = sqrt(ALPHA)).
+Computed once at import from the SI values (see unit_systems).
+
+e.g.,
+from aspen.constants_natural import M_ELECTRON, G_NEWTON   # 5.11e5 eV, 6.71e-57 eV^-2
+'''
+
+from .unit_systems import natural_constants
+
+_values = natural_constants()
+globals().update(_values)
+
+__all__ = list(_values)
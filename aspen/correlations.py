@@ -0,0 +1,135 @@
+'''
+All-pairs correlations between assignments (columns of a students x assignments array) with
+missing values masked out.
+
+Pearson correlations use pairwise-complete observations: with V the validity mask and X the
+(centered) scores zeroed where missing, the per-pair counts, sums and cross products are all
+matrix products (V.T @ V, X.T @ V, X.T @ X, ...), so every pair is computed at once.
+Spearman correlations are Pearson correlations of the ranks (ties get their average rank), with
+each column ranked among its own valid values (exact when nothing is missing).
+
+e.g.,
+import aspen.correlations as co
+import aspen.gradebook as gb
+
+book = gb.load_gradebook('export.csv')
+r, n = co.correlation_matrix(book.fractions, book.missing, method='spearman')
+'''
+
+import numpy as np
+
+METHODS: tuple[str, ...] = ("pearson", "spearman")
+MOSAIC_BLOCK_ELEMENTS: int = 2**24  # one-hot entries per block of students in pair_density_mosaic
+
+
+def _valid_mask(X: np.ndarray, missing: np.ndarray | None) -> np.ndarray:
+    valid = np.isfinite(X)
+    if missing is not None:
+        valid &= ~np.asarray(missing, dtype=bool)
+    return valid
+
+
+def rank_columns(X, missing=None) -> np.ndarray:
+    """
+    Rank the valid values of each column (1 = smallest, ties get their average rank); NaN where invalid.
+    """
+    X = np.asarray(X, dtype=float)
+    valid = _valid_mask(X, missing)
+    keyed = np.where(valid, X, np.inf)
+    order = np.argsort(keyed, axis=0, kind='stable')
+    ordered = np.take_along_axis(keyed, order, axis=0)
+
+    S = X.shape[0]
+    pos = np.arange(S)[:, None]
+    starts = np.ones_like(ordered, dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    ends = np.ones_like(ordered, dtype=bool)
+    ends[:-1] = starts[1:]
+    first = np.maximum.accumulate(np.where(starts, pos, 0), axis=0)
+    last = np.minimum.accumulate(np.where(ends, pos, S)[::-1], axis=0)[::-1]
+
+    ranks = np.empty_like(X)
+    np.put_along_axis(ranks, order, 0.5*(first + last) + 1, axis=0)
+    ranks[~valid] = np.nan
+    return ranks
+
+
+def correlation_matrix(X, missing=None, method: str = "pearson", min_count: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Correlation of every pair of columns, using the students valid in both.
+
+    Args:
+        X (array_like): (S, A) scores (NaN counts as missing).
+        missing (array_like, optional): (S, A) bool mask of missing values (e.g. Gradebook.missing).
+        method (str, opt = "pearson"): One of METHODS.
+        min_count (int, opt = 3): Fewest common students for a correlation (NaN otherwise).
+
+    Returns:
+        tuple: (A, A) correlation matrix (NaN for too few students or a constant column) and
+        (A, A) int matrix of common students per pair.
+    """
+    assert method in METHODS, f"Unknown method {method}, options: {METHODS}"
+    X = np.asarray(X, dtype=float)
+    valid = _valid_mask(X, missing)
+    if method == "spearman":
+        X = rank_columns(X, ~valid)
+
+    V = valid.astype(float)
+    count = np.maximum(V.sum(axis=0), 1)
+    Z = np.where(valid, X, 0.0)
+    Z -= Z.sum(axis=0)/count  # centering improves accuracy, correlations are shift invariant
+    Z[~valid] = 0.0
+
+    n = V.T @ V
+    sx = Z.T @ V  # sx[i, j]: sum of column i over students valid in i and j
+    sxx = (Z*Z).T @ V
+    sxy = Z.T @ Z
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n*sxy - sx*sx.T
+        var = n*sxx - sx*sx
+        r = cov/np.sqrt(var*var.T)
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < min_count) | ~np.isfinite(r)] = np.nan
+    return r, n.astype(np.int64)
+
+
+def pair_density_mosaic(X, missing=None, bins: int = 32, limits=None) -> np.ndarray:
+    """
+    Counts of every pair of columns binned into bins x bins panels, tiled into one (A*bins, A*bins)
+    image: panel (i, j) has column j along x and column i along y (drawn with the top row of the
+    image first). All panels come from one one-hot matrix product.
+    Empty pixels and the diagonal panels are NaN.
+
+    Args:
+        X (array_like): (S, A) scores.
+        missing (array_like, optional): (S, A) bool mask of missing values.
+        bins (int, opt = 32): Pixels per panel side.
+        limits (array_like, optional): (A, 2) value range of each column (default: range of its valid values).
+    """
+    X = np.asarray(X, dtype=float)
+    valid = _valid_mask(X, missing)
+    S, A = X.shape
+    if limits is None:
+        lo = np.min(X, axis=0, where=valid, initial=np.inf)
+        hi = np.max(X, axis=0, where=valid, initial=-np.inf)
+    else:
+        lo, hi = np.asarray(limits, dtype=float).T
+    span = np.where(hi > lo, hi - lo, 1.0)
+    pix = np.floor((X - lo)*(bins/span))
+    pix = np.clip(np.where(valid, pix, 0), 0, bins - 1).astype(np.intp)
+
+    # One-hot pixel matrix P (students x A*bins, zero rows for missing values): P.T @ P counts every pair
+    # of (column, pixel) at once, i.e. all panels. Students are processed in blocks to bound memory.
+    counts = np.zeros((A*bins, A*bins))
+    cols = np.arange(A)*bins + (bins - 1 - pix)  # pixel rows counted from the top of each panel
+    block = max(1, MOSAIC_BLOCK_ELEMENTS // (A*bins))
+    for start in range(0, S, block):
+        sl = slice(start, start + block)
+        P = np.zeros((cols[sl].shape[0], A*bins), dtype=np.float32)
+        np.put_along_axis(P, cols[sl], valid[sl].astype(np.float32), axis=1)
+        counts += (P.T @ P).astype(np.float64)
+    # Panel (i, j) needs column j along x: flip the x pixels back
+    counts = counts.reshape(A, bins, A, bins)[:, :, :, ::-1].transpose(0, 2, 1, 3)
+    counts[counts == 0] = np.nan
+    counts[np.arange(A), np.arange(A)] = np.nan
+    return counts.transpose(0, 2, 1, 3).reshape(A*bins, A*bins)
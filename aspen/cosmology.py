@@ -0,0 +1,185 @@
+'''
+Cosmological distances and times (FLRW) for large redshift arrays.
+
+For a given set of parameters the integrals int dz/E(z) and int dz/((1+z)E(z)) are tabulated once on a
+fine grid in x = ln(1+z), and queries are answered by vectorized linear interpolation -- there is no
+quadrature per redshift. The distance and lookback integrals are tabulated divided by x (smooth and
+finite as z -> 0, so small redshifts keep their relative accuracy), and the age as the integral from
+z to infinity (so high redshifts do not lose it to a difference of two nearly equal numbers). Tables are kept in a small LRU cache keyed by the parameters (least recently
+used tables are evicted), so switching between a few cosmologies does not rebuild them.
+
+With the default grid (2**16 points up to z = 1e4) the relative error of the distances and times is
+below ~1e-8 from z = 0 up to z ~ 1e3, well under the precision of the parameters themselves.
+
+Everything is SI, like constants_conversions: distances in meters, times in seconds.
+
+e.g.,
+import numpy as np
+import aspen.cosmology as cosmo
+
+z = np.random.uniform(0, 5, 10_000_000)
+d_L = cosmo.Cosmology().luminosity_distance(z)   # meters
+'''
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .constants_conversions import AstroConstantsAndUsefulNumbers, PhysicsConstants
+
+_ASTRO = AstroConstantsAndUsefulNumbers()
+
+TABLE_Z_MAX: float = 1e4  # default largest tabulated redshift
+TABLE_NUM_POINTS: int = 2**16  # default grid size in ln(1+z)
+TABLE_CACHE_SIZE: int = 8  # number of parameter sets kept in memory
+
+
+@dataclass(frozen=True)
+class CosmologyTable:
+    """
+    Tabulated integrals on a uniform grid x = ln(1+z), in units of the Hubble distance / time.
+
+    comoving[i]  = int_0^z_i dz'/E(z')
+    lookback[i]  = int_0^z_i dz'/((1+z')E(z'))
+    age[i]       = int_z_i^inf dz'/((1+z')E(z'))
+    comoving_x, lookback_x = comoving / x, lookback / x (their limits 1/E(0) at x = 0), for interpolation
+    """
+    x: np.ndarray
+    comoving: np.ndarray
+    lookback: np.ndarray
+    age: np.ndarray
+    comoving_x: np.ndarray
+    lookback_x: np.ndarray
+    z_max: float
+
+    @property
+    def age_today(self) -> float:
+        """int_0^1 da/(a E(a))."""
+        return float(self.age[0])
+
+
+def _E(z: np.ndarray, omega_m: float, omega_lambda: float, omega_k: float, omega_r: float) -> np.ndarray:
+    """Dimensionless Hubble rate H(z)/H0."""
+    zp1 = 1 + z
+    return np.sqrt(omega_r*zp1**4 + omega_m*zp1**3 + omega_k*zp1**2 + omega_lambda)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def distance_table(omega_m: float, omega_lambda: float, omega_k: float, omega_r: float,
+                   z_max: float = TABLE_Z_MAX, num_points: int = TABLE_NUM_POINTS) -> CosmologyTable:
+    """
+    Build (or fetch from the LRU cache) the integral table for one set of density parameters.
+
+    Args:
+        omega_m, omega_lambda, omega_k, omega_r (float): Density parameters.
+        z_max (float, opt = TABLE_Z_MAX): Largest redshift the table covers.
+        num_points (int, opt = TABLE_NUM_POINTS): Grid points in ln(1+z).
+
+    Returns:
+        CosmologyTable: The tabulated integrals (read-only arrays).
+    """
+    params = (omega_m, omega_lambda, omega_k, omega_r)
+    x = np.linspace(0, np.log1p(z_max), num_points)
+    z = np.expm1(x)
+    Ez = _E(z, *params)
+    dx = x[1] - x[0]
+
+    # dz = (1+z) dx ; cumulative trapezoid in x
+    def cumulative(integrand: np.ndarray) -> np.ndarray:
+        out = np.empty_like(integrand)
+        out[0] = 0
+        np.cumsum(0.5*dx*(integrand[1:] + integrand[:-1]), out=out[1:])
+        return out
+
+    comoving = cumulative((1 + z)/Ez)
+    lookback = cumulative(1/Ez)
+
+    # Age at z_max: int_0^a_max da/(a E(a)) with a = u^2 (removes the sqrt(a) behaviour at a -> 0),
+    # then the lookback pieces summed down from z_max
+    u = np.linspace(0, np.sqrt(1/(1 + z_max)), num_points)
+    a = u**2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        integrand = np.where(a > 0, 2*u/(a*_E(1/a - 1, *params)), 0.0)
+    age_z_max = float(np.sum(0.5*(u[1] - u[0])*(integrand[1:] + integrand[:-1])))
+    age = age_z_max + (lookback[-1] - lookback)
+    age[-1] = age_z_max
+
+    # Integrals / x, with the x -> 0 limit (the integrands at z = 0)
+    comoving_x, lookback_x = np.empty_like(x), np.empty_like(x)
+    comoving_x[0] = lookback_x[0] = 1/Ez[0]
+    comoving_x[1:], lookback_x[1:] = comoving[1:]/x[1:], lookback[1:]/x[1:]
+
+    for arr in (x, comoving, lookback, age, comoving_x, lookback_x):
+        arr.flags.writeable = False
+    return CosmologyTable(x=x, comoving=comoving, lookback=lookback, age=age, comoving_x=comoving_x,
+                          lookback_x=lookback_x, z_max=z_max)
+
+
+@dataclass(frozen=True)
+class Cosmology:
+    """
+    FLRW cosmology. Defaults come from AstroConstantsAndUsefulNumbers.
+
+    All methods accept scalars or arrays of redshift 0 <= z <= z_max.
+    """
+    H0: float = _ASTRO.H0_HUBBLE_SI  # 1/s
+    OMEGA_M: float = _ASTRO.OMEGA_M
+    OMEGA_LAMBDA: float = _ASTRO.OMEGA_LAMBDA
+    OMEGA_K: float = _ASTRO.OMEGA_K
+    OMEGA_RADIATION: float = _ASTRO.OMEGA_RADIATION
+    z_max: float = TABLE_Z_MAX
+    num_points: int = TABLE_NUM_POINTS
+
+    @property
+    def hubble_distance(self) -> float:
+        return PhysicsConstants.C_LIGHT / self.H0  # meters
+
+    @property
+    def hubble_time(self) -> float:
+        return 1 / self.H0  # seconds
+
+    @property
+    def table(self) -> CosmologyTable:
+        return distance_table(float(self.OMEGA_M), float(self.OMEGA_LAMBDA), float(self.OMEGA_K),
+                              float(self.OMEGA_RADIATION), float(self.z_max), int(self.num_points))
+
+    def _interp(self, z: np.ndarray, column: np.ndarray, times_x: bool = False) -> np.ndarray:
+        """Interpolate a table column at ln(1+z); times_x for the columns tabulated divided by x."""
+        z = np.asarray(z, dtype=np.float64)
+        if z.size and (np.min(z) < 0 or np.max(z) > self.z_max):
+            raise ValueError(f"Redshifts must be within [0, {self.z_max}] (got {np.min(z)} to {np.max(z)})")
+        x = np.log1p(z)
+        values = np.interp(x, self.table.x, column)
+        return x*values if times_x else values
+
+    def comoving_distance(self, z: np.ndarray) -> np.ndarray:
+        """Line-of-sight comoving distance in meters."""
+        return self.hubble_distance * self._interp(z, self.table.comoving_x, times_x=True)
+
+    def transverse_comoving_distance(self, z: np.ndarray) -> np.ndarray:
+        """Transverse comoving distance (accounts for curvature) in meters."""
+        d_c = self.comoving_distance(z)
+        if self.OMEGA_K == 0:
+            return d_c
+        d_h = self.hubble_distance
+        sqrt_ok = np.sqrt(abs(self.OMEGA_K))
+        if self.OMEGA_K > 0:
+            return d_h/sqrt_ok * np.sinh(sqrt_ok*d_c/d_h)
+        return d_h/sqrt_ok * np.sin(sqrt_ok*d_c/d_h)
+
+    def luminosity_distance(self, z: np.ndarray) -> np.ndarray:
+        """Luminosity distance in meters."""
+        return (1 + np.asarray(z, dtype=np.float64)) * self.transverse_comoving_distance(z)
+
+    def angular_diameter_distance(self, z: np.ndarray) -> np.ndarray:
+        """Angular diameter distance in meters."""
+        return self.transverse_comoving_distance(z) / (1 + np.asarray(z, dtype=np.float64))
+
+    def lookback_time(self, z: np.ndarray) -> np.ndarray:
+        """Lookback time in seconds."""
+        return self.hubble_time * self._interp(z, self.table.lookback_x, times_x=True)
+
+    def age(self, z: np.ndarray) -> np.ndarray:
+        """Age of the universe at redshift z in seconds."""
+        return self.hubble_time * self._interp(z, self.table.age)
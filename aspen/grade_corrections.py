@@ -0,0 +1,198 @@
+'''
+Plotting-free math behind gen_QuizCorrections: corrected scores and letter-grade transitions.
+
+A quiz correction returns a fraction of the missed points, rounded down:
+new = score + floor(frac_pts_returned * (numQuestions - score)).
+Letter grades come from the grade boundaries (letter -> lowest score for that grade) with one
+searchsorted, so the transition matrix of a whole class is a single bincount.
+
+e.g.,
+from aspen.grade_corrections import grade_transition_matrix
+
+grades, T = grade_transition_matrix(scores, 20, 0.5, {'A': 17, 'B': 14, 'C': 10, 'D': 7, 'F': 0})
+T[i, j]  # number of students moving from grades[i] to grades[j]
+
+Policies can be swept in bulk: sweep_corrections evaluates every (fraction returned, boundary set)
+pair against one score array, in blocks of fractions bounded by a scratch-memory budget.
+
+sweep = sweep_corrections(scores, 20, np.linspace(0.05, 1, 96), [bd_2023, bd_2024, bd_curve])
+sweep.frac_improved  # (fractions, boundary sets)
+'''
+
+from dataclasses import dataclass
+
+import numpy as np
+
+DEFAULT_MEMORY_BUDGET: int = 64 * 2**20  # bytes of scratch per block of fractions
+
+
+def correction_curve(numQuestions: int, frac_pts_returned: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Corrected score for every integer original score.
+
+    Returns:
+        tuple: orig_score (0..numQuestions), pts_returned, new_score.
+    """
+    assert 0 < frac_pts_returned <= 1, f'Fraction of points returned should be between 0 and 1: {frac_pts_returned}'
+    orig_score = np.arange(0,numQuestions+1,1)
+    pts_returned = np.floor(frac_pts_returned*np.arange(numQuestions,-1,-1))
+    return orig_score, pts_returned, orig_score + pts_returned
+
+
+def corrected_scores(scores, numQuestions: int, frac_pts_returned: float) -> np.ndarray:
+    """
+    Scores after corrections (works for any real scores, not only integers).
+    """
+    assert 0 < frac_pts_returned <= 1, f'Fraction of points returned should be between 0 and 1: {frac_pts_returned}'
+    scores = np.asarray(scores, dtype=float)
+    return scores + np.floor(frac_pts_returned*(numQuestions - scores))
+
+
+def sorted_boundaries(grade_bdys: dict[str, float]) -> tuple[list[str], np.ndarray]:
+    """
+    Letter grades and their lowest scores, ordered from the lowest grade up.
+    """
+    order = sorted(grade_bdys, key=grade_bdys.get)
+    return order, np.array([grade_bdys[g] for g in order], dtype=float)
+
+
+def letter_grade_index(scores, bounds: np.ndarray) -> np.ndarray:
+    """
+    Index into the ascending bounds of the grade of each score. Scores below the lowest
+    boundary get the lowest grade.
+    """
+    idx = np.searchsorted(bounds, np.asarray(scores, dtype=float), side='right') - 1
+    return np.maximum(idx, 0)
+
+
+def grade_transition_matrix(scores, numQuestions: int, frac_pts_returned: float,
+                            grade_bdys: dict[str, float]) -> tuple[list[str], np.ndarray]:
+    """
+    Letter-grade transitions caused by corrections.
+
+    Args:
+        scores (array_like): Original scores.
+        numQuestions (int): Maximum score.
+        frac_pts_returned (float): Fraction of the missed points returned, in (0, 1].
+        grade_bdys (dict): Letter grade -> lowest score for that grade.
+
+    Returns:
+        tuple: grades (lowest first) and the (G, G) int matrix T, with T[i, j] the number of
+        students going from grades[i] to grades[j] (upper triangular, as scores never drop).
+    """
+    grades, bounds = sorted_boundaries(grade_bdys)
+    G = len(grades)
+    before = letter_grade_index(scores, bounds)
+    after = letter_grade_index(corrected_scores(scores, numQuestions, frac_pts_returned), bounds)
+    T = np.bincount(before*G + after, minlength=G*G).reshape(G, G)
+    return grades, T
+
+
+@dataclass(frozen=True)
+class CorrectionSweep:
+    """
+    Outcome of every (fraction returned, boundary set) policy; F fractions, K boundary sets, G grades.
+
+    Attributes:
+        fracs (np.ndarray): (F,) fractions of missed points returned.
+        boundaries (np.ndarray): (K, G) lowest score of each grade, lowest grade first.
+        grades (list[str]): Letter grades, lowest first.
+        num_scores (int): Number of students N.
+        mean_score_change (np.ndarray): (F,) mean points gained.
+        dist_before (np.ndarray): (K, G) fraction of the class in each grade without corrections.
+        dist_after (np.ndarray): (F, K, G) fraction of the class in each grade with corrections.
+        mean_grade_change (np.ndarray): (F, K) mean number of letter grades gained.
+        frac_improved (np.ndarray): (F, K) fraction of students whose letter grade goes up.
+    """
+    fracs: np.ndarray
+    boundaries: np.ndarray
+    grades: list[str]
+    num_scores: int
+    mean_score_change: np.ndarray
+    dist_before: np.ndarray
+    dist_after: np.ndarray
+    mean_grade_change: np.ndarray
+    frac_improved: np.ndarray
+
+    @property
+    def dist_shift(self) -> np.ndarray:
+        """(F, K, G) change of the grade distribution caused by corrections."""
+        return self.dist_after - self.dist_before[None]
+
+
+def _boundary_array(boundary_sets) -> tuple[list[str], np.ndarray]:
+    """Dicts (same letters) or an array of lowest scores -> grades and ascending (K, G) boundaries."""
+    boundary_sets = list(boundary_sets)
+    if isinstance(boundary_sets[0], dict):
+        grades, _ = sorted_boundaries(boundary_sets[0])
+        assert all(set(b) == set(grades) for b in boundary_sets), "All boundary sets need the same letter grades"
+        bounds = np.array([[b[g] for g in grades] for b in boundary_sets], dtype=float)
+    else:
+        bounds = np.array(boundary_sets, dtype=float)
+        grades = [str(i) for i in range(bounds.shape[1])]
+    assert np.all(np.diff(bounds, axis=1) > 0), "Boundaries must increase with the letter grade"
+    return grades, bounds
+
+
+def _grade_index(values: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """
+    Grade index of values (..., N) under every boundary set (K, G) -> (..., K, N) int8.
+    Same as letter_grade_index: the number of boundaries above the lowest one that are <= value.
+    """
+    values = values[..., None, :]
+    idx = np.zeros(values.shape[:-2] + (bounds.shape[0], values.shape[-1]), dtype=np.int8)
+    for g in range(1, bounds.shape[1]):
+        idx += values >= bounds[:, g, None]
+    return idx
+
+
+def sweep_corrections(scores, numQuestions: int, fracs, boundary_sets,
+                      memory_budget: int = DEFAULT_MEMORY_BUDGET) -> CorrectionSweep:
+    """
+    Evaluate many correction policies against one set of scores.
+
+    Args:
+        scores (array_like): Original scores (N,).
+        numQuestions (int): Maximum score.
+        fracs (array_like): (F,) fractions of missed points returned, each in (0, 1].
+        boundary_sets (sequence): K grade-boundary dicts (letter -> lowest score, same letters),
+            or a (K, G) array of lowest scores, lowest grade first.
+        memory_budget (int, opt = DEFAULT_MEMORY_BUDGET): Bytes of scratch memory per block of fractions.
+
+    Returns:
+        CorrectionSweep: Grade distributions and summary metrics for every policy.
+    """
+    scores = np.asarray(scores, dtype=float)
+    fracs = np.atleast_1d(np.asarray(fracs, dtype=float))
+    assert np.all((fracs > 0) & (fracs <= 1)), "Fractions of points returned should be between 0 and 1"
+    grades, bounds = _boundary_array(boundary_sets)
+    F, (K, G), N = len(fracs), bounds.shape, len(scores)
+
+    def distribution(idx: np.ndarray) -> np.ndarray:
+        """(..., K, N) grade indices -> (..., K, G) class fractions."""
+        rows = np.arange(idx.size // N).reshape(idx.shape[:-1] + (1,))
+        return np.bincount((rows*G + idx).ravel(), minlength=rows.size*G).reshape(idx.shape[:-1] + (G,)) / N
+
+    before = _grade_index(scores, bounds)  # (K, N)
+    dist_after = np.empty((F, K, G))
+    mean_grade_change = np.empty((F, K))
+    frac_improved = np.empty((F, K))
+    score_gain_sum = np.empty(F)
+    missed = numQuestions - scores
+
+    block = max(1, int(memory_budget // (max(K*N, 1)*12)))  # bool mask, int8 index, int16 gain, int64 bincount key
+    for start in range(0, F, block):
+        sl = slice(start, start + block)
+        points = np.floor(fracs[sl, None]*missed)  # (f, N)
+        score_gain_sum[sl] = points.sum(axis=-1)
+        new = scores + points
+        after = _grade_index(new, bounds)  # (f, K, N)
+        gain = after.astype(np.int16) - before
+        dist_after[sl] = distribution(after)
+        mean_grade_change[sl] = gain.mean(axis=-1)
+        frac_improved[sl] = np.count_nonzero(gain > 0, axis=-1) / N
+
+    return CorrectionSweep(fracs=fracs, boundaries=bounds, grades=grades, num_scores=N,
+                           mean_score_change=score_gain_sum / N,
+                           dist_before=distribution(before), dist_after=dist_after,
+                           mean_grade_change=mean_grade_change, frac_improved=frac_improved)
@@ -0,0 +1,264 @@
+'''
+Column-oriented gradebook loaded from an LMS (e.g. Canvas) CSV export, and vectorized averages.
+
+The CSV is parsed in chunks of rows; each chunk is converted to a float block at once, so the
+gradebook ends up as one (students, assignments) float64 array plus a boolean mask of missing
+submissions (empty or non-numeric cells, e.g. "EX"). All averages are NumPy reductions over
+that array: per-student and per-assignment averages, weights, and dropping the lowest scores.
+
+e.g.,
+import aspen.gradebook as gb
+
+book = gb.load_gradebook('export.csv')   # Canvas id columns (CANVAS_ID_COLUMNS) are recognized
+quizzes = book.select(r'^Quiz')
+quiz_avg = gb.student_averages(quizzes, drop_lowest=2)
+final = gb.weighted_grade(book, {'quiz': gb.GradeCategory(r'^Quiz', 0.4, drop_lowest=2),
+                                 'hw': gb.GradeCategory(r'^HW', 0.6)})
+'''
+
+import csv
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+DEFAULT_CHUNK_ROWS: int = 4096
+POINTS_POSSIBLE_ROW: str = 'Points Possible'
+# Non-score columns of a Canvas export (those present are kept as ids when id_columns is not given)
+CANVAS_ID_COLUMNS: tuple[str, ...] = ('Student', 'ID', 'SIS User ID', 'SIS Login ID', 'Integration ID',
+                                      'Root Account', 'Section')
+
+
+@dataclass(frozen=True)
+class Gradebook:
+    """
+    Scores of S students on A assignments, stored column-wise.
+
+    Attributes:
+        students (np.ndarray): (S,) student names / ids (first id column).
+        info (dict[str, np.ndarray]): (S,) string arrays of the other id columns.
+        columns (list[str]): Assignment names.
+        scores (np.ndarray): (S, A) float64 points, 0 where missing.
+        missing (np.ndarray): (S, A) bool, True for missing submissions.
+        points_possible (np.ndarray): (A,) maximum points (NaN for 0-point columns; the highest
+            score of each column if the export has no 'Points Possible' row).
+    """
+    students: np.ndarray
+    info: dict
+    columns: list[str]
+    scores: np.ndarray
+    missing: np.ndarray
+    points_possible: np.ndarray
+
+    @property
+    def num_students(self) -> int:
+        return self.scores.shape[0]
+
+    @property
+    def num_assignments(self) -> int:
+        return self.scores.shape[1]
+
+    @property
+    def fractions(self) -> np.ndarray:
+        """(S, A) scores as fractions of the points possible (0 where missing)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.scores / self.points_possible
+
+    def select(self, columns: str | Sequence[str]) -> 'Gradebook':
+        """Gradebook restricted to the assignments matching a regex, or to a list of column names."""
+        if isinstance(columns, str):
+            pattern = re.compile(columns)
+            idx = [i for i, c in enumerate(self.columns) if pattern.search(c)]
+        else:
+            idx = [self.columns.index(c) for c in columns]
+        assert len(idx) > 0, f"No assignments match {columns}"
+        return replace(self, columns=[self.columns[i] for i in idx], scores=self.scores[:, idx],
+                       missing=self.missing[:, idx], points_possible=self.points_possible[idx])
+
+
+@dataclass(frozen=True)
+class GradeCategory:
+    """
+    One category of the final grade: assignments matching columns (regex or names), its weight,
+    and how many of each student's lowest scores are dropped.
+    """
+    columns: str | Sequence[str]
+    weight: float
+    drop_lowest: int = 0
+
+
+def _to_float(block: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """String block -> (float values with 0 for missing, missing mask). Non-numeric cells count as missing."""
+    block = np.char.strip(block)
+    missing = block == ''
+    try:
+        values = np.where(missing, '0', block).astype(np.float64)
+    except ValueError:  # e.g. 'EX' or 'incomplete': parse each distinct cell once
+        cells, inverse = np.unique(np.where(missing, '0', block), return_inverse=True)
+        parsed = np.empty(cells.size)
+        for i, cell in enumerate(cells):
+            try:
+                parsed[i] = float(cell)
+            except ValueError:
+                parsed[i] = np.nan
+        values = parsed[inverse].reshape(block.shape)
+    missing |= ~np.isfinite(values)
+    values[missing] = 0.0
+    return values, missing
+
+
+def load_gradebook(filename: str, id_columns: Sequence[str] | None = None,
+                   score_columns: Sequence[str] | None = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   delimiter: str = ',') -> Gradebook:
+    """
+    Load a CSV gradebook export.
+
+    The first row holds column names; a row whose first cell is 'Points Possible' gives the maximum
+    points (without one, each column's highest score is used), and other rows with an empty first
+    cell (LMS annotations) are skipped.
+
+    Args:
+        filename (str): CSV file.
+        id_columns (sequence of str, optional): Non-score columns kept as strings; the first one labels
+            the students (default: the CANVAS_ID_COLUMNS in the header, or the first column if none are).
+        score_columns (sequence of str, optional): Score columns to load (default: all non-id columns).
+        chunk_rows (int, opt = DEFAULT_CHUNK_ROWS): Rows converted per block.
+        delimiter (str, opt = ','): CSV delimiter.
+
+    Returns:
+        Gradebook: The loaded gradebook.
+    """
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = [h.strip() for h in next(reader)]
+        if id_columns is None:
+            id_columns = [c for c in CANVAS_ID_COLUMNS if c in header] or header[:1]
+        missing_ids = [c for c in id_columns if c not in header]
+        assert not missing_ids, f"Id columns {missing_ids} not in the header of {filename}"
+        if score_columns is None:
+            score_columns = [h for h in header if h not in id_columns]
+        id_idx = [header.index(c) for c in id_columns]
+        score_idx = [header.index(c) for c in score_columns]
+        width = len(header)
+
+        points_possible = None
+        id_blocks, value_blocks, missing_blocks = [], [], []
+        chunk: list[list[str]] = []
+
+        def flush():
+            block = np.array(chunk, dtype=str).reshape(len(chunk), width)
+            id_blocks.append(block[:, id_idx])
+            values, missing = _to_float(block[:, score_idx])
+            value_blocks.append(values)
+            missing_blocks.append(missing)
+            chunk.clear()
+
+        for row in reader:
+            first = row[0].strip() if row else ''
+            if first == POINTS_POSSIBLE_ROW:
+                row = row + ['']*(width - len(row))
+                points_possible, _ = _to_float(np.array([row[i] for i in score_idx], dtype=str))
+                points_possible[points_possible == 0] = np.nan
+                continue
+            if not first:
+                continue
+            chunk.append(row[:width] + ['']*(width - len(row)))
+            if len(chunk) >= chunk_rows:
+                flush()
+        if chunk:
+            flush()
+
+    ids = np.concatenate(id_blocks) if id_blocks else np.empty((0, len(id_idx)), dtype=str)
+    scores = np.concatenate(value_blocks) if value_blocks else np.empty((0, len(score_idx)))
+    missing = np.concatenate(missing_blocks) if missing_blocks else np.empty((0, len(score_idx)), dtype=bool)
+    if points_possible is None:  # no 'Points Possible' row: the best score of each column
+        points_possible = np.where(missing, 0.0, scores).max(axis=0, initial=0.0)
+        points_possible[points_possible <= 0] = np.nan
+    return Gradebook(students=ids[:, 0], info={c: ids[:, i] for i, c in enumerate(id_columns[1:], 1)},
+                     columns=list(score_columns), scores=scores, missing=missing, points_possible=points_possible)
+
+
+def _kept(gb: Gradebook, fractions: np.ndarray, valid: np.ndarray, drop_lowest: int) -> np.ndarray:
+    """
+    Mask of the scores that count after dropping each student's drop_lowest lowest valid fractions
+    (at least one valid score is always kept).
+    """
+    keep = valid.copy()
+    if drop_lowest <= 0:
+        return keep
+    order = np.argsort(np.where(valid, fractions, np.inf), axis=1, kind='stable')
+    num_valid = valid.sum(axis=1)
+    rows = np.arange(gb.num_students)
+    for j in range(min(drop_lowest, gb.num_assignments)):
+        drop = j < num_valid - 1
+        keep[rows[drop], order[drop, j]] = False
+    return keep
+
+
+def student_averages(gb: Gradebook, weights: Sequence[float] | None = None, drop_lowest: int = 0,
+                     missing_as_zero: bool = True) -> np.ndarray:
+    """
+    Weighted average fraction of the points possible for each student.
+
+    Args:
+        gb (Gradebook): Gradebook (use Gradebook.select for a subset of assignments).
+        weights (sequence of float, optional): (A,) weight of each assignment (default equal).
+        drop_lowest (int, opt = 0): Number of each student's lowest fractions to drop.
+        missing_as_zero (bool, opt = True): Missing submissions count as 0; otherwise they are excluded.
+
+    Returns:
+        np.ndarray: (S,) averages in [0, 1] (NaN for a student with nothing to average).
+    """
+    fractions = gb.fractions
+    valid = np.isfinite(fractions)
+    if not missing_as_zero:
+        valid &= ~gb.missing
+    keep = _kept(gb, fractions, valid, drop_lowest)
+    w = np.ones(gb.num_assignments) if weights is None else np.asarray(weights, dtype=float)
+    assert w.shape == (gb.num_assignments,), f"Need {gb.num_assignments} weights, got {w.shape}"
+    kept_weight = keep @ w
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(keep, fractions, 0.0) @ w / kept_weight
+
+
+def assignment_averages(gb: Gradebook, missing_as_zero: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and standard deviation of the fraction of points for each assignment.
+
+    Returns:
+        tuple: (A,) means and (A,) standard deviations (missing submissions excluded unless missing_as_zero).
+    """
+    counted = np.ones_like(gb.missing) if missing_as_zero else ~gb.missing
+    n = counted.sum(axis=0)
+    fractions = np.where(counted, gb.fractions, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = fractions.sum(axis=0) / n
+        var = np.where(counted, (fractions - mean)**2, 0.0).sum(axis=0) / n
+    return mean, np.sqrt(var)
+
+
+def submission_rates(gb: Gradebook) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Participation: fraction of assignments each student submitted (S,) and fraction of the class
+    that submitted each assignment (A,).
+    """
+    submitted = ~gb.missing
+    return submitted.mean(axis=1), submitted.mean(axis=0)
+
+
+def weighted_grade(gb: Gradebook, categories: dict[str, GradeCategory], missing_as_zero: bool = True) -> np.ndarray:
+    """
+    Final fraction per student from weighted categories, each with its own drop-lowest rule.
+    Weights are normalized over the categories.
+
+    Returns:
+        np.ndarray: (S,) weighted grades in [0, 1].
+    """
+    total = sum(cat.weight for cat in categories.values())
+    assert total > 0, "Category weights must add up to a positive number"
+    grade = np.zeros(gb.num_students)
+    for cat in categories.values():
+        avg = student_averages(gb.select(cat.columns), drop_lowest=cat.drop_lowest, missing_as_zero=missing_as_zero)
+        grade += cat.weight * np.nan_to_num(avg)
+    return grade / total
@@ -0,0 +1,138 @@
+'''
+Vectorized Kepler-orbit propagation for the solar-system tables in AstroConstantsAndUsefulNumbers.
+
+Kepler's equation M = E - e sin(E) is solved with Halley's method for every (body, epoch) pair at
+once. Iteration stops when |E - e sin(E) - M| <= tol for all elements (default KEPLER_TOL = 1e-12 rad);
+Halley converges cubically, so this takes at most a handful of passes for e < 0.9.
+
+The tables carry only a, e, P and the mean anomaly at epoch, so orbits are two-dimensional: each
+body moves in its own orbital plane with perihelion along +x (no inclination / node / argument of
+perihelion), and the mean anomaly is measured from t = 0 (the table epoch).
+
+e.g.,
+import numpy as np
+import aspen.orbits as orb
+
+t = np.linspace(0, 250, 1_000_000)   # years
+pos, vel = orb.propagate_solar_system(t)   # (9, N, 2) in AU and AU/yr
+'''
+
+import numpy as np
+
+from .constants_conversions import AstroConstantsAndUsefulNumbers
+
+KEPLER_TOL: float = 1e-12  # radians, max residual |E - e sin(E) - M|
+KEPLER_MAX_ITER: int = 50
+
+
+def solve_kepler(mean_anomaly: np.ndarray, eccentricity: np.ndarray,
+                 tol: float = KEPLER_TOL, max_iter: int = KEPLER_MAX_ITER) -> np.ndarray:
+    """
+    Solve Kepler's equation M = E - e sin(E) for the eccentric anomaly E (elliptical orbits).
+
+    Args:
+        mean_anomaly (array_like): Mean anomaly M in radians (any value; reduced to [-pi, pi)).
+        eccentricity (array_like): Eccentricity 0 <= e < 1, broadcast against mean_anomaly.
+        tol (float, opt = KEPLER_TOL): Convergence tolerance on the residual, in radians.
+        max_iter (int, opt = KEPLER_MAX_ITER): Maximum Halley iterations.
+
+    Returns:
+        np.ndarray: Eccentric anomaly E in radians, in [-pi, pi).
+
+    Raises:
+        RuntimeError: If some elements did not converge within max_iter.
+    """
+    M, e = np.broadcast_arrays(np.asarray(mean_anomaly, dtype=np.float64),
+                               np.asarray(eccentricity, dtype=np.float64))
+    assert np.all((e >= 0) & (e < 1)), "Eccentricities must satisfy 0 <= e < 1"
+    M = np.remainder(M + np.pi, 2*np.pi) - np.pi
+
+    # Starting guess that is good for all e < 1 (Danby)
+    E = M + 0.85*e*np.sign(np.sin(M))
+    sinE = np.empty_like(E)
+    cosE = np.empty_like(E)
+    f = np.empty_like(E)
+
+    for _ in range(max_iter):
+        np.sin(E, out=sinE)
+        np.cos(E, out=cosE)
+        # f = E - e sinE - M ; f' = 1 - e cosE ; f'' = e sinE
+        np.subtract(E, e*sinE, out=f)
+        f -= M
+        if np.max(np.abs(f), initial=0.0) <= tol:
+            return E
+        fp = 1 - e*cosE
+        # Halley step: dE = f / (f' - f f'' / (2 f'))
+        E -= f / (fp - 0.5*f*e*sinE/fp)
+
+    raise RuntimeError(f"Kepler solver did not converge to {tol} in {max_iter} iterations "
+                       f"(max residual {np.max(np.abs(f))})")
+
+
+def propagate_orbits(times: np.ndarray, semi_major: np.ndarray, eccentricity: np.ndarray,
+                     period: np.ndarray, mean_anomaly_epoch: np.ndarray,
+                     tol: float = KEPLER_TOL) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Positions and velocities of bodies on Keplerian ellipses, in each orbit's plane.
+
+    Args:
+        times (array_like): Epochs (N,), same time unit as period, measured from the element epoch.
+        semi_major (array_like): Semi-major axes (B,).
+        eccentricity (array_like): Eccentricities (B,).
+        period (array_like): Orbital periods (B,).
+        mean_anomaly_epoch (array_like): Mean anomalies at t = 0 in degrees (B,).
+        tol (float, opt = KEPLER_TOL): Kepler solver tolerance in radians.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: C-contiguous positions and velocities of shape (B, N, 2),
+            in units of semi_major and semi_major/time. Perihelion lies along +x.
+    """
+    t = np.asarray(times, dtype=np.float64).reshape(1, -1)
+    a, e, P, M0 = (np.asarray(x, dtype=np.float64).reshape(-1, 1)
+                   for x in (semi_major, eccentricity, period, mean_anomaly_epoch))
+
+    n = 2*np.pi/P  # mean motion
+    E = solve_kepler(np.deg2rad(M0) + n*t, e, tol=tol)
+    cosE, sinE = np.cos(E), np.sin(E)
+    b = a*np.sqrt(1 - e**2)
+    Edot = n/(1 - e*cosE)
+
+    pos = np.empty(E.shape + (2,), dtype=np.float64)
+    vel = np.empty(E.shape + (2,), dtype=np.float64)
+    np.multiply(a, cosE - e, out=pos[..., 0])
+    np.multiply(b, sinE, out=pos[..., 1])
+    np.multiply(-a*sinE, Edot, out=vel[..., 0])
+    np.multiply(b*cosE, Edot, out=vel[..., 1])
+    return pos, vel
+
+
+def propagate_solar_system(times_yr: np.ndarray, bodies: list[str] | None = None,
+                           astro: AstroConstantsAndUsefulNumbers | None = None,
+                           tol: float = KEPLER_TOL) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Heliocentric (in-plane) positions and velocities of the solar-system bodies in AstroConstantsAndUsefulNumbers.
+
+    Args:
+        times_yr (array_like): Epochs in years from the table epoch (N,).
+        bodies (list of str, optional): Subset of NAMES_SOLAR_SYSTEM_LIST, in the output order. Default all nine.
+        astro (AstroConstantsAndUsefulNumbers, optional): Source of the orbital tables.
+        tol (float, opt = KEPLER_TOL): Kepler solver tolerance in radians.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Positions (AU) and velocities (AU/yr), each C-contiguous (B, N, 2).
+    """
+    astro = AstroConstantsAndUsefulNumbers() if astro is None else astro
+    names = list(astro.NAMES_SOLAR_SYSTEM_LIST)
+    if bodies is None:
+        idx = np.arange(len(names))
+    else:
+        unknown = [b for b in bodies if b not in names]
+        assert not unknown, f"Unknown bodies {unknown}, options: {names}"
+        idx = np.array([names.index(b) for b in bodies])
+
+    return propagate_orbits(times_yr,
+                            np.asarray(astro.A_SOLAR_SYSTEM_AU_ARR)[idx],
+                            np.asarray(astro.E_SOLAR_SYSTEM_ARR)[idx],
+                            np.asarray(astro.P_SOLAR_SYSTEM_YR_ARR)[idx],
+                            np.asarray(astro.MEAN_ANOM_SOLAR_SYSTEM_ARR)[idx],
+                            tol=tol)
@@ -2,34 +2,24 @@
 import matplotlib.pyplot as plt
 import matplotlib.patheffects as PathEffects
 import numpy as np
-
-common_rcParams = {
-    'figure.figsize':(7.5,5)   , # (width,height, , convention: wide = 1.5*tall, size of canvas
-    'figure.dpi':150   ,    # scales elements on canvas. Default 100 
-    'axes.labelsize': 12 ,
-    'axes.titlesize': 13 ,
-    'axes.linewidth': 1.2 ,
-    'grid.linestyle': '-.' ,
-    'grid.alpha': 0.4 ,
-    'lines.linewidth': 2  ,
-    'legend.framealpha': 1.0  ,
-    'legend.shadow': False  ,
-    'font.size': 14 ,
-    'xtick.labelsize': 12 ,
-    'xtick.major.size': 8 , # default 3 
-    'xtick.minor.size': 5 ,  
-    'xtick.major.width': 1.2 , # default 0.8 
-    'xtick.direction': 'inout' ,
-    #'xtick.top': True ,
-    'ytick.labelsize': 12 ,
-    'ytick.major.size': 8 , # default 3 
-    'ytick.minor.size': 5 , 
-    'ytick.major.width': 1.2 , # default 0.8 
-    'ytick.direction': 'inout'  ,
-    'ytick.right': True ,
-}
+from matplotlib.collections import PolyCollection
+
+from .colors import SMC_COLORS
+from .grade_corrections import correction_curve
+from .correlations import pair_density_mosaic
+from .gradebook import assignment_averages, load_gradebook, submission_rates
+from . import profiling
+from .saving import save_figure
+from .score_stats import ScoreAccumulator, compute_score_stats
+from .themes import common_rcParams
+
+# gen_CorrelationScatter switches to a density image above this many points
+DENSITY_THRESHOLD = 50_000
+DENSITY_BINS = 200  # pixels per axis of the density image
+MAX_MATRIX_LABELS = 60  # gen_CorrelationMatrix / gen_ScatterMatrix label axes up to this many assignments
 
 def make_better_plots():
+    # Changes the global rcParams; aspen.themes applies these per figure (thread-safe)
     plt.rcParams.update( common_rcParams )
 
 def writeLetterGrade(xpos,ypos,text,Qinfo,lettercolor='black',strokecolor='#bec1c1'):
@@ -41,6 +31,30 @@ def writeLetterGrade(xpos,ypos,text,Qinfo,lettercolor='black',strokecolor='#bec1
 
 # Common functions 
 
+def histo_title(title,stats,Qinfo):
+    """
+    Title of gen_IntegerHisto: the given title followed by the mean / median / mode / max requested in Qinfo.
+    """
+    thetitle = title 
+    if(Qinfo["showMean"]):
+        thetitle += " , " + r'Mean $\mu$: ' + f'{stats.mean:.1f}'
+
+    if(Qinfo["showMedian"]):
+        thetitle += " , " + r'Median $Q_2$: ' + f'{round(stats.median,1)}'
+
+    if(Qinfo["showMode"]):
+        if(len(stats.mode)>1):
+            thetitle += " , " + r'Modes $\^M$: '
+        else:
+            thetitle += " , " + r'Mode $\^M$: '
+        thetitle += ', '.join(f'{int(local_mode)}' for local_mode in stats.mode)
+            
+    if(Qinfo["showMax"]):
+        thetitle += " , " + f'Max: {int(stats.score_max)} ({stats.score_max_count})'
+
+    return thetitle
+
+@profiling.profiled
 def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,outname=None):
 
     # stats shift 
@@ -49,45 +63,35 @@ def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,out
 
     # Data prep 
     maxScore = int(maxScore) 
-    scores.sort()
-    numScore = len(scores) 
 
     # Check 
     maxScore_dic = Qinfo["numPoints"]
     assert maxScore==maxScore_dic , f"Gradebook max score {maxScore} != your provided max score {maxScore_dic}"
 
-    # Generate the histogram data (no plot yet)
-    weights = (1/numScore)*np.ones(numScore) # makes sum(heights) = 1, individual height = fraction of class 
-    bars, bins = np.histogram(scores,bins,weights=weights)
-    #print(f'Sum of bar heights: {sum(bars)}')
-
-    # Determine heights of letter grade bins 
-    lgrade = list(letters.keys())
-    lgrade.reverse() 
-    lbins = list(letters.values())
-    lbins.reverse() 
-    lbins += [maxScore+1]
-    lbars, lbins = np.histogram(scores,lbins,weights=weights)
-    #print(f'Sum of letter grade bar heights: {sum(lbars)}')
-
-    # Cumulative 
-    # =-=-=-==-=-=-==-=-=-==-=-=-==-=-=-=
-
-    # cumulative by bars 
-    cumbars = np.zeros(len(bars))
-    for i in range(len(bars)):
-        cumbars[i] = sum(bars[0:(i+1)])
-
-    # cumulative by individual scores 
-    cumscores = np.arange(1,1+numScore,1)/numScore
+    # Histogram, letter grade, cumulative and summary statistics (no plot yet)
+    profiling.checkpoint('stats')
+    # scores may also be a ScoreAccumulator of streaming submissions
+    if(isinstance(scores,ScoreAccumulator)):
+        assert np.array_equal(scores.bins,bins) , "ScoreAccumulator bins differ from the requested bins"
+        stats = scores.stats()
+    else:
+        stats = compute_score_stats(scores,maxScore,letters,bins)
+    scores = stats.scores
+    numScore = stats.num_scores
+    bars, bins = stats.bars, stats.bins
+    lgrade = stats.letter_grades
+    lbars, lbins = stats.letter_bars, stats.letter_bins
+    cumbars = stats.cumbars
+    cumscores = stats.cumscores
 
     # colorbars (pass in numbers between 0 and 1 and they are mapped to colors)
+    profiling.checkpoint('artists')
     lcolorbar = cbar([x/(maxScore) for x in lbins])
     scolorbar = cbar([x/(bins[-1]) for x in bins])
     #print(lcolorbar,[x/(maxScore+1) for x in lbins])
 
     # Max bar for ylim adjustments 
-    bar_max = max( max(lbars) , max(bars) )
+    bar_max = stats.bar_max
 
     # Now make the histograms (bar allows you to pass a color array)
     plt.bar(lbins[:-1], lbars, width=np.diff(lbins), align='edge', color=lcolorbar, alpha=0.5, edgecolor='none',zorder=0) 
@@ -135,31 +139,15 @@ def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,out
 
     # Stats  
     # =-=-=-==-=-=-==-=-=-==-=-=-==-=-=-=
-    score_mean = np.mean(scores)
-    score_median = np.median(scores)
-
-    # Calculate max of scores 
-    score_max = max(scores) 
-    score_max_count = len(scores[scores==score_max])
-
-    # Calculate mode(s) 
-    ind_score_freq = [list(scores).count(i) for i in range(0,maxScore+1)]
-    ind_score_num = list(range(0,maxScore+1))
-    score_mode_freq = max(ind_score_freq)
-    score_mode_ties = ind_score_freq.count(score_mode_freq)
-    score_mode = [] 
-    for i in range(score_mode_ties):
-        idx = ind_score_freq.index(score_mode_freq)
-        score_mode.append(ind_score_num[idx])
-        ind_score_freq.pop(idx)
-        ind_score_num.pop(idx) 
+    score_mean = stats.mean
+    score_median = stats.median
+    score_max = stats.score_max
+    score_max_count = stats.score_max_count
+    score_mode = stats.mode
 
     # Put mode (\^M) above the relevant bars 
     if(Qinfo["showMode"]):
-        for local_mode in score_mode:
-            for mode_idx in range(len(bins)-1):
-                if( (bins[mode_idx]<=local_mode) and (bins[mode_idx+1]>local_mode) ):
-                    break 
+        for mode_idx in stats.mode_bins:
             score_mid = 0.5*(bins[mode_idx] + bins[mode_idx+1])  # center of the bin
             yshift =  stat_shift*dy 
             if bars[mode_idx]+yshift < 0: 
@@ -168,9 +156,7 @@ def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,out
 
     # Put Q2 above median 
     if(Qinfo["showMedian"]):
-        for med_idx in range(len(bins)-1):
-            if( (bins[med_idx]<=score_median) and (bins[med_idx+1]>score_median) ):
-                break 
+        med_idx = stats.median_bin
         score_mid = 0.5*(bins[med_idx] + bins[med_idx+1])  # center of the bin
         yshift =  stat_shift*dy 
         if bars[med_idx]+yshift < 0: 
@@ -181,9 +167,7 @@ def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,out
 
     # Put mu above mean 
     if(Qinfo["showMean"]):
-        for mean_idx in range(len(bins)-1):
-            if( (bins[mean_idx]<=score_mean) and (bins[mean_idx+1]>score_mean) ):
-                break 
+        mean_idx = stats.mean_bin
         score_mid = 0.5*(bins[mean_idx] + bins[mean_idx+1])  # center of the bin
         yshift =  stat_shift*dy 
         if bars[mean_idx]+yshift < 0: 
@@ -195,25 +179,7 @@ def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,out
 
     # Title alterations
     # =-=-=-==-=-=-==-=-=-==-=-=-==-=-=-=
-    thetitle = title 
-    if(Qinfo["showMean"]):
-        thetitle += " , " + r'Mean $\mu$: ' + f'{score_mean:.1f}'
-
-    if(Qinfo["showMedian"]):
-        thetitle += " , " + r'Median $Q_2$: ' + f'{round(score_median,1)}'
-
-    if(Qinfo["showMode"]):
-        if(len(score_mode)>1):
-            thetitle += " , " + r'Modes $\^M$: '
-        else:
-            thetitle += " , " + r'Mode $\^M$: '
-        for idx,local_mode in enumerate(score_mode):
-            thetitle += f'{int(local_mode)}'
-            if(idx<len(score_mode)-1):
-                thetitle += ', '
-            
-    if(Qinfo["showMax"]):
-        thetitle += " , " + f'Max: {int(score_max)} ({score_max_count})'
+    thetitle = histo_title(title,stats,Qinfo)
 
     plt.title(thetitle,fontsize=9)
 
@@ -265,7 +231,7 @@ def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,out
             plt.scatter(score_cum[1:],score_frac[1:],s=Qinfo["cumulative_ps"],facecolor=Qinfo["Cumulative_score_color"],alpha=0.5,clip_on=False,zorder=2)
 
     if(outname is not None):
-        plt.savefig(outname)
+        save_figure(plt.gcf(),outname)
         print(f'Saved graph to {outname}')
         
         
@@ -273,22 +239,25 @@ def gen_IntegerHisto(scores,maxScore,Qinfo,letters,title,bins,tick_list,cbar,out
 
 
 
-def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,offset,outname=None):
+def _rect(left,right,bot,top):
+    """Vertices of an axis-aligned rectangle (for a PolyCollection)."""
+    return [(left,bot),(right,bot),(right,top),(left,top)]
 
-    assert 0 < frac_pts_returned <= 1, f'Fraction of points returned should be between 0 and 1: {frac_pts_returned}'
+@profiling.profiled
+def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,offset,outname=None):
 
+    profiling.checkpoint('data')
     nQuestions = QuizInfo["numQuestions"]
-    orig_score = np.arange(0,nQuestions+1,1)
-    pts_returned = np.floor(frac_pts_returned*np.arange(nQuestions,-1,-1))
-    new_score = orig_score + pts_returned 
+    orig_score, pts_returned, new_score = correction_curve(nQuestions,frac_pts_returned)
 
     # Create figure 
+    profiling.checkpoint('artists')
     fig, ax = plt.subplots(1,2,sharey=True,figsize=(12,6)) 
     plt.subplots_adjust(wspace=0)
 
     # Line plots of original and new scores 
-    ax[0].plot(orig_score,orig_score,'-o',color=SMC['red'],label='No Corrections',zorder=2)
-    ax[0].plot(orig_score,new_score,'-o',color=SMC['canyon'],label='With Corrections',zorder=2)
+    ax[0].plot(orig_score,orig_score,'-o',color=SMC_COLORS['red'],label='No Corrections',zorder=2)
+    ax[0].plot(orig_score,new_score,'-o',color=SMC_COLORS['canyon'],label='With Corrections',zorder=2)
 
     ax[0].set_xlabel("Original Score")
     ax[0].set_ylabel("New Score")
@@ -302,7 +271,11 @@ def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,
     grade_bdys_sorted.sort() 
     grade_bdys_sorted.append(nQuestions)
 
+    # Each shading layer is one PolyCollection of rectangles. Rectangles are still composited one by one,
+    # so overlaps with alpha<1 get darker as with individual fill_between calls.
+
     # Shade regions where grade remains unchanged 
+    unchanged = []
     for gidx in range(len(grade_bdys_sorted)-1):
         left = grade_bdys_sorted[gidx]-offset 
         right = grade_bdys_sorted[gidx+1]-offset 
@@ -311,9 +284,11 @@ def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,
         if(gidx==len(grade_bdys_sorted)-2):
             right += 2*offset 
             top += 2*offset 
-        ax[0].fill_between([left,right],[top,top],[bot,bot],color=SMC['sun'],alpha=shade_alpha,linewidth=0)
+        unchanged.append(_rect(left,right,bot,top))
+    ax[0].add_collection(PolyCollection(unchanged,facecolor=SMC_COLORS['sun'],alpha=shade_alpha,linewidth=0))
 
     # Shade regions where grade improves (alpha<1 makes multiple letter grade changes darker colors 
+    improved = []
     for grade_boost in range(1,len(grade_bdys)):
 
         for gidx in range(len(grade_bdys_sorted)-2):
@@ -325,11 +300,10 @@ def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,
             right = grade_bdys_sorted[gidx+1]-offset 
             top = grade_bdys_sorted[-1]+offset 
             bot = grade_bdys_sorted[gidx+grade_boost]-offset 
-            if(gidx==len(grade_bdys_sorted)-2):
-                right += 2*offset 
-                top += 2*offset 
+            improved.append(_rect(left,right,bot,top))
 
-            ax[0].fill_between([left,right],[top,top],[bot,bot],color=SMC['water'],alpha=shade_alpha,linewidth=0)
+    ax[0].add_collection(PolyCollection(improved,facecolor=SMC_COLORS['water'],alpha=shade_alpha,linewidth=0))
+    ax[0].autoscale_view()
 
     for idx,grd in enumerate(grade_bdys.keys()):
         left = grade_bdys_sorted[0]-0.5*offset
@@ -340,8 +314,8 @@ def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,
 
 
     # Line plots of original and new scores 
-    ax[1].plot(orig_score,orig_score,'-o',color=SMC['red'],label='No Corrections')
-    ax[1].plot(orig_score,new_score,'-o',color=SMC['canyon'],label='With Corrections')
+    ax[1].plot(orig_score,orig_score,'-o',color=SMC_COLORS['red'],label='No Corrections')
+    ax[1].plot(orig_score,new_score,'-o',color=SMC_COLORS['canyon'],label='With Corrections')
 
     ax[1].set_xlabel("Original Score")
     #ax[1].set_ylabel("New Score")
@@ -352,18 +326,18 @@ def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,
 
 
     # Shade regions where grade remains unchanged 
-    for gidx in range(0,1):
-        left = grade_bdys_sorted[gidx]-offset 
-        right = grade_bdys_sorted[gidx+1]-offset 
-        top = grade_bdys_sorted[gidx+1]-offset 
-        bot = grade_bdys_sorted[gidx]-offset 
-        if(gidx==len(grade_bdys_sorted)-2):
-            right += 2*offset 
-            top += 2*offset 
-        ax[1].fill_between([left,right],[top,top],[bot,bot],color=SMC['garden'],alpha=shade_alpha,linewidth=0)
+    left = grade_bdys_sorted[0]-offset 
+    right = grade_bdys_sorted[1]-offset 
+    top = grade_bdys_sorted[1]-offset 
+    bot = grade_bdys_sorted[0]-offset 
+    if(len(grade_bdys_sorted)==2):
+        right += 2*offset 
+        top += 2*offset 
+    ax[1].add_collection(PolyCollection([_rect(left,right,bot,top)],facecolor=SMC_COLORS['garden'],alpha=shade_alpha,linewidth=0))
 
 
     # Shade regions based on new letter grade 
+    new_grade = []
     for botshift in range(0,len(grade_bdys_sorted)-2):
         for gidx in range(botshift,len(grade_bdys_sorted)-2):
             
@@ -376,8 +350,10 @@ def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,
                 right += 2*offset 
                 top += 2*offset 
 
-            #plt.fill_between([left,right],[top,top],[bot,bot],color=SMC['bay'],alpha=0.4,linewidth=1)
-            ax[1].fill_betweenx([bot,top],[right,right],[left,left],color=SMC['bay'],alpha=shade_alpha,linewidth=0)
+            new_grade.append(_rect(left,right,bot,top))
+
+    ax[1].add_collection(PolyCollection(new_grade,facecolor=SMC_COLORS['bay'],alpha=shade_alpha,linewidth=0))
+    ax[1].autoscale_view()
 
     for idx,grd in enumerate(grade_bdys.keys()):
         left = grade_bdys_sorted[0]-0.5*offset
@@ -389,35 +365,144 @@ def gen_QuizCorrections(QuizInfo,frac_pts_returned,grade_bdys,shade_alpha,title,
 
     if(outname is not None):
         print(f'Saving plot to file {outname}')
-        plt.savefig(outname)
+        save_figure(plt.gcf(),outname)
 
     return() 
 
+def gen_CorrectionSweep(sweep,metric,title,boundary_labels=None,cbar=None,outname=None):
+    """
+    Heatmap of one sweep_corrections metric: fraction of points returned (x) vs boundary set (y).
+    metric is 'frac_improved', 'mean_grade_change', or a letter grade for the change of that grade's class fraction.
+    """
+    if(metric in sweep.grades):
+        values = sweep.dist_shift[:,:,sweep.grades.index(metric)]
+        cbar_label = f'Change in fraction of {metric} grades'
+    else:
+        values = getattr(sweep,metric)
+        cbar_label = metric.replace('_',' ').capitalize()
+
+    num_sets = values.shape[1]
+    plt.pcolormesh(100*sweep.fracs,np.arange(num_sets),values.T,cmap=cbar,shading='nearest')
+    plt.colorbar(label=cbar_label,orientation='vertical')
+
+    plt.xlabel('Possible points returned (%)')
+    plt.ylabel('Grade boundary set')
+    if(boundary_labels is not None):
+        plt.yticks(np.arange(num_sets),boundary_labels,fontsize=8)
+    plt.title(title,fontsize=10)
+
+    if(outname is not None):
+        print(f'Saving plot to file {outname}')
+        save_figure(plt.gcf(),outname)
+
+    return
+
+def _as_gradebook(gbook,plot_info):
+    """Gradebook (or CSV filename) restricted to plot_info["columns"] (regex / list; None for all)."""
+    if(isinstance(gbook,str)):
+        gbook = load_gradebook(gbook)
+    if(plot_info["columns"] is not None):
+        gbook = gbook.select(plot_info["columns"])
+    return gbook
+
 def gen_ParticpationAvg(gbook,plot_info,title,outname=None):
+    """
+    Fraction of the class submitting each assignment, with the class-average participation.
+    plot_info keys: "columns", "bar_color", "title_fs".
+    """
+
+    gbook = _as_gradebook(gbook,plot_info)
+    student_rate, assignment_rate = submission_rates(gbook)
+    xpos = np.arange(gbook.num_assignments)
+
+    plt.bar(xpos,assignment_rate,width=0.8,color=plot_info["bar_color"],edgecolor='black',zorder=1)
+    plt.axhline(np.mean(student_rate),color='black',linestyle='--',alpha=0.6,lw=1,zorder=2)
+    plt.text(xpos[-1]+0.4,np.mean(student_rate),f' {np.mean(student_rate):.2f}',fontsize=9,va='bottom',ha='right')
 
+    plt.xticks(xpos,gbook.columns,rotation=60,ha='right',fontsize=8)
+    plt.ylabel('Fraction of the Class Submitting')
+    plt.ylim([0,1.05])
+    plt.title(title + f' , $N=${gbook.num_students}',fontsize=plot_info["title_fs"])
+    plt.tight_layout()
 
+    if(outname is not None):
+        print(f'Saving plot to file {outname}')
+        save_figure(plt.gcf(),outname)
 
     return
 
 def gen_AssignmentAvg(gbook,plot_info,title,outname=None):
+    """
+    Mean (+/- standard deviation) fraction of the points on each assignment.
+    plot_info keys: "columns", "bar_color", "title_fs", "missing_as_zero".
+    """
 
+    gbook = _as_gradebook(gbook,plot_info)
+    mean, std = assignment_averages(gbook,missing_as_zero=plot_info["missing_as_zero"])
+    xpos = np.arange(gbook.num_assignments)
+
+    plt.bar(xpos,mean,width=0.8,color=plot_info["bar_color"],edgecolor='black',zorder=1)
+    plt.errorbar(xpos,mean,yerr=std,fmt='none',ecolor='black',capsize=3,lw=1,zorder=2)
+
+    plt.xticks(xpos,gbook.columns,rotation=60,ha='right',fontsize=8)
+    plt.ylabel('Average Fraction of Points')
+    plt.ylim([0,1.1])
+    plt.title(title + f' , $N=${gbook.num_students}',fontsize=plot_info["title_fs"])
+    plt.tight_layout()
+
+    if(outname is not None):
+        print(f'Saving plot to file {outname}')
+        save_figure(plt.gcf(),outname)
 
     return 
 
 
 
-def gen_CorrelationScatter(data,maxScores,Qinfo,letters,labels,title,tick_lists,cbar=None,outname=None):
+def density_raster(x,y,xlim,ylim,bins,values=None):
+    """
+    Bin points into a bins x bins raster over xlim x ylim (points outside are dropped).
+    Returns the number of points per pixel, or with values the mean value per pixel; empty pixels are NaN.
+    Rows are y (origin at the bottom), as expected by imshow(origin='lower').
+    """
+    x = np.asarray(x,dtype=float)
+    y = np.asarray(y,dtype=float)
+    nx, ny = (bins,bins) if np.isscalar(bins) else bins
+    ix = np.floor((x-xlim[0])*(nx/(xlim[1]-xlim[0]))).astype(np.intp)
+    iy = np.floor((y-ylim[0])*(ny/(ylim[1]-ylim[0]))).astype(np.intp)
+    ix[x==xlim[1]] = nx-1  # right/top edges belong to the last pixel
+    iy[y==ylim[1]] = ny-1
+    inside = (ix>=0) & (ix<nx) & (iy>=0) & (iy<ny)
+    flat = iy[inside]*nx + ix[inside]
+
+    counts = np.bincount(flat,minlength=nx*ny).reshape(ny,nx).astype(float)
+    if(values is None):
+        raster = counts
+    else:
+        sums = np.bincount(flat,weights=np.asarray(values,dtype=float)[inside],minlength=nx*ny).reshape(ny,nx)
+        with np.errstate(invalid='ignore'):
+            raster = sums/counts
+    raster[counts==0] = np.nan
+    return raster
+
+@profiling.profiled
+def gen_CorrelationScatter(data,maxScores,Qinfo,letters,labels,title,tick_lists,cbar=None,outname=None,
+                           density_threshold=DENSITY_THRESHOLD,density_bins=DENSITY_BINS):
 
     # Optional data arrays
     # Third data becomes the color 
     # Fourth data becomes the size of the points
+    # With more than density_threshold points, one density image is drawn instead of a scatter:
+    # the number of points per pixel, or (with a third array) the mean color value per pixel. Point sizes are not shown then.
 
     assert len(data)>=2 , "Need at least two data arrays to plot a correlation scatter plot" 
     assert all(len(data[0])==len(d) for d in data), "All data arrays must have the same length"
     assert len(data)==len(labels), "Number of data arrays must match number of labels"
+    has_color = len(data)>2
+    has_size = len(data)>3
 
 
 
+    profiling.checkpoint('artists')
     plt.xlabel(labels[0])
     plt.ylabel(labels[1])
     plt.title(title,fontsize=Qinfo["title_fs"])
@@ -425,30 +510,97 @@ def gen_CorrelationScatter(data,maxScores,Qinfo,letters,labels,title,tick_lists,
     plt.ylim([0,maxScores[1]])
     plt.xticks(tick_lists[0],[int(x) for x in tick_lists[0]])
     plt.yticks(tick_lists[1],[int(x) for x in tick_lists[1]])
-        
-    plt.scatter(data[0],data[1],s=map_pointsize(data[3]) if len(data)>3 else Qinfo["scatter_ps"],alpha=Qinfo["scatter_alpha"],c=data[2] if len(data)>2 else 'black',edgecolor='black',linewidth=0.5)
 
-    if(len(data)>2):
-        plt.colorbar(label=labels[2],orientation='vertical')
-        plt.clim(0,maxScores[2])  # Set color limits if color data is provided
-        plt.clabel(labels[2],fontsize=Qinfo["cbar_fs"])
+    if(len(data[0])>density_threshold):
+        profiling.checkpoint('density')
+        raster = density_raster(data[0],data[1],(0,maxScores[0]),(0,maxScores[1]),density_bins,
+                                values=data[2] if has_color else None)
+        profiling.checkpoint('artists')
+        plt.imshow(raster,origin='lower',extent=[0,maxScores[0],0,maxScores[1]],aspect='auto',
+                   interpolation='nearest',cmap=cbar)
+        # imshow resets the limits to the extent; keep the axes as set above
+        plt.xlim([0,maxScores[0]])
+        plt.ylim([0,maxScores[1]])
+        cbar_label = labels[2] if has_color else 'Number of Students'
+    else:
+        plt.scatter(data[0],data[1],s=map_pointsize(data[3]) if has_size else Qinfo["scatter_ps"],alpha=Qinfo["scatter_alpha"],c=data[2] if has_color else 'black',cmap=cbar if has_color else None,edgecolor='black',linewidth=0.5)
+        cbar_label = labels[2] if has_color else None
+
+    if(cbar_label is not None):
+        colorbar = plt.colorbar(orientation='vertical')
+        colorbar.set_label(cbar_label,fontsize=Qinfo["cbar_fs"])
+        if(has_color):
+            plt.clim(0,maxScores[2])  # Set color limits if color data is provided
+
+
+
+    if(outname is not None):
+        print(f'Saving plot to file {outname}')
+        save_figure(plt.gcf(),outname)
+
+    return
+
+def gen_CorrelationMatrix(corr,labels,title,cbar=None,outname=None):
+    """
+    Heatmap of an (A, A) correlation matrix (e.g. from correlations.correlation_matrix), drawn as one image.
+    Labels are shown when there are few enough assignments to read them.
+    """
+
+    num = corr.shape[0]
+    plt.imshow(corr,cmap=cbar,vmin=-1,vmax=1,interpolation='nearest')
+    colorbar = plt.colorbar(orientation='vertical')
+    colorbar.set_label('Correlation')
+
+    if(num<=MAX_MATRIX_LABELS):
+        plt.xticks(np.arange(num),labels,rotation=90,fontsize=6)
+        plt.yticks(np.arange(num),labels,fontsize=6)
+    plt.title(title,fontsize=10)
 
+    if(outname is not None):
+        print(f'Saving plot to file {outname}')
+        save_figure(plt.gcf(),outname)
 
+    return
+
+def gen_ScatterMatrix(scores,missing,labels,title,bins=32,limits=None,cbar=None,outname=None):
+    """
+    Small multiples of every pair of assignments (column j along x, column i along y in panel i, j),
+    binned into density panels and drawn as one image with shared axes.
+    """
+
+    num = scores.shape[1]
+    mosaic = pair_density_mosaic(scores,missing,bins,limits)
+    plt.imshow(mosaic,cmap=cbar,norm='log',interpolation='nearest',extent=[0,num,num,0])
+    colorbar = plt.colorbar(orientation='vertical')
+    colorbar.set_label('Number of Students')
+
+    # Panel borders as two line collections
+    edges = np.arange(num+1)
+    plt.hlines(edges,0,num,color='black',linewidth=0.5)
+    plt.vlines(edges,0,num,color='black',linewidth=0.5)
+
+    if(num<=MAX_MATRIX_LABELS):
+        plt.xticks(edges[:-1]+0.5,labels,rotation=90,fontsize=6)
+        plt.yticks(edges[:-1]+0.5,labels,fontsize=6)
+    else:
+        plt.xticks([])
+        plt.yticks([])
+    plt.title(title,fontsize=10)
 
     if(outname is not None):
         print(f'Saving plot to file {outname}')
-        plt.savefig(outname)
+        save_figure(plt.gcf(),outname)
 
     return
 
 def map_pointsize(data):
 
-    data_array = np.array(data)
-    data_max = max(data)
-    data_min = min(data)
+    data_array = np.asarray(data,dtype=float)
+    data_max = np.max(data_array)
+    data_min = np.min(data_array)
 
     if(data_max == data_min):
-        return np.ones(len(data)) * 100
+        return np.ones(len(data_array)) * 100
     else:
         # Normalize data to a range of 10 to 1000
         return np.interp(data_array, (data_min, data_max), (10, 1000))
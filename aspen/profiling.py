@@ -0,0 +1,228 @@
+'''
+Opt-in profiling of the plotting functions (gen_IntegerHisto, gen_QuizCorrections, gen_CorrelationScatter).
+
+Each profiled call records its wall time per phase (e.g. stats, artists, render, encode_write),
+the number of artists in the figure and the size of the saved file. "render" is the figure draw
+inside savefig (artist drawing, text / mathtext layout); "encode_write" is the rest of savefig
+(PNG/PDF encoding and the disk write), split at matplotlib's draw_event so nothing is drawn twice.
+
+Turn it on for a block of code:
+
+    from aspen.profiling import profile_plots
+
+    with profile_plots('plots.jsonl') as prof:
+        gen_IntegerHisto(...)
+    prof.print_summary()
+
+or for a whole run with the environment variable ASPEN_PROFILE=<file.jsonl> (one JSON line per
+call is appended as it happens). Inside the functions, profiling.checkpoint('name') starts a new
+phase; when profiling is off the hooks cost one global check each.
+'''
+
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+PROFILE_ENV_VAR: str = 'ASPEN_PROFILE'
+
+_state = threading.local()  # per-thread stack of open call records
+_RECORD_LOCK = threading.Lock()  # guards the hold counts of records finished by writer threads
+
+
+class PlotProfiler:
+    """
+    Collects one record (dict) per profiled plotting call; thread-safe.
+    If jsonl is given, every record is also appended to that file as soon as the call ends (or, for a
+    figure saved in the background by async_saving, once its file is written).
+    """
+
+    def __init__(self, jsonl: str | None = None):
+        self.jsonl = jsonl
+        self.records: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: dict) -> None:
+        with self._lock:
+            self.records.append(record)
+            if self.jsonl is not None:
+                with open(self.jsonl, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+
+    def write_jsonl(self, filename: str) -> None:
+        """Write all records, one JSON object per line."""
+        with self._lock, open(filename, 'w') as f:
+            for record in self.records:
+                f.write(json.dumps(record) + '\n')
+
+    def summary(self) -> dict[str, dict]:
+        """Per function: number of calls, mean total seconds, mean seconds per phase, mean artists and bytes."""
+        out: dict[str, dict] = {}
+        with self._lock:
+            records = list(self.records)
+        for rec in records:
+            s = out.setdefault(rec['function'], {'calls': 0, 'total_s': 0.0, 'phases': {}, 'num_artists': 0,
+                                                 'file_bytes': 0})
+            s['calls'] += 1
+            s['total_s'] += rec['total_s']
+            s['num_artists'] += rec['num_artists']
+            s['file_bytes'] += rec['file_bytes'] or 0
+            for name, sec in rec['phases'].items():
+                s['phases'][name] = s['phases'].get(name, 0.0) + sec
+        for s in out.values():
+            n = s['calls']
+            s['total_s'] /= n
+            s['num_artists'] /= n
+            s['file_bytes'] /= n
+            s['phases'] = {k: v/n for k, v in s['phases'].items()}
+        return out
+
+    def print_summary(self) -> None:
+        for func, s in self.summary().items():
+            phases = ' , '.join(f'{k} {1e3*v:.1f} ms' for k, v in s['phases'].items())
+            print(f'{func}: {s["calls"]} calls , mean {1e3*s["total_s"]:.1f} ms ({phases}) , '
+                  f'{s["num_artists"]:.0f} artists , {s["file_bytes"]/1024:.1f} kB')
+
+
+_ACTIVE: PlotProfiler | None = PlotProfiler(os.environ[PROFILE_ENV_VAR]) if os.environ.get(PROFILE_ENV_VAR) else None
+
+
+def enabled() -> bool:
+    return _ACTIVE is not None
+
+
+@contextlib.contextmanager
+def profile_plots(jsonl: str | None = None) -> Iterator[PlotProfiler]:
+    """Profile the plotting calls inside the with-block (records optionally appended to jsonl)."""
+    global _ACTIVE
+    previous, _ACTIVE = _ACTIVE, PlotProfiler(jsonl)
+    try:
+        yield _ACTIVE
+    finally:
+        _ACTIVE = previous
+
+
+def _current() -> dict | None:
+    stack = getattr(_state, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def _close_open_phase(record: dict, now: float) -> None:
+    name, t0 = record.pop('_open', (None, None))
+    if name is not None:
+        record['phases'][name] = record['phases'].get(name, 0.0) + now - t0
+
+
+def checkpoint(name: str) -> None:
+    """
+    End the current phase (if any) of the profiled call and start phase name. Lets a function be split
+    into phases with one line per phase; the last phase ends at savefig or when the call returns.
+    """
+    if _ACTIVE is None:
+        return
+    record = _current()
+    if record is not None:
+        now = time.perf_counter()
+        _close_open_phase(record, now)
+        record['_open'] = (name, now)
+
+
+def _num_artists(fig) -> int:
+    return len(fig.findobj()) - 1  # excluding the figure
+
+
+def _release(record: dict) -> None:
+    """Drop one hold on record; the last one (call returned, background save done) hands it to its profiler."""
+    with _RECORD_LOCK:
+        record['_holds'] -= 1
+        if record['_holds'] > 0:
+            return
+        del record['_holds']
+        profiler = record.pop('_profiler')
+    profiler.add(record)
+
+
+def defer_record(fig) -> Callable[[int | None], None] | None:
+    """
+    For a figure handed to a background writer by a profiled call: counts its artists now (before
+    anyone else can touch it) and returns the callback to run with the file size once it is written.
+    The call's record is added to the profiler when both the call and the save are done.
+    None when not profiling.
+    """
+    record = _current() if _ACTIVE is not None else None
+    if record is None:
+        return None
+    record['num_artists'] = _num_artists(fig)
+    record['_deferred'] = True
+    with _RECORD_LOCK:
+        record['_holds'] += 1
+
+    def saved(nbytes: int | None) -> None:
+        record['file_bytes'] = nbytes
+        _release(record)
+    return saved
+
+
+def savefig(fig, outname, **kwargs) -> None:
+    """fig.savefig, split into render and encode_write phases when profiling is on."""
+    record = _current() if _ACTIVE is not None else None
+    if record is None:
+        fig.savefig(outname, **kwargs)
+        return
+    record['num_artists'] = _num_artists(fig)
+    _close_open_phase(record, time.perf_counter())
+    marks = []
+    cid = fig.canvas.mpl_connect('draw_event', lambda event: marks.append(time.perf_counter()))
+    t0 = time.perf_counter()
+    try:
+        fig.savefig(outname, **kwargs)
+    finally:
+        t1 = time.perf_counter()
+        fig.canvas.mpl_disconnect(cid)
+    t_draw = marks[-1] if marks else t0
+    phases = record['phases']
+    phases['render'] = phases.get('render', 0.0) + t_draw - t0
+    phases['encode_write'] = phases.get('encode_write', 0.0) + t1 - t_draw
+
+
+def profiled(func: Callable) -> Callable:
+    """Decorator recording a plotting function's phases, artists and output size when profiling is on."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _ACTIVE
+        if profiler is None:
+            return func(*args, **kwargs)
+
+        import matplotlib.pyplot as plt
+        outname = signature.bind(*args, **kwargs).arguments.get('outname')
+        record = {'function': func.__name__, 'start': time.time(), 'total_s': 0.0, 'phases': {},
+                  'num_artists': None, 'outname': outname if isinstance(outname, str) else None, 'file_bytes': None,
+                  'pid': os.getpid(), 'thread': threading.current_thread().name, 'error': None,
+                  '_profiler': profiler, '_holds': 1}
+        stack = _state.__dict__.setdefault('stack', [])
+        stack.append(record)
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as err:
+            record['error'] = repr(err)
+            raise
+        finally:
+            record['total_s'] = time.perf_counter() - t0
+            _close_open_phase(record, t0 + record['total_s'])
+            stack.pop()
+            if record['num_artists'] is None:  # nothing saved through savefig / defer_record
+                fig = plt.gcf() if plt.get_fignums() else None
+                record['num_artists'] = _num_artists(fig) if fig is not None else 0
+            # A deferred (background) save sets file_bytes itself once the file is written
+            if not record.pop('_deferred', False) and record['outname'] is not None \
+                    and os.path.exists(record['outname']):
+                record['file_bytes'] = os.path.getsize(record['outname'])
+            _release(record)
+    return wrapper
@@ -0,0 +1,179 @@
+'''
+Background figure saving, so rendering the next figure overlaps with encoding / writing the last one.
+
+A FigureWriter hands figures to a small thread pool. At most max_pending figures are queued
+(submit blocks beyond that, which bounds memory), flush() waits for everything queued so far and
+raises SaveError if any save failed. A target of None renders to memory and returns the bytes
+(e.g. to upload or zip them), with no temporary files.
+
+The plotting functions save through save_figure, so inside async_saving() they queue their
+figures instead of saving them in line:
+
+    from aspen.saving import async_saving
+
+    with async_saving(max_workers=4) as writer:
+        for q in quizzes:
+            plt.figure()
+            gen_IntegerHisto(..., outname=f'{q}.png')   # returns as soon as the figure is queued
+    # leaving the block waits for all files and raises SaveError on failures
+
+Queued figures are closed in pyplot (they belong to the writer from then on), so do not modify a
+figure after it has been submitted.
+'''
+
+import contextlib
+import io
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from . import profiling, themes
+
+DEFAULT_WORKERS: int = 2
+
+
+@dataclass
+class SaveResult:
+    """Outcome of one save: target (None for in-memory), bytes written, seconds, and the in-memory data."""
+    target: object
+    nbytes: int
+    seconds: float
+    data: bytes | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class SaveError(RuntimeError):
+    """One or more background saves failed; .results holds every SaveResult of the flush."""
+
+    def __init__(self, results: list[SaveResult]):
+        self.results = results
+        failed = [r for r in results if not r.ok]
+        super().__init__(f'{len(failed)} of {len(results)} figure saves failed, first: '
+                         f'{failed[0].target!r}: {failed[0].error!r}')
+
+
+def figure_bytes(fig, format: str = 'png', **savefig_kwargs) -> bytes:
+    """Render a figure to an in-memory file and return its bytes."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=format, **savefig_kwargs)
+    return buffer.getvalue()
+
+
+def _write(fig, target, savefig_kwargs: dict) -> SaveResult:
+    t0 = time.perf_counter()
+    try:
+        with themes.figure_context(fig):  # themed figures are drawn under their theme, not the caller's rcParams
+            if target is None:
+                data = figure_bytes(fig, **savefig_kwargs)
+                return SaveResult(None, len(data), time.perf_counter() - t0, data=data)
+            fig.savefig(target, **savefig_kwargs)
+        nbytes = os.path.getsize(target) if isinstance(target, (str, os.PathLike)) else 0
+        return SaveResult(target, nbytes, time.perf_counter() - t0)
+    except Exception as err:
+        return SaveResult(target, 0, time.perf_counter() - t0, error=err)
+
+
+def _save(fig, target, savefig_kwargs: dict, on_saved: Callable[[int | None], None] | None = None) -> SaveResult:
+    result = _write(fig, target, savefig_kwargs)
+    if on_saved is not None:
+        on_saved(result.nbytes if result.ok else None)  # before the future completes, so flush() covers it
+    return result
+
+
+class FigureWriter:
+    """
+    Bounded background writer for matplotlib figures.
+
+    Args:
+        max_workers (int, opt = DEFAULT_WORKERS): Writer threads.
+        max_pending (int, optional): Figures queued or being written before submit blocks (default 2*max_workers).
+        close_figures (bool, opt = True): Close submitted figures in pyplot so new plt.figure() calls get new figures.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_pending: int | None = None, close_figures: bool = True):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='aspen-save')
+        self._slots = threading.BoundedSemaphore(2*max_workers if max_pending is None else max_pending)
+        self._lock = threading.Lock()
+        self._futures: list[Future] = []
+        self.close_figures = close_figures
+
+    def submit(self, fig, target=None, on_saved: Callable[[int | None], None] | None = None,
+               **savefig_kwargs) -> Future:
+        """
+        Queue fig for saving to target (file name or file-like object; None for in-memory bytes).
+        Blocks while max_pending saves are outstanding.
+        The future's result is a SaveResult. on_saved, if given, is called with the bytes written
+        (None on failure) in the writer thread, before the future completes.
+        """
+        profiling.checkpoint('queue_wait')  # time blocked on a full queue (when profiling a plot call)
+        with themes.released():  # the writers need the theme lock to draw themed figures
+            self._slots.acquire()
+        if self.close_figures:
+            import matplotlib.pyplot as plt
+            plt.close(fig)
+        try:
+            future = self._pool.submit(_save, fig, target, savefig_kwargs, on_saved)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def flush(self, raise_errors: bool = True) -> list[SaveResult]:
+        """Wait for every queued save; raise SaveError (after all finished) if any failed."""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        with themes.released():
+            results = [f.result() for f in futures]
+        if raise_errors and any(not r.ok for r in results):
+            raise SaveError(results)
+        return results
+
+    def close(self, raise_errors: bool = True) -> list[SaveResult]:
+        """Flush and stop the writer threads."""
+        try:
+            return self.flush(raise_errors)
+        finally:
+            with themes.released():
+                self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> 'FigureWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(raise_errors=exc_type is None)  # don't hide an exception raised in the block
+
+
+_WRITER: FigureWriter | None = None
+
+
+@contextlib.contextmanager
+def async_saving(max_workers: int = DEFAULT_WORKERS, max_pending: int | None = None) -> Iterator[FigureWriter]:
+    """Route save_figure (and so the plotting functions' outname saves) through a FigureWriter in this block."""
+    global _WRITER
+    previous, _WRITER = _WRITER, FigureWriter(max_workers, max_pending)
+    try:
+        with _WRITER as writer:
+            yield writer
+    finally:
+        _WRITER = previous
+
+
+def save_figure(fig, outname, **savefig_kwargs) -> None:
+    """Save fig to outname: queued when inside async_saving(), otherwise right away (profiled if enabled)."""
+    if _WRITER is not None:
+        # A profiled call's record gets this figure's artists now and the file size once it is written
+        _WRITER.submit(fig, outname, on_saved=profiling.defer_record(fig), **savefig_kwargs)
+    else:
+        with themes.figure_context(fig):
+            profiling.savefig(fig, outname, **savefig_kwargs)
+
@@ -0,0 +1,281 @@
+'''
+Score statistics behind gen_IntegerHisto, without any plotting.
+
+Everything is vectorized: per-score counts come from bincount, cumulative curves from cumsum, and the
+histogram bins holding the mean / median / modes from searchsorted. Runs in O(N log N + maxScore)
+(the log from sorting for the cumulative-by-score curve).
+
+e.g.,
+from aspen.score_stats import compute_score_stats
+
+stats = compute_score_stats(scores, maxScore=20, letters={'A': 17, 'B': 14, 'C': 10, 'D': 7, 'F': 0}, bins=21)
+stats.mean, stats.median, stats.mode, stats.letter_bars
+
+For scores that arrive one at a time (e.g. during an exam), ScoreAccumulator keeps the counts, an
+exact integer sum (for the mean) and a running (Welford) variance in O(maxScore) memory; each new score is an O(1) update and
+stats() gives the same ScoreStats for plotting.
+
+acc = ScoreAccumulator(maxScore=20, letters=letters, bins=np.arange(0, 22))
+acc.add(17)
+gen_IntegerHisto(acc, 20, Qinfo, letters, title, bins, tick_list, SMC_cmap)
+'''
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ScoreStats:
+    """
+    Statistics of one set of scores (all fractions are of the whole class).
+
+    Attributes:
+        scores (np.ndarray): Sorted scores.
+        num_scores (int): Number of scores N.
+        max_score (int): Maximum possible score.
+        bins (np.ndarray): Histogram bin edges.
+        bars (np.ndarray): Fraction of the class in each bin.
+        cumbars (np.ndarray): Cumulative fraction by bin.
+        cumscores (np.ndarray): Cumulative fraction by individual (sorted) score, (1..N)/N.
+        letter_grades (list[str]): Letter grades, lowest first.
+        letter_bins (np.ndarray): Letter-grade bin edges, lowest first, ending at max_score+1.
+        letter_bars (np.ndarray): Fraction of the class in each letter grade.
+        counts (np.ndarray): Number of students with each integer score 0..max_score.
+        mean (float): Mean score.
+        median (float): Median score.
+        mode (list[int]): Most frequent integer score(s), increasing.
+        mode_count (int): Number of students with a modal score.
+        score_max (float): Highest score achieved.
+        score_max_count (int): Number of students with the highest score.
+        mean_bin (int): Histogram bin holding the mean.
+        median_bin (int): Histogram bin holding the median.
+        mode_bins (np.ndarray): Histogram bin holding each mode.
+    """
+    scores: np.ndarray
+    num_scores: int
+    max_score: int
+    bins: np.ndarray
+    bars: np.ndarray
+    cumbars: np.ndarray
+    cumscores: np.ndarray
+    letter_grades: list[str]
+    letter_bins: np.ndarray
+    letter_bars: np.ndarray
+    counts: np.ndarray
+    mean: float
+    median: float
+    mode: list[int]
+    mode_count: int
+    score_max: float
+    score_max_count: int
+    mean_bin: int
+    median_bin: int
+    mode_bins: np.ndarray
+
+    @property
+    def bar_max(self) -> float:
+        """Tallest bar among the score and letter-grade histograms."""
+        return max(np.max(self.letter_bars), np.max(self.bars))
+
+
+def integer_score_counts(scores: np.ndarray, maxScore: int) -> np.ndarray:
+    """
+    Number of scores equal to each integer 0..maxScore (non-integer and out-of-range scores are not counted).
+    """
+    scores = np.asarray(scores)
+    if np.issubdtype(scores.dtype, np.integer):
+        valid = scores[(scores >= 0) & (scores <= maxScore)]
+    else:
+        valid = scores[(scores >= 0) & (scores <= maxScore) & (scores == np.floor(scores))]
+    return np.bincount(valid.astype(np.intp), minlength=maxScore + 1)
+
+
+def find_bins(bins: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Index i of the histogram bin with bins[i] <= value < bins[i+1]. Values outside all bins get
+    the last bin (as the original linear scans in gen_IntegerHisto did).
+    """
+    idx = np.searchsorted(bins, values, side='right') - 1
+    last = len(bins) - 2
+    return np.where((idx < 0) | (idx > last), last, idx)
+
+
+def compute_score_stats(scores: np.ndarray, maxScore: int, letters: dict[str, float], bins) -> ScoreStats:
+    """
+    Compute the histogram, letter-grade and summary statistics used by gen_IntegerHisto.
+
+    Args:
+        scores (array_like): Scores (not modified).
+        maxScore (int): Maximum possible score.
+        letters (dict): Letter grade -> lowest score for that grade, highest grade first.
+        bins (int or sequence): Histogram bins, as for np.histogram.
+
+    Returns:
+        ScoreStats: The statistics.
+    """
+    maxScore = int(maxScore)
+    scores = np.sort(np.asarray(scores))
+    numScore = len(scores)
+    assert numScore > 0, "Need at least one score"
+
+    # Histograms, bar height = fraction of class
+    weights = np.full(numScore, 1/numScore)
+    bars, bin_edges = np.histogram(scores, bins, weights=weights)
+
+    lgrade = list(letters.keys())[::-1]
+    lbins = list(letters.values())[::-1] + [maxScore+1]
+    lbars, lbin_edges = np.histogram(scores, lbins, weights=weights)
+
+    # Cumulative curves
+    cumbars = np.cumsum(bars)
+    cumscores = np.arange(1, 1+numScore)/numScore
+
+    # Mode(s) from per-integer counts
+    counts = integer_score_counts(scores, maxScore)
+    mode_count = int(counts.max())
+    mode = np.flatnonzero(counts == mode_count)
+
+    score_max = scores[-1]
+    score_max_count = numScore - int(np.searchsorted(scores, score_max, side='left'))
+
+    score_mean = float(np.mean(scores))
+    score_median = float(np.median(scores))
+    mean_bin, median_bin = (int(i) for i in find_bins(bin_edges, [score_mean, score_median]))
+
+    return ScoreStats(scores=scores, num_scores=numScore, max_score=maxScore, bins=bin_edges, bars=bars,
+                      cumbars=cumbars, cumscores=cumscores, letter_grades=lgrade, letter_bins=lbin_edges,
+                      letter_bars=lbars, counts=counts, mean=score_mean, median=score_median,
+                      mode=[int(m) for m in mode], mode_count=mode_count, score_max=score_max,
+                      score_max_count=score_max_count, mean_bin=mean_bin, median_bin=median_bin,
+                      mode_bins=find_bins(bin_edges, mode))
+
+
+def _histogram_index(edges: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Bin of each value following np.histogram (last bin closed on the right); -1 outside all bins.
+    """
+    idx = np.searchsorted(edges, values, side='right') - 1
+    idx = np.where(values == edges[-1], len(edges) - 2, idx)
+    return np.where((values < edges[0]) | (values > edges[-1]), -1, idx)
+
+
+class ScoreAccumulator:
+    """
+    Incremental version of compute_score_stats for integer scores 0..maxScore.
+
+    State is O(maxScore): per-score counts, histogram and letter-grade bin counts, the exact integer
+    sum of the scores, the running mean and sum of squared deviations (Welford, for the variance),
+    and the current mode count. add() is O(1); the median,
+    mode ties and stats() read the count arrays in O(maxScore) (stats() also rebuilds the sorted
+    scores for the cumulative curve).
+
+    Args:
+        maxScore (int): Maximum possible score.
+        letters (dict): Letter grade -> lowest score for that grade, highest grade first.
+        bins (sequence): Histogram bin edges (explicit edges, since the data range is not known up front).
+    """
+
+    def __init__(self, maxScore: int, letters: dict[str, float], bins):
+        self.max_score = int(maxScore)
+        self.letters = letters
+        self.bins = np.asarray(bins, dtype=float)
+        assert self.bins.ndim == 1 and len(self.bins) > 1, "ScoreAccumulator needs explicit histogram bin edges"
+        self.letter_grades = list(letters.keys())[::-1]
+        self.letter_bins = np.array(list(letters.values())[::-1] + [self.max_score+1], dtype=float)
+
+        possible = np.arange(self.max_score + 1)
+        self._score_bin = _histogram_index(self.bins, possible)
+        self._score_letter = _histogram_index(self.letter_bins, possible)
+
+        self.counts = np.zeros(self.max_score + 1, dtype=np.int64)
+        self.bin_counts = np.zeros(len(self.bins) - 1, dtype=np.int64)
+        self.letter_counts = np.zeros(len(self.letter_bins) - 1, dtype=np.int64)
+        self.num_scores = 0
+        self._sum = 0  # exact (Python int), so the mean is binned exactly as compute_score_stats bins it
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.mode_count = 0
+
+    def add(self, score: int) -> None:
+        """Add one integer score in 0..maxScore."""
+        s = int(score)
+        assert s == score and 0 <= s <= self.max_score, f"Scores must be integers in 0..{self.max_score}: {score}"
+        self.counts[s] += 1
+        if self._score_bin[s] >= 0:
+            self.bin_counts[self._score_bin[s]] += 1
+        if self._score_letter[s] >= 0:
+            self.letter_counts[self._score_letter[s]] += 1
+        self.mode_count = max(self.mode_count, int(self.counts[s]))
+
+        self.num_scores += 1
+        self._sum += s
+        delta = s - self._mean
+        self._mean += delta/self.num_scores
+        self._m2 += delta*(s - self._mean)
+
+    def add_many(self, scores) -> None:
+        """Add a batch of scores (bincount, and Chan's parallel update for the mean / variance)."""
+        scores = np.asarray(scores)
+        if scores.size == 0:
+            return
+        counts = integer_score_counts(scores, self.max_score)
+        assert counts.sum() == scores.size, f"Scores must be integers in 0..{self.max_score}"
+        self.counts += counts
+        np.add.at(self.bin_counts, self._score_bin[self._score_bin >= 0], counts[self._score_bin >= 0])
+        np.add.at(self.letter_counts, self._score_letter[self._score_letter >= 0], counts[self._score_letter >= 0])
+        self.mode_count = int(self.counts.max())
+
+        n_b, mean_b = scores.size, float(np.mean(scores))
+        m2_b = float(np.sum((scores - mean_b)**2))
+        n = self.num_scores + n_b
+        delta = mean_b - self._mean
+        self._m2 += m2_b + delta**2*self.num_scores*n_b/n
+        self._mean += delta*n_b/n
+        self.num_scores = n
+        self._sum += int(counts @ np.arange(self.max_score + 1))
+
+    @property
+    def mean(self) -> float:
+        """Mean score, from the exact sum (correctly rounded, as np.mean of the scores)."""
+        return self._sum/self.num_scores if self.num_scores else float('nan')
+
+    @property
+    def variance(self) -> float:
+        """Population variance (as np.var)."""
+        return self._m2/self.num_scores if self.num_scores else float('nan')
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @property
+    def median(self) -> float:
+        """Exact median from the counts (mean of the two middle scores for an even count)."""
+        assert self.num_scores > 0, "Need at least one score"
+        cum = np.cumsum(self.counts)
+        lo = int(np.searchsorted(cum, (self.num_scores - 1)//2, side='right'))
+        hi = int(np.searchsorted(cum, self.num_scores//2, side='right'))
+        return 0.5*(lo + hi)
+
+    @property
+    def mode(self) -> list[int]:
+        """Most frequent score(s), increasing."""
+        return [int(m) for m in np.flatnonzero(self.counts == self.mode_count)] if self.num_scores else []
+
+    def stats(self) -> ScoreStats:
+        """The same ScoreStats as compute_score_stats on all scores so far."""
+        N = self.num_scores
+        assert N > 0, "Need at least one score"
+        scores = np.repeat(np.arange(self.max_score + 1, dtype=float), self.counts)
+        bars = self.bin_counts/N
+        mode = self.mode
+        score_max = float(np.flatnonzero(self.counts)[-1])
+        mean_bin, median_bin = (int(i) for i in find_bins(self.bins, [self.mean, self.median]))
+        return ScoreStats(scores=scores, num_scores=N, max_score=self.max_score, bins=self.bins, bars=bars,
+                          cumbars=np.cumsum(bars), cumscores=np.arange(1, 1+N)/N,
+                          letter_grades=self.letter_grades, letter_bins=self.letter_bins,
+                          letter_bars=self.letter_counts/N, counts=self.counts.copy(), mean=self.mean,
+                          median=self.median, mode=mode, mode_count=self.mode_count, score_max=score_max,
+                          score_max_count=int(self.counts[int(score_max)]), mean_bin=mean_bin,
+                          median_bin=median_bin, mode_bins=find_bins(self.bins, mode))
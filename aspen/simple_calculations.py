@@ -39,4 +39,109 @@ def round_uncertainty(pbest : float, dp: float) -> tuple[float, float]:
     # A negative second input for round means rounding to the left of the decimal point.
     round_to = -int(scientific_notation(dp)[1]) if (scientific_notation(dp)[0])//1>2 \
         else 1-int(scientific_notation(dp)[1])
-    return round(pbest, round_to), round(dp, round_to)
\ No newline at end of file
+    # float() so numpy scalars get Python's correctly rounded round(), not numpy's scale-and-rint
+    return round(float(pbest), round_to), round(float(dp), round_to)
+
+# Array (vectorized) versions
+# =-=-=-=-=-=--==-=-==-=-=-=-==-=-===-=-=-
+
+# Powers of ten exactly as the scalar code computes them (10**int): exact ints (then correctly
+# rounded to float) for positive exponents, C pow() for negative ones. Indexed by exponent + 400.
+_POW10_OFFSET: int = 400
+_POW10_TABLE: np.ndarray = np.array([float(10**e) if e >= 0 else 10**e for e in range(-_POW10_OFFSET, 309)])
+
+# Largest n for which 10**n is exactly representable as a float64
+_EXACT_POW10_MAX: int = 22
+
+
+def _pow10(exponent: np.ndarray) -> np.ndarray:
+    """Table lookup of 10**exponent for an integer array (matches the scalar 10**int)."""
+    return _POW10_TABLE[exponent + _POW10_OFFSET]
+
+
+def _round_array(values: np.ndarray, ndigits: np.ndarray) -> np.ndarray:
+    """
+    Element-wise equivalent of Python's round(value, ndigits), with a per-element ndigits.
+
+    Python's round is correctly rounded (round-half-even on the exact decimal value). Scaling by an
+    exact power of ten and calling rint agrees with it except when the scaled value lands within
+    rounding error of a half-integer, or |ndigits| is too large for an exact power of ten. Those
+    (rare) elements fall back to the builtin round.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    ndigits = np.asarray(ndigits, dtype=np.int64)
+    values, ndigits = np.broadcast_arrays(values, ndigits)
+
+    out = np.empty(values.shape, dtype=np.float64)
+    fast = np.abs(ndigits) <= _EXACT_POW10_MAX
+    scale = _pow10(np.where(fast, np.abs(ndigits), 0))  # exact 10**|n|
+    pos = ndigits >= 0
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled = np.where(pos, values * scale, values / scale)
+        rounded = np.rint(scaled)
+        out[...] = np.where(pos, rounded / scale, rounded * scale)
+
+        # Half-integer ambiguity: the scaled value carries one rounding error of ~eps*|scaled|
+        frac = np.abs(scaled - np.floor(scaled) - 0.5)
+        ambiguous = frac <= 4 * np.finfo(np.float64).eps * np.maximum(np.abs(scaled), 1.0)
+    slow = (~fast | ambiguous) & np.isfinite(values)
+
+    if slow.any():
+        # Flat views, so 0-d inputs work too (np.nonzero rejects 0-d arrays)
+        flat_out, flat_values, flat_ndigits = out.reshape(-1), values.reshape(-1), ndigits.reshape(-1)
+        for i in np.flatnonzero(slow):
+            flat_out[i] = round(float(flat_values[i]), int(flat_ndigits[i]))
+    return out
+
+
+def scientific_notation_array(input_values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized scientific_notation: convert every element of an array to scientific notation.
+
+    Args:
+        input_values (array_like): The numbers to convert.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The coefficients (float64) and exponents (int64), same shape as the input.
+    """
+    values = np.asarray(input_values, dtype=np.float64)
+    # Check for non-finite values (same contract as the scalar version)
+    finite = np.isfinite(values)
+    if not finite.all():
+        bad = values[~finite]
+        raise ValueError(f"Input contains {bad.size} non-finite value(s) (first: {bad[0]}) -- can't convert to scientific notation.")
+
+    # Zeros map to (0.0, 0)
+    nonzero = values != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent = np.floor_divide(np.log10(np.abs(values)), 1)
+    exponent = np.where(nonzero, exponent, 0).astype(np.int64)
+    coefficient = np.where(nonzero, values / _pow10(exponent), 0.0)
+    return coefficient, exponent
+
+
+def round_uncertainty_array(pbest: np.ndarray, dp: np.ndarray, return_round_to: bool = False) \
+        -> tuple[np.ndarray, np.ndarray] | tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized round_uncertainty: rounds each uncertainty to one or two significant figures and
+    rounds the matching best estimate to the same decimal place.
+
+    Args:
+        pbest (array_like): The best estimates.
+        dp (array_like): The uncertainties (broadcast against pbest).
+        return_round_to (bool, opt = False): Also return the decimal place each pair was rounded to
+            (the second argument given to round(); negative means left of the decimal point).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The rounded best estimates and uncertainties
+            (plus the int64 round_to array if return_round_to).
+    """
+    pbest, dp = np.broadcast_arrays(np.asarray(pbest, dtype=np.float64), np.asarray(dp, dtype=np.float64))
+    coefficient, exponent = scientific_notation_array(dp)  # one pass, not two per value
+
+    # Leading digit > 2 -> one significant figure, otherwise two
+    round_to = np.where(np.floor_divide(coefficient, 1) > 2, -exponent, 1 - exponent)
+    if return_round_to:
+        return _round_array(pbest, round_to), _round_array(dp, round_to), round_to
+    return _round_array(pbest, round_to), _round_array(dp, round_to)
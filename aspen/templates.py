@@ -0,0 +1,307 @@
+'''
+Reusable figure templates for gen_IntegerHisto and gen_CorrelationScatter (dashboards, animations).
+
+The figure, axes, bars, annotations and cumulative curves are built once; update() then only moves
+the existing artists (set_height, set_offsets, set_text, ...). With blitting, the static parts
+(axes, spines, ticks, letter-grade dividers) are cached as a background and only the changing
+artists are redrawn, so a new frame takes milliseconds instead of a full figure construction.
+A full redraw only happens when the y range (set from the tallest bar) changes.
+
+e.g.,
+from aspen.templates import IntegerHistoTemplate
+
+tmpl = IntegerHistoTemplate(20, Qinfo, letters, bins, tick_list, SMC_cmap, title='Quiz 1')
+for week_scores in weekly_scores:
+    tmpl.update(week_scores)
+    tmpl.draw()
+tmpl.savefig('quiz1.png')
+'''
+
+import matplotlib.pyplot as plt
+import matplotlib.patheffects as PathEffects
+import numpy as np
+from matplotlib.ticker import AutoLocator
+
+from .plotting import histo_title, map_pointsize
+from .score_stats import ScoreAccumulator, compute_score_stats
+
+STAT_SHIFT: float = -0.08  # vertical offset of the mode / median / mean markers (fraction of the y range)
+
+
+class _FigureTemplate:
+    """
+    Shared bookkeeping: the figure, the artists that change between updates, and the cached
+    background used for blitting.
+    """
+
+    def __init__(self, fig=None, blit: bool = True):
+        self.fig = plt.figure() if fig is None else fig
+        self.blit = blit
+        self._dynamic: list = []
+        self._background = None
+
+    def _track(self, artist):
+        """Register an artist that update() changes; returns it."""
+        artist.set_animated(self.blit)
+        self._dynamic.append(artist)
+        return artist
+
+    def invalidate(self) -> None:
+        """Force a full redraw (and new background) on the next draw()."""
+        self._background = None
+
+    def draw(self) -> None:
+        """Render the current state, blitting only the changed artists when the background is valid."""
+        canvas = self.fig.canvas
+        if not (self.blit and canvas.supports_blit):
+            canvas.draw()
+            return
+        if self._background is None:
+            canvas.draw()  # animated artists are skipped here
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+        else:
+            canvas.restore_region(self._background)
+        for artist in self._dynamic:
+            artist.axes.draw_artist(artist) if artist.axes is not None else self.fig.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def savefig(self, outname: str, **kwargs) -> None:
+        """Save the current state (animated artists are temporarily made regular, as savefig skips them)."""
+        for artist in self._dynamic:
+            artist.set_animated(False)
+        try:
+            self.fig.savefig(outname, **kwargs)
+        finally:
+            for artist in self._dynamic:
+                artist.set_animated(self.blit)
+            self.invalidate()
+        print(f'Saved graph to {outname}')
+
+    def close(self) -> None:
+        plt.close(self.fig)
+
+
+class IntegerHistoTemplate(_FigureTemplate):
+    """
+    gen_IntegerHisto layout whose data can be swapped with update(scores).
+
+    Args:
+        maxScore, Qinfo, letters, bins, tick_list, cbar, title: As in gen_IntegerHisto.
+        fig (Figure, optional): Figure to draw in (default: a new figure).
+        blit (bool, opt = True): Blit the changing artists in draw() when the canvas supports it.
+        ymax (float, optional): Fixed top of the y axis. By default it follows the tallest bar, as in
+            gen_IntegerHisto, and every change of it costs a full redraw.
+    """
+
+    def __init__(self, maxScore, Qinfo, letters, bins, tick_list, cbar, title='', fig=None, blit=True, ymax=None):
+        super().__init__(fig, blit)
+        self.maxScore = int(maxScore)
+        assert self.maxScore==Qinfo["numPoints"] , f"Gradebook max score {self.maxScore} != your provided max score {Qinfo['numPoints']}"
+        assert Qinfo["ypadding_fac"]>=1 , f'The padding factor should be greater or equal to 1: {Qinfo["ypadding_fac"]}'
+        self.Qinfo, self.letters, self.title, self.tick_list = Qinfo, letters, title, tick_list
+        self.ymax = None
+        self.fixed_ymax = ymax
+
+        # Bins and colors do not depend on the scores: take them from a placeholder score
+        stats = compute_score_stats([0], self.maxScore, letters, bins)
+        self.bins, self.lbins = stats.bins, stats.letter_bins
+        self.lgrade = stats.letter_grades
+        lcolorbar = cbar([x/(self.maxScore) for x in self.lbins])
+        scolorbar = cbar([x/(self.bins[-1]) for x in self.bins])
+
+        ax = self.ax = self.fig.add_subplot()
+        self.lbar = ax.bar(self.lbins[:-1], np.zeros(len(self.lgrade)), width=np.diff(self.lbins), align='edge',
+                           color=lcolorbar, alpha=0.5, edgecolor='none', zorder=0)
+        self.bar = ax.bar(self.bins[:-1], np.zeros(len(self.bins)-1), width=np.diff(self.bins), align='edge',
+                          color=scolorbar, alpha=1, edgecolor='black', zorder=1)
+        for patch in (*self.lbar, *self.bar):
+            self._track(patch)
+        ax.set_xlabel(Qinfo["xlabel"])
+        ax.set_ylabel('Fraction of the Class')
+        self.dx = (self.maxScore+2)-(-0.5)
+        ax.set_xlim([-0.5,self.maxScore+2])
+
+        self.lbar_text = [self._track(ax.text(x,0,'',color=lcolorbar[i],fontsize=8))
+                          for i,x in enumerate(self.lbins[:-1])]
+
+        self.letter_text = []
+        if(Qinfo["showLetters"]):
+            for i in range(1,len(self.lgrade)):
+                ax.plot([self.lbins[i],self.lbins[i]],[0,1],'k--',alpha=0.5)
+            for idx,val in enumerate(self.lgrade):
+                xpos = 0.5*(self.lbins[idx]+self.lbins[idx+1])
+                txt = ax.text(xpos,0,val,color='black',fontsize=Qinfo["lettergrade_fs"],va='center',ha='center')
+                txt.set_path_effects([PathEffects.withStroke(linewidth=3, foreground='#bec1c1')])
+                self.letter_text.append(self._track(txt))
+
+        self.n_text = self._track(ax.text(0.02*self.dx,0,'',fontsize=10))
+        self.mode_text: list = []  # pool, grown as needed
+        self.median_text = self._track(ax.text(0,0,r'$Q_2$',fontsize=8,ha='center',visible=False))
+        self.mean_text = self._track(ax.text(0,0,r'$\mu$',fontsize=8,ha='center',visible=False))
+        self.title_text = self._track(ax.set_title('',fontsize=9))
+
+        # Tickmarks
+        xticks = np.array(tick_list[0]) if len(tick_list[0])>0 else np.array(ax.get_xticks())
+        xticks = xticks[(xticks>=0) & (xticks<=self.maxScore)]
+        ax.set_xticks(xticks+Qinfo['xtick_shift'],[int(x) for x in xticks])
+
+        # Cumulative score distribution
+        self.cum_bars = self.cum_scores = ()
+        if(Qinfo["showCumulative_bars"] or Qinfo["showCumulative_scores"]):
+            color = Qinfo["Cumulative_score_color"]
+            ax2 = self.ax2 = ax.twinx()
+            ax2.set_ylim([0,1.1])
+            ax2.set_yticks([0,0.2,0.4,0.6,0.8,1.0])
+            ax2.set_yticklabels([0,0.2,0.4,0.6,0.8,1.0],color=color)
+            ax2.spines['right'].set_color(color)
+            ax2.tick_params(axis='y',color=color)
+            ax2.set_ylabel('Cumulative Class Fraction',color=color)
+            self.centers = self.bins[:-1] + 0.5*np.diff(self.bins)
+            if(Qinfo["showCumulative_bars"]):
+                self.cum_bars = self._cumulative_artists(ax2, color)
+            if(Qinfo["showCumulative_scores"]):
+                self.cum_scores = self._cumulative_artists(ax2, color)
+
+    def _cumulative_artists(self, ax2, color):
+        """Line plus white-backed markers, as drawn by gen_IntegerHisto."""
+        ps = self.Qinfo["cumulative_ps"]
+        empty = np.empty((0,2))
+        line, = ax2.plot([],[],'-',linewidth=2,color=color,alpha=0.5,zorder=0)
+        under = ax2.scatter(empty[:,0],empty[:,1],s=ps,facecolor='white',edgecolor='none',clip_on=False,zorder=1)
+        over = ax2.scatter(empty[:,0],empty[:,1],s=ps,facecolor=color,alpha=0.5,clip_on=False,zorder=2)
+        return tuple(self._track(a) for a in (line, under, over))
+
+    def _set_ylim(self, ymax: float) -> None:
+        """New y range: rescale, re-pick the y ticks and drop the blitting background."""
+        ax = self.ax
+        ax.set_ylim([0,ymax])
+        if(len(self.tick_list[1])>0):
+            yticks = np.array(self.tick_list[1])
+        else:
+            ax.yaxis.set_major_locator(AutoLocator())
+            yticks = np.array(ax.get_yticks())
+        yticks = yticks[(yticks>=0) & (yticks<=1) & (yticks<=ymax)]
+        ax.set_yticks(yticks)
+        self.ymax = ymax
+        self.invalidate()
+
+    def _place_marker(self, txt, idx: int, bars, dy: float, extra: float = 0.0):
+        """Put a stat marker above bin idx (never below the bar); returns the bin center."""
+        score_mid = 0.5*(self.bins[idx] + self.bins[idx+1])
+        yshift = STAT_SHIFT*dy
+        if bars[idx]+yshift < 0:
+            yshift = 0.03*dy  # don't go below bar
+        txt.set_position((score_mid,bars[idx] + yshift + extra))
+        txt.set_visible(True)
+        return score_mid
+
+    def update(self, scores, title: str | None = None):
+        """
+        Show new scores, or a ScoreAccumulator (and optionally a new title). Returns the ScoreStats used.
+        """
+        Qinfo = self.Qinfo
+        if title is not None:
+            self.title = title
+        if isinstance(scores, ScoreAccumulator):
+            stats = scores.stats()
+        else:
+            stats = compute_score_stats(scores, self.maxScore, self.letters, self.bins)
+        bars, lbars = stats.bars, stats.letter_bars
+
+        ymax = Qinfo["ypadding_fac"]*stats.bar_max
+        if(len(self.tick_list[1])>0 and self.tick_list[1][-1]>ymax):
+            ymax = self.tick_list[1][-1]
+        if self.fixed_ymax is not None:
+            ymax = self.fixed_ymax
+        if ymax != self.ymax:
+            self._set_ylim(ymax)
+        dy = ymax
+
+        for patch,h in zip(self.lbar,lbars):
+            patch.set_height(h)
+        for patch,h in zip(self.bar,bars):
+            patch.set_height(h)
+        for txt,x,y in zip(self.lbar_text,self.lbins[:-1],lbars):
+            txt.set_position((x,y+0.015*dy))
+            txt.set_text(f' {y:.2f}')
+        for txt in self.letter_text:
+            txt.set_y(0.5*(stats.bar_max+ymax))
+        self.n_text.set_position((0.02*self.dx,0.925*ymax))
+        self.n_text.set_text(f'$N=${stats.num_scores}')
+
+        # Stats markers
+        for txt in self.mode_text:
+            txt.set_visible(False)
+        if(Qinfo["showMode"]):
+            while len(self.mode_text) < len(stats.mode_bins):
+                self.mode_text.append(self._track(self.ax.text(0,0,r'$\^M$',fontsize=8,ha='center')))
+            for txt,mode_idx in zip(self.mode_text,stats.mode_bins):
+                self._place_marker(txt, mode_idx, bars, dy)
+        score_mid_med = None
+        if(Qinfo["showMedian"]):
+            score_mid_med = self._place_marker(self.median_text, stats.median_bin, bars, dy)
+        if(Qinfo["showMean"]):
+            mean_mid = 0.5*(self.bins[stats.mean_bin] + self.bins[stats.mean_bin+1])
+            extra = 0.05*dy if mean_mid == score_mid_med else 0.0
+            self._place_marker(self.mean_text, stats.mean_bin, bars, dy, extra)
+
+        self.title_text.set_text(histo_title(self.title,stats,Qinfo))
+
+        # Cumulative curves
+        if self.cum_bars:
+            line, under, over = self.cum_bars
+            line.set_data(self.centers,stats.cumbars)
+            under.set_offsets(np.column_stack([self.centers,stats.cumbars]))
+            over.set_offsets(np.column_stack([self.centers,stats.cumbars]))
+        if self.cum_scores:
+            line, under, over = self.cum_scores
+            score_cum = stats.scores + Qinfo['xtick_shift']
+            line.set_data(np.r_[score_cum[0],score_cum],np.r_[0,stats.cumscores])
+            under.set_offsets(np.column_stack([score_cum,stats.cumscores]))
+            over.set_offsets(np.column_stack([score_cum,stats.cumscores]))
+        return stats
+
+
+class CorrelationScatterTemplate(_FigureTemplate):
+    """
+    gen_CorrelationScatter layout whose data can be swapped with update(data).
+
+    Args:
+        maxScores, Qinfo, labels, title, tick_lists, cbar: As in gen_CorrelationScatter.
+        num_data (int, opt = 2): Arrays per update: 2 (x, y), 3 (+ color) or 4 (+ point size).
+        fig (Figure, optional): Figure to draw in (default: a new figure).
+        blit (bool, opt = True): Blit the scatter in draw() when the canvas supports it.
+    """
+
+    def __init__(self, maxScores, Qinfo, labels, title, tick_lists, cbar=None, num_data=2, fig=None, blit=True):
+        super().__init__(fig, blit)
+        assert num_data>=2 , "Need at least two data arrays to plot a correlation scatter plot"
+        assert num_data==len(labels), "Number of data arrays must match number of labels"
+        self.Qinfo, self.num_data = Qinfo, num_data
+
+        ax = self.ax = self.fig.add_subplot()
+        ax.set_xlabel(labels[0])
+        ax.set_ylabel(labels[1])
+        ax.set_title(title,fontsize=Qinfo["title_fs"])
+        ax.set_xlim([0,maxScores[0]])
+        ax.set_ylim([0,maxScores[1]])
+        ax.set_xticks(tick_lists[0],[int(x) for x in tick_lists[0]])
+        ax.set_yticks(tick_lists[1],[int(x) for x in tick_lists[1]])
+
+        color_kw = dict(c=[], cmap=cbar, vmin=0, vmax=maxScores[2]) if num_data>2 else dict(c='black')
+        self.scatter = self._track(ax.scatter([], [], s=Qinfo["scatter_ps"], alpha=Qinfo["scatter_alpha"],
+                                              edgecolor='black', linewidth=0.5, **color_kw))
+        if(num_data>2):
+            self.colorbar = self.fig.colorbar(self.scatter, ax=ax, orientation='vertical')
+            self.colorbar.set_label(labels[2],fontsize=Qinfo["cbar_fs"])
+
+    def update(self, data) -> None:
+        """Show new data: a sequence of num_data equal-length arrays (x, y[, color[, size]])."""
+        assert len(data)==self.num_data, f"Expected {self.num_data} data arrays, got {len(data)}"
+        assert all(len(data[0])==len(d) for d in data), "All data arrays must have the same length"
+        self.scatter.set_offsets(np.column_stack([data[0],data[1]]))
+        if(self.num_data>2):
+            self.scatter.set_array(np.asarray(data[2]))
+        if(self.num_data>3):
+            self.scatter.set_sizes(map_pointsize(data[3]))
@@ -0,0 +1,195 @@
+'''
+Plot themes: common_rcParams + a color cycle + a default colormap, applied to individual figures
+instead of by changing matplotlib's global rcParams (make_better_plots, use_smc_colors_default, ...).
+
+matplotlib reads rcParams both when artists are created and when a figure is drawn (relative font
+sizes such as the default tick label size, and the number of ticks, are resolved at draw time), so
+a figure has to be built and saved under the same settings. Theme.context() applies a theme in a
+scoped rc_context; the contexts of all threads are serialized by one lock (rcParams is a single
+global), so threads rendering figures with different themes never see each other's settings.
+Figures made by Theme.figure() (or registered with Theme.apply) remember their theme, and
+saving.save_figure / FigureWriter draw them under it, also from the background writer threads.
+A thread that waits for those writers inside a context (FigureWriter.submit / flush / close) gives
+the lock up while it waits (released()), so the writers can draw and nothing deadlocks.
+
+e.g.,
+from aspen.themes import SMC_THEME, UCB_THEME
+
+def render(theme, scores, outname):   # safe to run in several threads at once
+    with theme.context():
+        fig = theme.figure()
+        ax = fig.add_subplot()
+        ax.hist(scores)
+    theme.savefig(fig, outname)
+
+or, with the pyplot-based plotting functions (single thread):
+
+with SMC_THEME.context():
+    SMC_THEME.apply(plt.figure())
+    gen_IntegerHisto(..., outname='q1.png')
+'''
+
+import contextlib
+import threading
+import weakref
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+import matplotlib
+from cycler import Cycler, cycler
+from matplotlib.colors import Colormap
+from matplotlib.figure import Figure
+
+from . import colors
+
+common_rcParams = {
+    'figure.figsize':(7.5,5)   , # (width,height, , convention: wide = 1.5*tall, size of canvas
+    'figure.dpi':150   ,    # scales elements on canvas. Default 100
+    'axes.labelsize': 12 ,
+    'axes.titlesize': 13 ,
+    'axes.linewidth': 1.2 ,
+    'grid.linestyle': '-.' ,
+    'grid.alpha': 0.4 ,
+    'lines.linewidth': 2  ,
+    'legend.framealpha': 1.0  ,
+    'legend.shadow': False  ,
+    'font.size': 14 ,
+    'xtick.labelsize': 12 ,
+    'xtick.major.size': 8 , # default 3
+    'xtick.minor.size': 5 ,
+    'xtick.major.width': 1.2 , # default 0.8
+    'xtick.direction': 'inout' ,
+    #'xtick.top': True ,
+    'ytick.labelsize': 12 ,
+    'ytick.major.size': 8 , # default 3
+    'ytick.minor.size': 5 ,
+    'ytick.major.width': 1.2 , # default 0.8
+    'ytick.direction': 'inout'  ,
+    'ytick.right': True ,
+}
+
+_RC_LOCK = threading.RLock()  # held while any theme's rcParams are in effect (re-entrant for nesting)
+_state = threading.local()  # per-thread depth of open theme contexts
+_FIGURE_THEMES: 'weakref.WeakKeyDictionary[Figure, Theme]' = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True, eq=False)
+class Theme:
+    """
+    rcParams, color cycle and default colormap of a figure.
+
+    Args:
+        name (str): Short name (key in THEMES).
+        palette (tuple[str, ...]): Colors of the line / bar cycle, in order.
+        cmap (str): Attribute of aspen.colors holding the default colormap (e.g. 'SMC_cmap'), built on first use.
+        rc (dict, opt = common_rcParams): Other rcParams.
+    """
+    name: str
+    palette: tuple[str, ...]
+    cmap: str
+    rc: dict = field(default_factory=lambda: dict(common_rcParams))
+
+    @property
+    def cycler(self) -> Cycler:
+        return cycler(color=self.palette)
+
+    @property
+    def colormap(self) -> Colormap:
+        return colors._build_cmap(self.cmap)
+
+    def rc_params(self) -> dict:
+        """Every rcParam the theme sets, including axes.prop_cycle and image.cmap."""
+        return {**self.rc, 'axes.prop_cycle': self.cycler, 'image.cmap': self.colormap.name}
+
+    @contextlib.contextmanager
+    def context(self) -> Iterator['Theme']:
+        """
+        Apply the theme inside the with-block; other threads' theme contexts wait until it ends.
+        rcParams is one global, so the process-wide _RC_LOCK serializes all themed building and drawing:
+        threads get correct output but no parallel speed-up for that part (see released() for waits).
+        """
+        rc = self.rc_params()  # builds the colormap before taking the lock
+        with _RC_LOCK, matplotlib.rc_context(rc):
+            _state.depth = getattr(_state, 'depth', 0) + 1
+            try:
+                yield self
+            finally:
+                _state.depth -= 1
+
+    def figure(self, **kwargs) -> Figure:
+        """
+        A new figure (not managed by pyplot, so usable from any thread) drawn with this theme.
+        kwargs go to matplotlib.figure.Figure. Add its axes and artists inside context().
+        """
+        with self.context():
+            fig = Figure(**kwargs)
+        _FIGURE_THEMES[fig] = self
+        return fig
+
+    def apply(self, fig: Figure) -> Figure:
+        """Use the theme for an existing figure: sets the color cycle of its axes and saves it with the theme."""
+        for ax in fig.axes:
+            ax.set_prop_cycle(self.cycler)
+        _FIGURE_THEMES[fig] = self
+        return fig
+
+    def savefig(self, fig: Figure, outname, **kwargs) -> None:
+        """fig.savefig with the theme in effect."""
+        with self.context():
+            fig.savefig(outname, **kwargs)
+
+
+ORUST_THEME = Theme('orust', tuple(colors.ORUST_COLORS.values()), 'ORUST_cmap')
+SMC_THEME = Theme('smc', tuple(colors.SMC_COLORS.values()), 'SMC_cmap')
+NU_THEME = Theme('nu', tuple(colors.NORTHWESTERN_COLORS.values()), 'NU_cmap')
+UCB_THEME = Theme('ucb', tuple(colors.UCB_COLORS.values()), 'UCB_cmap')
+
+THEMES: dict[str, Theme] = {t.name: t for t in (ORUST_THEME, SMC_THEME, NU_THEME, UCB_THEME)}
+
+
+def get_theme(theme) -> Theme | None:
+    """A Theme, or the THEMES entry for a name (None stays None)."""
+    if theme is None or isinstance(theme, Theme):
+        return theme
+    assert theme in THEMES, f"Unknown theme {theme}, options: {list(THEMES)}"
+    return THEMES[theme]
+
+
+def in_context() -> bool:
+    """Whether this thread is inside a theme context (and so holds the lock other themed renders wait for)."""
+    return getattr(_state, 'depth', 0) > 0
+
+
+@contextlib.contextmanager
+def released() -> Iterator[None]:
+    """
+    Give up this thread's theme contexts for the with-block (e.g. while waiting for writer threads that
+    need the lock) and reapply its rcParams afterwards. No-op outside a theme context.
+    """
+    depth = getattr(_state, 'depth', 0)
+    if depth == 0:
+        yield
+        return
+    rc = dict(matplotlib.rcParams.copy())
+    del rc['backend']
+    _state.depth = 0
+    for _ in range(depth):
+        _RC_LOCK.release()
+    try:
+        yield
+    finally:
+        for _ in range(depth):
+            _RC_LOCK.acquire()
+        _state.depth = depth
+        dict.update(matplotlib.rcParams, rc)  # other threads' contexts ran in between (as rc_context restores)
+
+
+def theme_of(fig) -> Theme | None:
+    """The theme fig was made with (Theme.figure / Theme.apply), if any."""
+    return _FIGURE_THEMES.get(fig)
+
+
+def figure_context(fig) -> contextlib.AbstractContextManager:
+    """The context to draw fig in: its theme's, or a no-op for figures without one."""
+    theme = theme_of(fig)
+    return theme.context() if theme is not None else contextlib.nullcontext()
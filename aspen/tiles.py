@@ -0,0 +1,206 @@
+'''
+Tiled, multithreaded colorization of on-disk (memory-mapped) datasets into PNG tiles or a tiled pyramid.
+
+Each tile is read from the memory map, colorized with a shared uint8 lookup table (see colorize.py)
+and encoded to PNG in a thread pool. NumPy's gathers and the PNG encoder release the GIL, so
+throughput scales with cores. At most 2 * workers tiles are in flight, so peak memory is a few tiles
+no matter how large the dataset is.
+
+Pyramid levels are made by 2x2 averaging; each coarser level is written to a float32 memmap next to
+the tiles (levels/level_<k>.npy), streamed in strips, so it never has to fit in RAM either.
+
+e.g.,
+import aspen.tiles as tl
+
+data = tl.open_dataset('density.npy')                 # or raw: open_dataset('cube.raw', shape=(N, N), dtype='f4')
+vmin, vmax = tl.streaming_limits(data, norm='log')
+tl.write_tile_pyramid(data, 'teal2_cmap', 'tiles/', norm='log', vmin=vmin, vmax=vmax)
+'''
+
+import os
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import matplotlib
+from matplotlib.colors import Colormap
+from PIL import Image
+
+from .colorize import ColorLUT, colorize, data_limits, make_lut
+
+DEFAULT_TILE_SIZE: int = 512
+DEFAULT_STRIP_ROWS: int = 1024  # rows per strip for the streaming passes
+
+
+def open_dataset(filename: str, shape: tuple[int, ...] | None = None, dtype: str | np.dtype | None = None,
+                 offset: int = 0) -> np.ndarray:
+    """
+    Memory-map a 2D dataset from disk without reading it.
+
+    Args:
+        filename (str): A .npy file, or a raw binary file (then shape and dtype are required).
+        shape (tuple of int, optional): Shape of a raw file.
+        dtype (str or np.dtype, optional): dtype of a raw file, e.g. 'f4' or '<f8'.
+        offset (int, opt = 0): Header bytes to skip in a raw file.
+
+    Returns:
+        np.ndarray: Read-only np.memmap.
+    """
+    if filename.endswith('.npy'):
+        return np.load(filename, mmap_mode='r')
+    assert shape is not None and dtype is not None, "Raw files need shape and dtype"
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+
+
+def _resolve_lut(cmap: str | Colormap | ColorLUT) -> ColorLUT:
+    """Accept an ASPEN/matplotlib colormap name, a Colormap, or a ready ColorLUT."""
+    if isinstance(cmap, ColorLUT):
+        return cmap
+    if isinstance(cmap, str):
+        from . import colors
+        if cmap in colors._LAZY_CMAPS:  # attribute name, e.g. 'teal2_cmap'
+            cmap = getattr(colors, cmap)
+        else:  # registered name, e.g. 'smc_cmap' or 'viridis'
+            colors.register_aspen_colormaps()
+            cmap = matplotlib.colormaps[cmap]
+    return make_lut(cmap)
+
+
+def streaming_limits(data: np.ndarray, norm: str = "linear", strip_rows: int = DEFAULT_STRIP_ROWS) -> tuple[float, float]:
+    """
+    vmin / vmax of a (memory-mapped) array, computed strip by strip.
+    """
+    lows, highs = [], []
+    for start in range(0, data.shape[0], strip_rows):
+        try:
+            lo, hi = data_limits(data[start:start + strip_rows], norm)
+        except ValueError:  # strip without valid data
+            continue
+        lows.append(lo)
+        highs.append(hi)
+    if not lows:
+        raise ValueError("No valid data to set the color limits from")
+    return min(lows), max(highs)
+
+
+def _run_bounded(jobs, worker: Callable, workers: int) -> list:
+    """Run worker(*job) in a thread pool with at most 2*workers jobs in flight; re-raise the first error."""
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for job in jobs:
+            if len(pending) >= 2*workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(f.result() for f in done)
+            pending.add(pool.submit(worker, *job))
+        results.extend(f.result() for f in wait(pending)[0])
+    return results
+
+
+def write_tiles(data: np.ndarray, cmap: str | Colormap | ColorLUT, outdir: str, tile_size: int = DEFAULT_TILE_SIZE,
+                norm: str = "linear", vmin: float | None = None, vmax: float | None = None, linear_width: float = 1.0,
+                workers: int | None = None, prefix: str = "") -> list[str]:
+    """
+    Colorize a 2D array tile by tile and write one PNG per tile as outdir/<prefix><row>_<col>.png.
+
+    Args:
+        data (np.ndarray): 2D array, typically from open_dataset.
+        cmap (str, Colormap or ColorLUT): e.g. 'teal2_cmap', 'smc_cmap', SMC_cmap, or make_lut(SMC_cmap).
+        outdir (str): Output directory (created if needed).
+        tile_size (int, opt = DEFAULT_TILE_SIZE): Tile edge in pixels (edge tiles may be smaller).
+        norm, vmin, vmax, linear_width: As in colorize. Limits default to streaming_limits (an extra pass).
+        workers (int, optional): Threads (default os.cpu_count()).
+        prefix (str, opt = ""): File name prefix.
+
+    Returns:
+        list[str]: Paths of the written tiles.
+    """
+    assert data.ndim == 2, f"Need a 2D array, got shape {data.shape}"
+    lut = _resolve_lut(cmap)
+    if vmin is None or vmax is None:
+        dmin, dmax = streaming_limits(data, norm)
+        vmin = dmin if vmin is None else vmin
+        vmax = dmax if vmax is None else vmax
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    os.makedirs(outdir, exist_ok=True)
+
+    def render(row: int, col: int) -> str:
+        tile = np.asarray(data[row*tile_size:(row + 1)*tile_size, col*tile_size:(col + 1)*tile_size])
+        rgba = colorize(tile, lut, norm=norm, vmin=vmin, vmax=vmax, linear_width=linear_width)
+        path = os.path.join(outdir, f'{prefix}{row}_{col}.png')
+        Image.fromarray(rgba).save(path)  # (h, w, 4) uint8 -> RGBA
+        return path
+
+    num_rows = -(-data.shape[0] // tile_size)
+    num_cols = -(-data.shape[1] // tile_size)
+    jobs = ((r, c) for r in range(num_rows) for c in range(num_cols))
+    return _run_bounded(jobs, render, workers)
+
+
+def downsample2(data: np.ndarray, filename: str, strip_rows: int = DEFAULT_STRIP_ROWS) -> np.ndarray:
+    """
+    2x2 mean of a 2D array, streamed strip by strip into a float32 .npy memmap. Odd edges repeat the last row/column.
+
+    Returns:
+        np.ndarray: The downsampled array (read-only memmap of filename).
+    """
+    H, W = data.shape
+    h, w = -(-H // 2), -(-W // 2)
+    out = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float32, shape=(h, w))
+    strip_rows += strip_rows % 2
+    for start in range(0, H, strip_rows):
+        block = np.asarray(data[start:start + strip_rows], dtype=np.float32)
+        if block.shape[0] % 2:
+            block = np.concatenate([block, block[-1:]], axis=0)
+        if W % 2:
+            block = np.concatenate([block, block[:, -1:]], axis=1)
+        out[start//2:start//2 + block.shape[0]//2] = block.reshape(block.shape[0]//2, 2, w, 2).mean(axis=(1, 3))
+    out.flush()
+    del out
+    return np.load(filename, mmap_mode='r')
+
+
+def write_tile_pyramid(data: np.ndarray, cmap: str | Colormap | ColorLUT, outdir: str,
+                       tile_size: int = DEFAULT_TILE_SIZE, norm: str = "linear", vmin: float | None = None,
+                       vmax: float | None = None, linear_width: float = 1.0, workers: int | None = None,
+                       keep_levels: bool = False) -> dict[int, list[str]]:
+    """
+    Write a tiled image pyramid: outdir/<level>/<row>_<col>.png, level 0 at full resolution and each
+    further level downsampled 2x2 until the image fits in one tile. Color limits are shared by all levels.
+
+    Args:
+        data, cmap, tile_size, norm, vmin, vmax, linear_width, workers: As in write_tiles.
+        outdir (str): Output directory.
+        keep_levels (bool, opt = False): Keep the intermediate float32 level memmaps (outdir/levels/).
+
+    Returns:
+        dict[int, list[str]]: Tile paths per level.
+    """
+    lut = _resolve_lut(cmap)
+    if vmin is None or vmax is None:
+        dmin, dmax = streaming_limits(data, norm)
+        vmin = dmin if vmin is None else vmin
+        vmax = dmax if vmax is None else vmax
+
+    level_dir = os.path.join(outdir, 'levels')
+    tiles: dict[int, list[str]] = {}
+    level_files: list[str] = []
+    level, current = 0, data
+    while True:
+        tiles[level] = write_tiles(current, lut, os.path.join(outdir, str(level)), tile_size, norm, vmin, vmax,
+                                   linear_width, workers)
+        if max(current.shape) <= tile_size:
+            break
+        os.makedirs(level_dir, exist_ok=True)
+        level += 1
+        level_files.append(os.path.join(level_dir, f'level_{level}.npy'))
+        current = downsample2(current, level_files[-1])
+
+    if not keep_levels:
+        del current
+        for f in level_files:
+            os.remove(f)
+        if level_files:
+            os.rmdir(level_dir)
+    print(f'Wrote {sum(len(t) for t in tiles.values())} tiles in {len(tiles)} levels to {outdir}')
+    return tiles
@@ -0,0 +1,193 @@
+'''
+Streaming "value ± error" tables (LaTeX/siunitx and Markdown) built on round_uncertainty.
+
+Rows are read in chunks (from a CSV file or from arrays), rounded a chunk at a time with
+round_uncertainty_array (same rules as round_uncertainty), formatted, and written out
+immediately. Nothing holds more than one chunk, so memory stays flat for any number of rows.
+
+e.g.,
+import aspen.uncertainty_tables as ut
+
+ut.write_uncertainty_table(ut.iter_csv_pairs('results.csv', skip_header=1), 'results.tex', style='siunitx')
+'''
+
+import csv
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from .simple_calculations import round_uncertainty_array
+
+DEFAULT_CHUNK_SIZE: int = 65536
+
+# Rows whose larger magnitude (value or error) is at least 10**(EXPONENT_LIMIT + 1) or below 10**-EXPONENT_LIMIT
+# are printed with a common power of ten, e.g. (1.23 ± 0.05)e-7 instead of 0.000000123 ± 0.000000005.
+EXPONENT_LIMIT: int = 4
+
+# style -> (header lines, row template, footer lines). Row templates receive value, error, label.
+TABLE_STYLES: dict[str, tuple[tuple[str, ...], str, tuple[str, ...]]] = {
+    "siunitx": (
+        (r"\begin{tabular}{l c}", r"\hline"),
+        r"{label} & \num{{{value} \pm {error}}} \\",
+        (r"\hline", r"\end{tabular}"),
+    ),
+    "latex": (
+        (r"\begin{tabular}{l c}", r"\hline"),
+        r"{label} & ${value} \pm {error}$ \\",
+        (r"\hline", r"\end{tabular}"),
+    ),
+    "markdown": (
+        ("| Row | Value |", "|---|---|"),
+        "| {label} | {value} ± {error} |",
+        (),
+    ),
+}
+
+# style -> row template for the exponent form. Templates receive value, error, exponent, label.
+EXPONENT_ROW_TEMPLATES: dict[str, str] = {
+    "siunitx": r"{label} & \num{{{value} \pm {error} e{exponent}}} \\",
+    "latex": r"{label} & $({value} \pm {error}) \times 10^{{{exponent}}}$ \\",
+    "markdown": "| {label} | ({value} ± {error})e{exponent} |",
+}
+
+
+# Readers (each yields (values, errors) float64 chunks)
+# =-=-=-=-=-=--==-=-==-=-=-=-==-=-===-=-=-
+
+def iter_array_pairs(values: np.ndarray, errors: np.ndarray,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (values, errors) chunks from two 1D arrays (np.memmap works too; slices are views).
+
+    Args:
+        values (array_like): Best estimates.
+        errors (array_like): Uncertainties, same length as values.
+        chunk_size (int, opt = 65536): Rows per chunk.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: float64 chunks of values and errors.
+    """
+    assert len(values) == len(errors), f"values ({len(values)}) and errors ({len(errors)}) differ in length"
+    assert chunk_size > 0, f"chunk_size must be positive: {chunk_size}"
+    for start in range(0, len(values), chunk_size):
+        stop = start + chunk_size
+        yield (np.asarray(values[start:stop], dtype=np.float64),
+               np.asarray(errors[start:stop], dtype=np.float64))
+
+
+def iter_csv_pairs(filename: str, value_col: int = 0, error_col: int = 1, skip_header: int = 0,
+                   delimiter: str = ',', chunk_size: int = DEFAULT_CHUNK_SIZE) \
+        -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (values, errors) chunks read lazily from a CSV file. Blank lines are skipped.
+
+    Args:
+        filename (str): Path to the CSV file.
+        value_col (int, opt = 0): Column index of the best estimates.
+        error_col (int, opt = 1): Column index of the uncertainties.
+        skip_header (int, opt = 0): Number of leading lines to skip.
+        delimiter (str, opt = ','): Field delimiter.
+        chunk_size (int, opt = 65536): Rows per chunk.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: float64 chunks of values and errors.
+    """
+    assert chunk_size > 0, f"chunk_size must be positive: {chunk_size}"
+    values = np.empty(chunk_size, dtype=np.float64)
+    errors = np.empty(chunk_size, dtype=np.float64)
+    n = 0
+    with open(filename, newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        for line_num, row in enumerate(reader, start=1):
+            if line_num <= skip_header or not row:
+                continue
+            values[n] = float(row[value_col])
+            errors[n] = float(row[error_col])
+            n += 1
+            if n == chunk_size:
+                yield values.copy(), errors.copy()
+                n = 0
+    if n > 0:
+        yield values[:n].copy(), errors[:n].copy()
+
+
+# Formatting
+# =-=-=-=-=-=--==-=-==-=-=-=-==-=-===-=-=-
+
+def _format_number(x: float, round_to: int) -> str:
+    """Print a rounded value with exactly round_to decimals (none if rounding left of the point)."""
+    return f'{x:.{max(int(round_to), 0)}f}'
+
+
+def _common_exponent(value: float, error: float) -> int | None:
+    """Power of ten to factor out of a rounded (value, error) pair, or None to print it in fixed point."""
+    magnitude = max(abs(value), abs(error))
+    if not np.isfinite(magnitude) or magnitude == 0:
+        return None
+    exponent = int(np.floor(np.log10(magnitude)))
+    return exponent if abs(exponent) > EXPONENT_LIMIT else None
+
+
+def _scale(x: float, exponent: int) -> float:
+    """x / 10**exponent, dividing or multiplying by an exact power of ten."""
+    return x / 10.0**exponent if exponent >= 0 else x * 10.0**-exponent
+
+
+def format_uncertainty_rows(chunks: Iterable[tuple[np.ndarray, np.ndarray]], style: str = "siunitx",
+                            start_index: int = 0) -> Iterator[str]:
+    """
+    Round (value, error) chunks with round_uncertainty rules and yield one formatted table row each.
+    Very large or small pairs (see EXPONENT_LIMIT) share a power of ten, e.g. (1.23 ± 0.05)e-7.
+
+    Args:
+        chunks (iterable): (values, errors) chunks, e.g. from iter_csv_pairs or iter_array_pairs.
+        style (str, opt = "siunitx"): One of TABLE_STYLES.
+        start_index (int, opt = 0): Label of the first row (rows are labeled by running index).
+
+    Yields:
+        str: A formatted row, without trailing newline.
+    """
+    assert style in TABLE_STYLES, f"Unknown table style {style}, options: {list(TABLE_STYLES)}"
+    row_template = TABLE_STYLES[style][1]
+    exponent_template = EXPONENT_ROW_TEMPLATES[style]
+    label = start_index
+    for values, errors in chunks:
+        rvalues, rerrors, round_to = round_uncertainty_array(values, errors, return_round_to=True)
+        for v, e, r in zip(rvalues.tolist(), rerrors.tolist(), round_to.tolist()):
+            exponent = _common_exponent(v, e)
+            if exponent is None:
+                yield row_template.format(label=label, value=_format_number(v, r), error=_format_number(e, r))
+            else:  # the mantissas keep the same last digit: r decimals become r + exponent
+                yield exponent_template.format(label=label, value=_format_number(_scale(v, exponent), r + exponent),
+                                               error=_format_number(_scale(e, exponent), r + exponent),
+                                               exponent=exponent)
+            label += 1
+
+
+def write_uncertainty_table(chunks: Iterable[tuple[np.ndarray, np.ndarray]], outname: str,
+                            style: str = "siunitx", include_header: bool = True) -> int:
+    """
+    Stream a formatted "value ± error" table to a file.
+
+    Args:
+        chunks (iterable): (values, errors) chunks, e.g. from iter_csv_pairs or iter_array_pairs.
+        outname (str): Output file name.
+        style (str, opt = "siunitx"): One of TABLE_STYLES.
+        include_header (bool, opt = True): Write the style's header and footer lines.
+
+    Returns:
+        int: Number of rows written.
+    """
+    assert style in TABLE_STYLES, f"Unknown table style {style}, options: {list(TABLE_STYLES)}"
+    header, _, footer = TABLE_STYLES[style]
+    num_rows = 0
+    with open(outname, 'w') as f:
+        if include_header:
+            f.writelines(line + '\n' for line in header)
+        for row in format_uncertainty_rows(chunks, style=style):
+            f.write(row + '\n')
+            num_rows += 1
+        if include_header:
+            f.writelines(line + '\n' for line in footer)
+    print(f'Wrote {num_rows} rows to {outname}')
+    return num_rows
@@ -0,0 +1,474 @@
+'''
+Conversion engine built on top of ConversionsAndDerivedUnits.
+
+The pairwise factors (e.g. MILE_TO_METER, METER_TO_ANGSTROM) become edges of a graph of units.
+Any two units of the same dimension are connected by a path through that graph, and compound
+units (e.g. 'erg/s/cm^2', 'km/s', 'Msun/pc^3') are handled atom by atom. The composite factor for
+each (from, to) pair is resolved once, kept in an LRU cache, and applied to an array in one multiply.
+
+e.g.,
+import aspen.unit_conversions as uc
+
+uc.conversion_factor('mi', 'Å')               # 1.60934e13
+flux_si = uc.convert(flux_cgs, 'erg/s/cm^2', 'W/m^2')
+
+UnitArray tags an array with its unit and defers conversions: chained conversions only fold
+into one pending factor, applied once when the values are used.
+
+dist = uc.UnitArray(miles, 'mi').to('km').to('cm')   # np.asarray(dist) does the one multiply
+
+Additive conversions (KELVIN_TO_CELSIUS_ADD, ...) are not multiplicative and are not part of the graph.
+'''
+
+import re
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+from .constants_conversions import AstroConstantsAndUsefulNumbers, ConversionsAndDerivedUnits
+
+# Dimension vectors: exponents of (length, mass, time, angle, magnetic field)
+# Magnetic field is its own dimension so Gauss <-> Tesla works without charge units.
+Dimension = tuple[int, int, int, int, int]
+DIMENSIONLESS: Dimension = (0, 0, 0, 0, 0)
+LENGTH: Dimension = (1, 0, 0, 0, 0)
+MASS: Dimension = (0, 1, 0, 0, 0)
+TIME: Dimension = (0, 0, 1, 0, 0)
+ANGLE: Dimension = (0, 0, 0, 1, 0)
+MAGNETIC_FIELD: Dimension = (0, 0, 0, 0, 1)
+VOLUME: Dimension = (3, 0, 0, 0, 0)
+ENERGY: Dimension = (2, 1, -2, 0, 0)
+POWER: Dimension = (2, 1, -3, 0, 0)
+FORCE: Dimension = (1, 1, -2, 0, 0)
+PRESSURE: Dimension = (-1, 1, -2, 0, 0)
+FREQUENCY: Dimension = (0, 0, -1, 0, 0)
+
+# Unit symbol -> dimension. Every graph node must be listed here.
+UNIT_DIMENSIONS: dict[str, Dimension] = {
+    # Length
+    "m": LENGTH, "cm": LENGTH, "km": LENGTH, "Å": LENGTH, "ft": LENGTH, "in": LENGTH, "mi": LENGTH,
+    "AU": LENGTH, "pc": LENGTH, "ly": LENGTH, "Rsun": LENGTH,
+    # Mass
+    "kg": MASS, "g": MASS, "lb": MASS, "stone": MASS, "Msun": MASS,
+    # Time
+    "s": TIME, "min": TIME, "day": TIME, "yr": TIME, "Gyr": TIME,
+    # Angle
+    "rad": ANGLE, "deg": ANGLE, "grad": ANGLE, "arcsec": ANGLE, "arcmin": ANGLE,
+    # Magnetic field
+    "T": MAGNETIC_FIELD, "G": MAGNETIC_FIELD,
+    # Volume
+    "m^3": VOLUME, "cm^3": VOLUME, "L": VOLUME, "gal": VOLUME,
+    # Energy
+    "J": ENERGY, "erg": ENERGY, "eV": ENERGY, "cal": ENERGY, "kcal": ENERGY, "BTU": ENERGY,
+    # Power, force, pressure, frequency
+    "W": POWER, "Lsun": POWER,
+    "N": FORCE, "dyn": FORCE,
+    "Pa": PRESSURE, "atm": PRESSURE,
+    "Hz": FREQUENCY,
+}
+
+# Coherent SI unit each dimension is resolved against
+REFERENCE_UNITS: dict[Dimension, str] = {
+    LENGTH: "m", MASS: "kg", TIME: "s", ANGLE: "rad", MAGNETIC_FIELD: "T", VOLUME: "m^3",
+    ENERGY: "J", POWER: "W", FORCE: "N", PRESSURE: "Pa", FREQUENCY: "Hz",
+}
+
+# Name fragments used in ConversionsAndDerivedUnits field names -> unit symbol
+FIELD_UNITS: dict[str, str] = {
+    "METER": "m", "CM": "cm", "KM": "km", "ANGSTROM": "Å", "FOOT": "ft", "INCH": "in", "MILE": "mi",
+    "KG": "kg", "LBS": "lb", "STONE": "stone",
+    "SECOND": "s", "MINUTE": "min", "DAY": "day", "YEAR": "yr", "GYR": "Gyr",
+    "RADIAN": "rad", "DEGREE": "deg", "GRADIAN": "grad", "ARCSEC": "arcsec", "ARCMIN": "arcmin",
+    "TESLA": "T", "GAUSS": "G",
+    "CUBIC_METER": "m^3", "CUBIC_CM": "cm^3", "LITER": "L", "GALLON": "gal",
+    "JOULE": "J", "ERG": "erg", "EV": "eV", "CALORIE": "cal", "KILOCAL": "kcal", "BTU": "BTU",
+    "PASCAL": "Pa", "ATM": "atm",
+}
+
+# SI -> CGS factors that relate two named units: field name -> (SI unit, CGS unit)
+# (ENERGY_ and PRESSURE_SI_TO_CGS are not used; the graph takes J <-> erg from JOULE_TO_ERG.)
+CGS_FIELD_UNITS: dict[str, tuple[str, str]] = {
+    "LENGTH_SI_TO_CGS": ("m", "cm"),
+    "MASS_SI_TO_CGS": ("kg", "g"),
+    "FORCE_SI_TO_CGS": ("N", "dyn"),
+    "MAGNETIC_FIELD_SI_TO_CGS": ("T", "G"),
+}
+
+# Astronomical units, as AstroConstantsAndUsefulNumbers field -> (unit symbol, SI reference unit)
+ASTRO_FIELD_UNITS: dict[str, tuple[str, str]] = {
+    "AU": ("AU", "m"),
+    "PARSEC": ("pc", "m"),
+    "LIGHT_YEAR": ("ly", "m"),
+    "R_SUN": ("Rsun", "m"),
+    "M_SUN": ("Msun", "kg"),
+    "L_SUN": ("Lsun", "W"),
+}
+
+# Metric prefixes, as ConversionsAndDerivedUnits field -> symbol (for otherwise unknown atoms, and the
+# exact edges between prefixed graph nodes and their base units)
+PREFIX_FIELDS: dict[str, tuple[str, ...]] = {
+    "KILO": ("k",), "MEGA": ("M",), "GIGA": ("G",), "TERA": ("T",), "PETA": ("P",), "EXA": ("E",),
+    "CENTI": ("c",), "MILLI": ("m",), "MICRO": ("μ", "u"), "NANO": ("n",), "PICO": ("p",),
+    "FEMTO": ("f",), "ATTO": ("a",),
+}
+
+# One atom of a compound unit: symbol with optional integer power, e.g. 'cm^2', 's^-1', 'm2'
+_ATOM_RE = re.compile(r'^(?P<sym>[^\^\d\-]+)(?:\^?(?P<pow>-?\d+))?$')
+
+
+class ConversionGraph:
+    """
+    Graph of units whose edges are the multiplicative factors in ConversionsAndDerivedUnits.
+
+    Args:
+        conversions (ConversionsAndDerivedUnits, optional): Source of the pairwise factors.
+        astro (AstroConstantsAndUsefulNumbers, optional): Source of the astronomical units.
+        cache_size (int, opt = 1024): Max number of (from, to) factors memoized.
+    """
+
+    def __init__(self, conversions: ConversionsAndDerivedUnits | None = None,
+                 astro: AstroConstantsAndUsefulNumbers | None = None, cache_size: int = 1024):
+        conversions = ConversionsAndDerivedUnits() if conversions is None else conversions
+        astro = AstroConstantsAndUsefulNumbers() if astro is None else astro
+
+        self.edges: dict[str, dict[str, float]] = {unit: {} for unit in UNIT_DIMENSIONS}
+
+        # Pairwise X_TO_Y factors, only between units of the same dimension
+        # (drops the mass-energy equivalences such as KG_TO_JOULE)
+        for field, value in vars(conversions).items():
+            src, sep, dst = field.partition("_TO_")
+            if not sep or src not in FIELD_UNITS or dst not in FIELD_UNITS:
+                continue
+            self.add_edge(FIELD_UNITS[src], FIELD_UNITS[dst], value)
+
+        for field, (si_unit, cgs_unit) in CGS_FIELD_UNITS.items():
+            self.add_edge(si_unit, cgs_unit, getattr(conversions, field))
+
+        for field, (unit, si_unit) in ASTRO_FIELD_UNITS.items():
+            self.add_edge(unit, si_unit, getattr(astro, field))
+
+        self.prefixes: dict[str, float] = {sym: getattr(conversions, field)
+                                           for field, syms in PREFIX_FIELDS.items() for sym in syms}
+
+        # Exact edges between prefixed nodes and their base units (km -> m, kg -> g, Gyr -> yr, ...), so
+        # metric conversions do not detour through e.g. miles. Powered nodes (cm^3) are not prefix * unit.
+        for unit in UNIT_DIMENSIONS:
+            for sym, value in self.prefixes.items():
+                base = unit[len(sym):]
+                if '^' not in unit and unit.startswith(sym) and base in UNIT_DIMENSIONS:
+                    self.add_edge(unit, base, value)
+
+        self.factor = lru_cache(maxsize=cache_size)(self._factor)
+
+    def add_edge(self, src: str, dst: str, factor: float) -> None:
+        """
+        Add src -> dst (multiply by factor) and, if not already present, the reverse edge.
+        Edges between different dimensions are ignored.
+        """
+        if UNIT_DIMENSIONS[src] != UNIT_DIMENSIONS[dst] or src == dst:
+            return
+        self.edges[src][dst] = float(factor)
+        self.edges[dst].setdefault(src, 1 / float(factor))
+
+    def path(self, src: str, dst: str) -> list[str]:
+        """
+        Shortest chain of units from src to dst (breadth-first search).
+
+        Raises:
+            ValueError: If there is no path.
+        """
+        if src == dst:
+            return [src]
+        previous: dict[str, str] = {src: src}
+        queue = deque([src])
+        while queue:
+            unit = queue.popleft()
+            for nxt in self.edges[unit]:
+                if nxt in previous:
+                    continue
+                previous[nxt] = unit
+                if nxt == dst:
+                    chain = [dst]
+                    while chain[-1] != src:
+                        chain.append(previous[chain[-1]])
+                    return chain[::-1]
+                queue.append(nxt)
+        raise ValueError(f"No conversion path from {src} to {dst}")
+
+    def _atom_to_si(self, symbol: str) -> tuple[float, Dimension]:
+        """Factor from a single (possibly prefixed) unit symbol to its SI reference, and its dimension."""
+        prefix = 1.0
+        if symbol not in UNIT_DIMENSIONS:
+            for sym, value in self.prefixes.items():
+                if symbol.startswith(sym) and symbol[len(sym):] in UNIT_DIMENSIONS:
+                    prefix, symbol = value, symbol[len(sym):]
+                    break
+            else:
+                raise ValueError(f"Unknown unit: {symbol}")
+        dimension = UNIT_DIMENSIONS[symbol]
+        chain = self.path(symbol, REFERENCE_UNITS[dimension])
+        factor = prefix
+        for a, b in zip(chain[:-1], chain[1:]):
+            factor *= self.edges[a][b]
+        return factor, dimension
+
+    def to_si(self, unit: str) -> tuple[float, Dimension]:
+        """
+        Factor from a (compound) unit to coherent SI, and the unit's dimension vector.
+
+        Compound units are atoms joined by '*', '/' or spaces; everything after a '/' is
+        in the denominator of that atom only (so 'erg/s/cm^2' is erg s^-1 cm^-2).
+        Volume nodes 'm^3' and 'cm^3' are parsed as m**3 and cm**3.
+        """
+        unit = unit.strip()
+        if unit in ("", "1"):
+            return 1.0, DIMENSIONLESS
+        factor, dimension = 1.0, np.zeros(len(DIMENSIONLESS), dtype=int)
+        for sign, token in re.findall(r'([*/ ]?)\s*([^*/ ]+)', unit):
+            if token == "1":  # e.g. '1/s'
+                continue
+            match = _ATOM_RE.match(token)
+            if match is None:
+                raise ValueError(f"Could not parse unit {token!r} in {unit!r}")
+            power = int(match["pow"]) if match["pow"] else 1
+            if sign == "/":
+                power = -power
+            atom_factor, atom_dim = self._atom_to_si(match["sym"])
+            factor *= atom_factor**power
+            dimension += power*np.array(atom_dim)
+        return factor, tuple(int(d) for d in dimension)
+
+    def _factor(self, from_unit: str, to_unit: str) -> float:
+        from_factor, from_dim = self.to_si(from_unit)
+        to_factor, to_dim = self.to_si(to_unit)
+        if from_dim != to_dim:
+            raise ValueError(f"Incompatible units: {from_unit} {from_dim} and {to_unit} {to_dim}")
+        return from_factor / to_factor
+
+    def convert(self, values: np.ndarray, from_unit: str, to_unit: str, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Convert values from one unit to another with a single multiply.
+
+        Args:
+            values (array_like): Values in from_unit.
+            from_unit (str): Unit of the input, e.g. 'erg/s/cm^2'.
+            to_unit (str): Unit of the output, e.g. 'W/m^2'.
+            out (np.ndarray, optional): Output array (may be values itself for in-place conversion).
+
+        Returns:
+            np.ndarray: The converted values.
+        """
+        return np.multiply(values, self.factor(from_unit, to_unit), out=out)
+
+
+@lru_cache(maxsize=1)
+def default_graph() -> ConversionGraph:
+    """The ConversionGraph built from the default constants (built once, on first use)."""
+    return ConversionGraph()
+
+
+def conversion_factor(from_unit: str, to_unit: str) -> float:
+    """
+    Multiplicative factor from from_unit to to_unit, e.g. conversion_factor('mi', 'Å').
+    """
+    return default_graph().factor(from_unit, to_unit)
+
+
+def convert(values: np.ndarray, from_unit: str, to_unit: str, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Convert an array between units using the default graph, e.g. convert(x, 'km/s', 'AU/yr').
+    """
+    return default_graph().convert(values, from_unit, to_unit, out=out)
+
+
+# Lazily converted arrays
+# =-=-=-=-=-=--==-=-==-=-=-=-==-=-===-=-=-
+
+# Coherent SI unit of each Dimension entry, used to name the units of products and quotients
+SI_BASE_UNITS: tuple[str, ...] = ("m", "kg", "s", "rad", "T")
+
+
+def si_unit(dimension: Dimension) -> str:
+    """Coherent SI unit string of a dimension vector, e.g. (2, 1, -2, 0, 0) -> 'm^2 kg s^-2'."""
+    atoms = [sym if p == 1 else f'{sym}^{p}' for sym, p in zip(SI_BASE_UNITS, dimension) if p != 0]
+    return ' '.join(atoms) or '1'
+
+
+@lru_cache(maxsize=1024)
+def _unit_to_si(unit: str) -> tuple[float, Dimension]:
+    return default_graph().to_si(unit)
+
+
+class UnitArray:
+    """
+    Array tagged with a unit whose conversions are deferred: the values are data*scale, in unit.
+
+    Converting (to), negating, or multiplying / dividing by plain numbers only updates the scalar
+    scale, so a chain such as UnitArray(x, 'mi').to('km').to('cm')*2 is folded into one factor and
+    costs nothing until the values are needed. They are computed once, with a single multiply, by
+    materialize() / .value, or when the array is handed to NumPy (np.asarray, ufuncs, ...), which
+    then sees plain values in unit.
+
+    Products, quotients and powers of UnitArrays carry the summed dimension exponents and are
+    expressed in coherent SI units (see si_unit). Converting, adding or subtracting between
+    different dimensions raises ValueError.
+
+    Args:
+        data (array_like): Values in unit (not copied).
+        unit (str, opt = '1'): Unit understood by ConversionGraph.to_si, e.g. 'km/s' ('1' for dimensionless).
+        scale (float, opt = 1.0): Pending factor.
+
+    e.g.,
+    d = UnitArray(miles, 'mi').to('cm')                 # no array work yet
+    v = (d / UnitArray(hours*3600, 's')).to('km/s')     # one divide, the factors stay pending
+    np.asarray(v)                                       # one multiply
+    """
+
+    __slots__ = ('data', 'unit', 'scale', 'dimension')
+
+    def __init__(self, data, unit: str = '1', scale: float = 1.0):
+        self.data = np.asarray(data)
+        self.unit = unit
+        self.scale = float(scale)
+        self.dimension: Dimension = _unit_to_si(unit)[1]
+
+    @classmethod
+    def _make(cls, data, unit: str, scale: float, dimension: Dimension) -> 'UnitArray':
+        new = cls.__new__(cls)
+        new.data, new.unit, new.scale, new.dimension = data, unit, float(scale), dimension
+        return new
+
+    def _si(self) -> tuple[float, Dimension]:
+        """Pending factor to coherent SI, and the dimension."""
+        return self.scale*_unit_to_si(self.unit)[0], self.dimension
+
+    # Conversions (scalar only)
+
+    def to(self, unit: str) -> 'UnitArray':
+        """The same values in another unit of the same dimension (ValueError otherwise); no array work."""
+        return self._make(self.data, unit, self.scale*conversion_factor(self.unit, unit), self.dimension)
+
+    def to_si(self) -> 'UnitArray':
+        """The same values in coherent SI units."""
+        return self.to(si_unit(self.dimension))
+
+    # Materialization
+
+    def materialize(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        The values in unit, computed with one multiply (data itself when nothing is pending).
+        out may be data (or another array) for an in-place result.
+        """
+        if self.scale == 1.0 and out is None:
+            return self.data
+        return np.multiply(self.data, self.scale, out=out)
+
+    @property
+    def value(self) -> np.ndarray:
+        return self.materialize()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.materialize()
+        if copy and values is self.data:
+            values = values.copy()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        # Scaling by NumPy scalars / arrays and sums keep the units; anything else sees the plain values
+        if method == '__call__' and not kwargs and len(inputs) == 2:
+            a, b = inputs
+            ops = {np.multiply: ('__mul__', '__rmul__'), np.true_divide: ('__truediv__', '__rtruediv__'),
+                   np.add: ('__add__', '__radd__'), np.subtract: ('__sub__', '__rsub__')}.get(ufunc)
+            if ops is not None:
+                return getattr(a, ops[0])(b) if isinstance(a, UnitArray) else getattr(b, ops[1])(a)
+        inputs = tuple(x.materialize() if isinstance(x, UnitArray) else x for x in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    # Array-like
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.data.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.data.ndim
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index) -> 'UnitArray':
+        return self._make(self.data[index], self.unit, self.scale, self.dimension)
+
+    def __repr__(self) -> str:
+        return f'UnitArray(shape={self.shape}, unit={self.unit!r}, scale={self.scale:g})'
+
+    # Arithmetic
+
+    def __neg__(self) -> 'UnitArray':
+        return self._make(self.data, self.unit, -self.scale, self.dimension)
+
+    def __pos__(self) -> 'UnitArray':
+        return self
+
+    def __mul__(self, other) -> 'UnitArray':
+        if isinstance(other, UnitArray):
+            (fa, da), (fb, db) = self._si(), other._si()
+            dimension = tuple(x + y for x, y in zip(da, db))
+            return self._make(self.data*other.data, si_unit(dimension), fa*fb, dimension)
+        if np.ndim(other) == 0:
+            return self._make(self.data, self.unit, self.scale*other, self.dimension)
+        return self._make(self.data*np.asarray(other), self.unit, self.scale, self.dimension)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other) -> 'UnitArray':
+        if isinstance(other, UnitArray):
+            (fa, da), (fb, db) = self._si(), other._si()
+            dimension = tuple(x - y for x, y in zip(da, db))
+            return self._make(self.data/other.data, si_unit(dimension), fa/fb, dimension)
+        if np.ndim(other) == 0:
+            return self._make(self.data, self.unit, self.scale/other, self.dimension)
+        return self._make(self.data/np.asarray(other), self.unit, self.scale, self.dimension)
+
+    def __rtruediv__(self, other) -> 'UnitArray':
+        factor, dimension = self._si()
+        dimension = tuple(-d for d in dimension)
+        return self._make(np.asarray(other)/self.data, si_unit(dimension), 1/factor, dimension)
+
+    def __pow__(self, power: int) -> 'UnitArray':
+        assert float(power).is_integer(), f"Only integer powers keep integer dimensions, got {power}"
+        factor, dimension = self._si()
+        dimension = tuple(int(power)*d for d in dimension)
+        return self._make(self.data**power, si_unit(dimension), factor**power, dimension)
+
+    def _in_my_unit(self, other) -> 'UnitArray':
+        """other as a UnitArray in self.unit (plain numbers only for dimensionless self)."""
+        if not isinstance(other, UnitArray):
+            if self.dimension != DIMENSIONLESS:
+                raise ValueError(f"Cannot add a plain number to {self.unit} {self.dimension}")
+            other = UnitArray(other)
+        return other.to(self.unit)
+
+    def __add__(self, other) -> 'UnitArray':
+        other = self._in_my_unit(other)
+        if self.scale == 0.0:
+            return self._make(other.materialize(), self.unit, 1.0, self.dimension)
+        # data*scale + other = (data + other/scale)*scale: one temporary, the result keeps scale pending
+        total = np.multiply(other.data, other.scale/self.scale)
+        total = np.add(self.data, total, out=total) if total.shape == np.broadcast(self.data, total).shape \
+            else self.data + total
+        return self._make(total, self.unit, self.scale, self.dimension)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> 'UnitArray':
+        return self + (-self._in_my_unit(other))
+
+    def __rsub__(self, other) -> 'UnitArray':
+        return -self + other
@@ -0,0 +1,137 @@
+'''
+The SI constants of PhysicsConstants and AstroConstantsAndUsefulNumbers rescaled to other unit
+systems. Used by constants_cgs, constants_natural and constants_geometric, which hold the results as
+plain module-level floats.
+
+Every constant is listed with the exponents of (length, mass, time) of its SI unit, so moving it to
+a system whose units of length, mass and time are L, M and T (in SI) is a division by L^a M^b T^c.
+Factors per kelvin and per mole are kept as they are. Electromagnetic constants are first put in
+Gaussian form (charges / sqrt(4 pi EPSILON_0), magnetic fields * sqrt(4 pi / MU_0), so Coulomb's
+law has no constant), which gives them half-integer exponents. EPSILON_0 and MU_0 are not part of
+the rescaled systems; K_COULOMB is 1.
+
+e.g.,
+from aspen.unit_systems import rescaled_constants
+
+consts = rescaled_constants(length=1e3, mass=1.0, time=3600.0)   # km, kg, hr
+'''
+
+import numpy as np
+
+from .constants_conversions import AstroConstantsAndUsefulNumbers, PhysicsConstants
+
+# Exponents of (length, mass, time) of the SI unit of each constant
+PHYSICS_DIMENSIONS: dict[str, tuple[float, float, float]] = {
+    # Masses
+    "AMU": (0, 1, 0), "M_PROTON": (0, 1, 0), "M_NEUTRON": (0, 1, 0), "M_ELECTRON": (0, 1, 0),
+    "M_MUON": (0, 1, 0), "M_ALPHA": (0, 1, 0),
+    # Gravity
+    "G_NEWTON": (3, -1, -2), "G_EINSTEIN": (3, -1, -2),
+    # Electromagnetism (Gaussian form)
+    "C_LIGHT": (1, 0, -1),
+    "E_CHARGE": (1.5, 0.5, -1), "FARADAY_CHARGE": (1.5, 0.5, -1),  # per mol
+    "BOHR_MAGNETON": (2.5, 0.5, -1),
+    "R_ELECTRON": (1, 0, 0),
+    # Thermodynamics
+    "N_AVOGADRO": (0, 0, 0),  # per mol
+    "K_BOLTZMANN": (2, 1, -2),  # per K
+    "R_GAS": (2, 1, -2),  # per mol per K
+    # Quantum mechanics and radiation
+    "H_PLANCK": (2, 1, -1), "H_PLANCK_REDUCED": (2, 1, -1),
+    "SB_CONSTANT": (0, 1, -3), "SIGMA_SB": (0, 1, -3),  # per K^4
+    "A_RADIATION": (-1, 1, -2),  # per K^4
+    "BOHR_RADIUS": (1, 0, 0),
+    "WIEN_DISPLACEMENT": (1, 0, 0),  # times K
+    "ALPHA": (0, 0, 0),
+    "G_FAC_ELECTRON": (0, 0, 0), "G_FAC_PROTON": (0, 0, 0), "G_FAC_NEUTRON": (0, 0, 0), "G_FAC_MUON": (0, 0, 0),
+}
+
+# Same for the SI-valued astronomical constants (those in degrees, days, km/s/Mpc, ... are left out)
+ASTRO_DIMENSIONS: dict[str, tuple[float, float, float]] = {
+    # Lengths
+    "AU": (1, 0, 0), "PARSEC": (1, 0, 0), "LIGHT_YEAR": (1, 0, 0),
+    "R_SUN": (1, 0, 0), "R_EARTH": (1, 0, 0), "R_JUPITER": (1, 0, 0), "R_MOON": (1, 0, 0),
+    "A_EARTH": (1, 0, 0), "A_JUPITER": (1, 0, 0), "A_MOON": (1, 0, 0),
+    "MW_RADIUS": (1, 0, 0), "MW_SCALE_LENGTH": (1, 0, 0), "R_UNIVERSE": (1, 0, 0),
+    # Times
+    "SOLAR_DAY": (0, 0, 1), "SIDEREAL_DAY": (0, 0, 1), "SOLAR_YEAR": (0, 0, 1), "SIDEREAL_YEAR": (0, 0, 1),
+    "AGE_SUN": (0, 0, 1), "HUBBLE_TIME_SI": (0, 0, 1), "AGE_UNIVERSE": (0, 0, 1),
+    "H0_HUBBLE_SI": (0, 0, -1),
+    # Masses
+    "M_SUN": (0, 1, 0), "M_EARTH": (0, 1, 0), "M_JUPITER": (0, 1, 0), "M_MOON": (0, 1, 0),
+    "MW_MASS_HIGH": (0, 1, 0), "MW_MASS_LOW": (0, 1, 0), "MW_DARKMATTER_MASS_HIGH": (0, 1, 0),
+    "MW_DARKMATTER_MASS_LOW": (0, 1, 0), "MW_STELLAR_MASS_HIGH": (0, 1, 0), "MW_STELLAR_MASS_LOW": (0, 1, 0),
+    "MW_BLACKHOLE_MASS": (0, 1, 0),
+    # Luminosities, fluxes, densities, gravitational parameter
+    "L_SUN": (2, 1, -3), "MW_LUMINOSITY": (2, 1, -3),
+    "G_SUN": (0, 1, -3), "MW_BRIGHTNESS": (0, 1, -3),
+    "DEN_SUN": (-3, 1, 0), "DEN_EARTH": (-3, 1, 0), "DEN_JUPITER": (-3, 1, 0), "DEN_MOON": (-3, 1, 0),
+    "MU_SUN": (3, 0, -2),
+    # Magnetic fields (Gaussian form)
+    "B_SUN": (-0.5, 0.5, -1), "B_EARTH": (-0.5, 0.5, -1), "B_JUPITER": (-0.5, 0.5, -1),
+}
+
+# Constants that are fixed numbers in the Gaussian-based systems
+FIXED_VALUES: dict[str, float] = {
+    "K_COULOMB": 1.0,
+}
+
+
+def gaussian_si_values() -> dict[str, float]:
+    """The SI values of every listed constant, with the electromagnetic ones in Gaussian form (SI base units)."""
+    phy, astro = PhysicsConstants(), AstroConstantsAndUsefulNumbers()
+    values = {name: float(getattr(phy, name)) for name in PHYSICS_DIMENSIONS}
+    values.update({name: float(getattr(astro, name)) for name in ASTRO_DIMENSIONS})
+
+    charge = 1/np.sqrt(4*np.pi*phy.EPSILON_0)  # C -> kg^1/2 m^3/2 s^-1
+    field = np.sqrt(4*np.pi/phy.MU_0)  # T -> kg^1/2 m^-1/2 s^-1
+    for name in ("E_CHARGE", "FARADAY_CHARGE"):
+        values[name] *= charge
+    values["BOHR_MAGNETON"] /= field  # J/T -> kg^1/2 m^5/2 s^-1
+    for name in ("B_SUN", "B_EARTH", "B_JUPITER"):
+        values[name] *= field
+    return values
+
+
+def rescaled_constants(length: float, mass: float, time: float) -> dict[str, float]:
+    """
+    Every constant in the (Gaussian-based) system whose units of length, mass and time are the given SI values.
+
+    Args:
+        length (float): Unit of length in meters (e.g. 1e-2 for CGS).
+        mass (float): Unit of mass in kg.
+        time (float): Unit of time in seconds.
+
+    Returns:
+        dict: Constant name -> float.
+    """
+    dimensions = {**PHYSICS_DIMENSIONS, **ASTRO_DIMENSIONS}
+    values = {}
+    for name, value in gaussian_si_values().items():
+        a, b, c = dimensions[name]
+        values[name] = float(value / (length**a * mass**b * time**c))
+    values.update(FIXED_VALUES)
+    return values
+
+
+def cgs_constants() -> dict[str, float]:
+    """Constants in CGS-Gaussian units (cm, g, s; statC, G)."""
+    return rescaled_constants(1e-2, 1e-3, 1.0)
+
+
+def natural_constants(energy: float = PhysicsConstants.E_CHARGE) -> dict[str, float]:
+    """
+    Constants in natural units, hbar = c = 1, as powers of an energy unit (in J, default 1 eV):
+    lengths and times in 1/eV, masses and energies in eV.
+    """
+    hbar, c = PhysicsConstants.H_PLANCK_REDUCED, PhysicsConstants.C_LIGHT
+    return rescaled_constants(hbar*c/energy, energy/c**2, hbar/energy)
+
+
+def geometric_constants(length: float = 1.0) -> dict[str, float]:
+    """
+    Constants in geometric units, G = c = 1, as powers of a length unit (in m, default 1 m):
+    masses, times and energies are all lengths.
+    """
+    G, c = PhysicsConstants.G_NEWTON, PhysicsConstants.C_LIGHT
+    return rescaled_constants(length, length*c**2/G, length/c)
@@ -0,0 +1,76 @@
+'''
+Import-time benchmark for the aspen package.
+
+Each case runs in a fresh interpreter so nothing is cached between runs. The constants-only
+path must not import matplotlib (that is the whole point of the lazy re-exports in __init__.py).
+
+Usage (from the repo root):
+    python benchmarks/bench_import.py [--repeat 5]
+'''
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> statement timed in a fresh interpreter
+IMPORT_CASES: dict[str, str] = {
+    "constants_only": "from aspen import PhysicsConstants, ConversionsAndDerivedUnits",
+    "package_only": "import aspen",
+    "colors": "from aspen import SMC_cmap",
+    "plotting": "import aspen.plotting",
+}
+
+# Snippet run in the child: time the statement, report whether matplotlib got imported
+_CHILD = '''
+import sys, time, json
+t0 = time.perf_counter()
+exec({stmt!r})
+dt = time.perf_counter() - t0
+print(json.dumps({{"seconds": dt, "matplotlib": "matplotlib" in sys.modules}}))
+'''
+
+
+def time_import(stmt: str, repeat: int = 5) -> dict:
+    """
+    Time an import statement in fresh interpreters.
+
+    Args:
+        stmt (str): Statement to execute, e.g. "import aspen".
+        repeat (int, opt = 5): Number of fresh interpreters to run.
+
+    Returns:
+        dict: Best and median wall time (seconds) and whether matplotlib was imported.
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _CHILD.format(stmt=stmt)],
+                             capture_output=True, text=True, check=True, env=env)
+        runs.append(json.loads(out.stdout))
+    times = sorted(r["seconds"] for r in runs)
+    return {"best": times[0], "median": times[len(times)//2], "matplotlib": runs[0]["matplotlib"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per case")
+    args = parser.parse_args()
+
+    results = {name: time_import(stmt, args.repeat) for name, stmt in IMPORT_CASES.items()}
+    for name, res in results.items():
+        print(f'{name:>16s}: best {1e3*res["best"]:8.1f} ms , median {1e3*res["median"]:8.1f} ms , '
+              f'matplotlib imported: {res["matplotlib"]}')
+
+    # The constants-only path has to stay light 
+    if results["constants_only"]["matplotlib"] or results["package_only"]["matplotlib"]:
+        print("FAIL: constants-only import pulled in matplotlib")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+'''
+Benchmarks of ASPEN's numeric and plotting hot paths at several input sizes (offline, Agg backend).
+
+Every case is timed a few times (best and median wall time). A run can be saved as a JSON
+baseline and later runs compared against it; a case whose best time is more than --tolerance
+slower than the baseline is reported as a regression (exit status 1). The best time is compared
+as it is the least sensitive to other load on the machine.
+
+Usage (from the repo root):
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json      # record a baseline
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json  # compare against it
+    python benchmarks/bench_suite.py --quick --filter histo              # smallest sizes, matching cases
+'''
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path[:0] = [REPO_ROOT, BENCH_DIR]
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from bench_import import IMPORT_CASES, time_import
+from synthetic import synthetic_gradebook, synthetic_letters, synthetic_Qinfo, synthetic_scores
+
+DEFAULT_REPEAT: int = 5
+DEFAULT_TOLERANCE: float = 0.25  # fractional slowdown reported as a regression
+MIN_REGRESSION_SECONDS: float = 1e-3  # ignore slowdowns smaller than this (timer noise)
+
+
+# Each setup takes one size and returns the function to time (all data prepared outside the timing)
+
+def _setup_make_color_map(size) -> Callable:
+    from aspen import colors
+    num_points, num_stops = size
+    stops = list(np.array(list(colors.SMC_COLORS.values()) * (num_stops // len(colors.SMC_COLORS) + 1))[:num_stops])
+
+    def run():
+        colors._color_map_rgba.cache_clear()  # time the interpolation, not the memoized lookup
+        colors.make_color_map(stops, num_points)
+    return run
+
+
+def _setup_scientific_notation(size) -> Callable:
+    from aspen.simple_calculations import scientific_notation
+    values = np.random.default_rng(0).lognormal(0, 10, size).tolist()
+    return lambda: [scientific_notation(v) for v in values]
+
+
+def _setup_scientific_notation_array(size) -> Callable:
+    from aspen.simple_calculations import scientific_notation_array
+    values = np.random.default_rng(0).lognormal(0, 10, size)
+    return lambda: scientific_notation_array(values)
+
+
+def _setup_round_uncertainty(size) -> Callable:
+    from aspen.simple_calculations import round_uncertainty
+    rng = np.random.default_rng(0)
+    pairs = list(zip(rng.lognormal(0, 5, size).tolist(), rng.lognormal(-3, 2, size).tolist()))
+    return lambda: [round_uncertainty(p, dp) for p, dp in pairs]
+
+
+def _setup_round_uncertainty_array(size) -> Callable:
+    from aspen.simple_calculations import round_uncertainty_array
+    rng = np.random.default_rng(0)
+    pbest, dp = rng.lognormal(0, 5, size), rng.lognormal(-3, 2, size)
+    return lambda: round_uncertainty_array(pbest, dp)
+
+
+def _setup_integer_histo(size) -> Callable:
+    from aspen import SMC_cmap
+    from aspen.plotting import gen_IntegerHisto
+    num_students, maxScore = size
+    scores = synthetic_scores(num_students, maxScore)
+    Qinfo, letters = synthetic_Qinfo(maxScore), synthetic_letters(maxScore)
+    bins = np.arange(0, maxScore + 2)
+
+    def run():
+        plt.figure()
+        gen_IntegerHisto(scores, maxScore, Qinfo, letters, 'Benchmark', bins, [[], []], SMC_cmap)
+        plt.gcf().canvas.draw()
+        plt.close('all')
+    return run
+
+
+def _setup_quiz_corrections(size) -> Callable:
+    from aspen.plotting import gen_QuizCorrections
+    letters = synthetic_letters(size)
+
+    def run():
+        gen_QuizCorrections({"numQuestions": size}, 0.5, letters, 0.3, 'Benchmark', 0.5)
+        plt.gcf().canvas.draw()
+        plt.close('all')
+    return run
+
+
+def _setup_correlation_scatter(size) -> Callable:
+    from aspen import SMC_cmap
+    from aspen.plotting import gen_CorrelationScatter
+    scores, _ = synthetic_gradebook(size, 3, points=20.0)
+    data = [scores[:, 0], scores[:, 1], scores[:, 2]]
+    Qinfo = synthetic_Qinfo(20)
+
+    def run():
+        plt.figure()
+        gen_CorrelationScatter(data, [20, 20, 20], Qinfo, synthetic_letters(20), ['x', 'y', 'c'], 'Benchmark',
+                               [[0, 10, 20], [0, 10, 20]], SMC_cmap)
+        plt.gcf().canvas.draw()
+        plt.close('all')
+    return run
+
+
+def _setup_load_gradebook(size) -> Callable:
+    from aspen.gradebook import load_gradebook
+    from synthetic import write_gradebook_csv
+    num_students, num_assignments = size
+    filename = os.path.join(tempfile.mkdtemp(prefix='aspen_bench_'), 'gradebook.csv')
+    write_gradebook_csv(filename, num_students, num_assignments)
+    return lambda: load_gradebook(filename)
+
+
+# name -> (setup, sizes); the first size is the --quick one
+BENCH_CASES: dict[str, tuple[Callable, list]] = {
+    "make_color_map": (_setup_make_color_map, [(256, 3), (1024, 8), (65536, 32)]),
+    "scientific_notation": (_setup_scientific_notation, [1_000, 100_000]),
+    "scientific_notation_array": (_setup_scientific_notation_array, [1_000, 100_000, 1_000_000]),
+    "round_uncertainty": (_setup_round_uncertainty, [1_000, 100_000]),
+    "round_uncertainty_array": (_setup_round_uncertainty_array, [1_000, 100_000, 1_000_000]),
+    "gen_IntegerHisto": (_setup_integer_histo, [(100, 20), (10_000, 100), (200_000, 100)]),
+    "gen_QuizCorrections": (_setup_quiz_corrections, [10, 50, 200]),
+    "gen_CorrelationScatter": (_setup_correlation_scatter, [1_000, 40_000, 1_000_000]),
+    "load_gradebook": (_setup_load_gradebook, [(1_000, 20), (20_000, 200)]),
+}
+
+
+def time_case(fn: Callable, repeat: int = DEFAULT_REPEAT) -> dict:
+    """Best and median wall time (seconds) of repeat calls, after one warm-up call."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"best": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def run_suite(repeat: int = DEFAULT_REPEAT, quick: bool = False, name_filter: str | None = None,
+              include_import: bool = True) -> dict:
+    """
+    Run the benchmark cases.
+
+    Returns:
+        dict: Environment info and "cases": case id (e.g. "gen_IntegerHisto[10000x100]") -> timing.
+    """
+    cases = {}
+    for name, (setup, sizes) in BENCH_CASES.items():
+        if name_filter and name_filter not in name:
+            continue
+        for size in (sizes[:1] if quick else sizes):
+            label = 'x'.join(map(str, size)) if isinstance(size, tuple) else str(size)
+            case_id = f'{name}[{label}]'
+            cases[case_id] = time_case(setup(size), repeat)
+            print(f'{case_id:>40s}: best {1e3*cases[case_id]["best"]:10.2f} ms , '
+                  f'median {1e3*cases[case_id]["median"]:10.2f} ms', flush=True)
+
+    if include_import and (not name_filter or name_filter in "import"):
+        for name in ("constants_only", "plotting"):
+            res = time_import(IMPORT_CASES[name], repeat)
+            cases[f'import[{name}]'] = {"best": res["best"], "median": res["median"], "repeat": repeat}
+            print(f'{"import[" + name + "]":>40s}: best {1e3*res["best"]:10.2f} ms , '
+                  f'median {1e3*res["median"]:10.2f} ms', flush=True)
+
+    return {"python": platform.python_version(), "numpy": np.__version__, "matplotlib": matplotlib.__version__,
+            "machine": platform.machine(), "processor": platform.processor(), "cpu_count": os.cpu_count(),
+            "cases": cases}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """
+    Cases whose best time is more than tolerance (fraction) and MIN_REGRESSION_SECONDS slower than the baseline.
+    """
+    regressions = []
+    for case_id, res in results["cases"].items():
+        base = baseline["cases"].get(case_id)
+        if base is None:
+            continue
+        slower = res["best"] - base["best"]
+        if slower > tolerance*base["best"] and slower > MIN_REGRESSION_SECONDS:
+            regressions.append(f'{case_id}: {1e3*base["best"]:.2f} ms -> {1e3*res["best"]:.2f} ms '
+                               f'({res["best"]/base["best"]:.2f}x)')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed calls per case")
+    parser.add_argument("--quick", action="store_true", help="only the smallest size of each case")
+    parser.add_argument("--filter", default=None, help="only cases whose name contains this")
+    parser.add_argument("--no-import", action="store_true", help="skip the import-time cases")
+    parser.add_argument("--save", default=None, help="write the results as a JSON baseline")
+    parser.add_argument("--baseline", default=None, help="JSON baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed fractional slowdown")
+    args = parser.parse_args()
+
+    results = run_suite(args.repeat, args.quick, args.filter, not args.no_import)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Saved baseline to {args.save}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            return 1
+        print(f'No regressions against {args.baseline} (tolerance {100*args.tolerance:.0f}%)')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+'''
+Synthetic gradebooks for the benchmarks (no real student data needed).
+
+Scores are drawn from a clipped normal around a class mean with a per-student ability term, so
+assignments are correlated like real ones. Everything is seeded and generated in chunks, so
+gradebooks with millions of scores can be written to CSV without holding them as strings.
+
+e.g.,
+from synthetic import synthetic_scores, write_gradebook_csv
+
+scores = synthetic_scores(10_000, maxScore=20)
+write_gradebook_csv('big.csv', num_students=100_000, num_assignments=50)
+'''
+
+import csv
+
+import numpy as np
+
+DEFAULT_SEED: int = 12345
+LETTERS: dict[str, float] = {'A': 0.85, 'B': 0.7, 'C': 0.5, 'D': 0.35, 'F': 0.0}  # fractions of maxScore
+
+
+def synthetic_scores(num_students: int, maxScore: int, seed: int = DEFAULT_SEED) -> np.ndarray:
+    """Integer scores 0..maxScore (float array), roughly normal around 65% of maxScore."""
+    rng = np.random.default_rng(seed)
+    return np.clip(np.round(rng.normal(0.65*maxScore, 0.18*maxScore, num_students)), 0, maxScore)
+
+
+def synthetic_letters(maxScore: int) -> dict[str, int]:
+    """Letter grade -> lowest score, highest grade first."""
+    return {k: int(round(v*maxScore)) for k, v in LETTERS.items()}
+
+
+def synthetic_Qinfo(maxScore: int) -> dict:
+    """Qinfo with every gen_IntegerHisto / gen_CorrelationScatter option turned on."""
+    return dict(numPoints=maxScore, xlabel='Score', ypadding_fac=1.3, lettergrade_fs=14, showLetters=True,
+                showMode=True, showMedian=True, showMean=True, showMax=True, xtick_shift=0.5,
+                showCumulative_bars=True, showCumulative_scores=True, Cumulative_score_color='#137c94',
+                cumulative_ps=10, title_fs=10, scatter_ps=20, scatter_alpha=0.7, cbar_fs=9)
+
+
+def synthetic_gradebook(num_students: int, num_assignments: int, points: float = 10.0, missing_frac: float = 0.05,
+                        seed: int = DEFAULT_SEED) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Correlated (students, assignments) scores and a missing-submission mask.
+    """
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(0.0, 0.12, (num_students, 1))
+    difficulty = rng.normal(0.0, 0.05, (1, num_assignments))
+    frac = np.clip(0.7 + ability - difficulty + rng.normal(0.0, 0.1, (num_students, num_assignments)), 0, 1)
+    scores = np.round(frac*points)
+    missing = rng.random((num_students, num_assignments)) < missing_frac
+    scores[missing] = 0.0
+    return scores, missing
+
+
+def write_gradebook_csv(filename: str, num_students: int, num_assignments: int, points: float = 10.0,
+                        missing_frac: float = 0.05, chunk_students: int = 10_000, seed: int = DEFAULT_SEED) -> str:
+    """
+    Write an LMS-style gradebook export (header, 'Points Possible' row, one row per student), chunk by chunk.
+    """
+    columns = [f'Assignment {i} ({100000 + i})' for i in range(num_assignments)]
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Student', 'ID'] + columns)
+        writer.writerow(['Points Possible', ''] + [f'{points:g}']*num_assignments)
+        for start in range(0, num_students, chunk_students):
+            n = min(chunk_students, num_students - start)
+            scores, missing = synthetic_gradebook(n, num_assignments, points, missing_frac, seed + start)
+            cells = np.where(missing, '', scores.astype(np.int64).astype(str))
+            writer.writerows([f'Student, {start + i}', str(start + i)] + list(row) for i, row in enumerate(cells))
+    return filename
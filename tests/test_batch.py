@@ -0,0 +1,20 @@
+import os
+
+from aspen.batch import HistogramJob, render_histograms
+
+
+class CrashingQinfo(dict):
+    """Kills the worker process as soon as the job reads it."""
+
+    def __getitem__(self, key):
+        os._exit(1)
+
+
+def test_dead_worker_fails_only_its_own_job(tmp_path):
+    # Jobs with an empty Qinfo fail with a KeyError inside the worker, which is enough to see that they ran
+    jobs = [HistogramJob([1, 2], CrashingQinfo() if i == 1 else {}, {}, 3, [], str(tmp_path / f'{i}.png'))
+            for i in range(8)]
+    results = render_histograms(jobs, workers=2, max_tasks_per_child=4, verbose=False)
+    assert [r.index for r in results] == list(range(8))
+    assert 'BrokenProcessPool' in results[1].error
+    assert all('KeyError' in r.error for i, r in enumerate(results) if i != 1)
@@ -0,0 +1,53 @@
+import warnings
+
+import numpy as np
+
+import aspen.blackbody as bb
+from aspen.constants_conversions import PhysicsConstants
+
+H, C, K = PhysicsConstants.H_PLANCK, PhysicsConstants.C_LIGHT, PhysicsConstants.K_BOLTZMANN
+
+
+def test_grid_matches_planck(tmp_path):
+    T = np.logspace(2, 6, 37)
+    lam = np.geomspace(1e-9, 1e-2, 501)
+    expected = bb.planck(T[:, None], lam[None, :])
+    # A tiny budget gives one temperature per block
+    assert np.array_equal(bb.planck_grid(T, lam, memory_budget=1), expected)
+    out = np.lib.format.open_memmap(str(tmp_path / 'B.npy'), mode='w+', dtype=np.float64, shape=(T.size, lam.size))
+    assert bb.planck_grid(T, lam, out=out) is out
+    assert np.array_equal(np.asarray(out), expected)
+
+
+def test_planck_formula_and_limits():
+    lam = 5e-7
+    T = H*C/(lam*K)/np.array([1e-7, 1e-3, 0.5, 5.0, 29.9, 30.1, 60.0, 300.0])  # x = hc/(lambda k T)
+    x = H*C/(lam*K*T)
+    B = bb.planck(T, lam)
+    prefac = 2*H*C**2/lam**5
+    assert np.allclose(B, prefac/np.expm1(x), rtol=1e-13, atol=0)
+    wien = x > 20
+    assert np.allclose(B[wien], prefac*np.exp(-x[wien]), rtol=1e-8, atol=0)  # Wien limit, x >> 1
+    rayleigh_jeans = 2*C*K*T/lam**4
+    assert np.isclose(B[0], rayleigh_jeans[0], rtol=1e-6)  # x << 1
+    assert np.isclose(B[1], rayleigh_jeans[1], rtol=1e-3)
+
+
+def test_no_overflow_deep_in_the_wien_tail():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        B = bb.planck_grid([3.0, 10.0], [1e-9, 1e-8])  # x up to ~5e6
+    assert np.all(np.isfinite(B)) and np.all(B >= 0) and B[0, 0] == 0
+
+
+def test_integral_matches_stefan_boltzmann():
+    T = np.array([300.0, 5772.0, 3e4])
+    lam = np.geomspace(1e-9, 1.0, 400_000)
+    radiance = bb.band_radiance(T, lam, memory_budget=2**22)
+    sigma_T4 = PhysicsConstants.SB_CONSTANT*T**4
+    assert np.allclose(np.pi*radiance, sigma_T4, rtol=1e-6)
+    R = np.array([1.0, 6.957e8, 2e9])
+    assert np.allclose(bb.band_luminosity(T, R, lam), bb.bolometric_luminosity(T, R), rtol=1e-6)
+    # Transmission weights the integrand
+    half = bb.band_radiance(T, lam, transmission=np.full(lam.size, 0.5))
+    assert np.allclose(half, 0.5*radiance, rtol=1e-12)
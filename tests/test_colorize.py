@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+from matplotlib import colormaps
+from matplotlib.colors import Normalize
+
+from aspen.colorize import colorize
+
+
+@pytest.mark.parametrize('offset', [0.0, 1e6])
+def test_linear_matches_matplotlib(offset):
+    rng = np.random.default_rng(0)
+    data = offset + rng.uniform(0, 1, size=(300, 200))
+    cmap = colormaps['viridis']
+    vmin, vmax = offset, offset + 1
+    expected = cmap(Normalize(vmin, vmax)(data), bytes=True)
+    got = colorize(data, cmap, vmin=vmin, vmax=vmax, block_pixels=10_000)
+    assert np.mean(np.any(got != expected, axis=-1)) < 1e-3
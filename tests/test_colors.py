@@ -0,0 +1,48 @@
+import threading
+
+import matplotlib
+import numpy as np
+from matplotlib.colors import to_rgba
+
+from aspen import colors
+
+
+def test_make_color_map_accepts_rgb_lists_and_arrays():
+    names = colors.make_color_map(['red', 'blue'], num_points=16)
+    lists = colors.make_color_map([[1, 0, 0], [0, 0, 1]], num_points=16)
+    array = colors.make_color_map(np.array([[1.0, 0, 0, 1], [0, 0, 1.0, 1]]), num_points=16,
+                                  leftColor=[1, 1, 1], rightColor=np.array([0.0, 0, 0]))
+    np.testing.assert_array_equal(names.colors, lists.colors)
+    np.testing.assert_array_equal(array.colors[1:-1], names.colors[1:-1])
+    assert tuple(array.colors[0]) == to_rgba('white') and tuple(array.colors[-1]) == to_rgba('black')
+
+
+def test_make_color_map_returns_independent_copies():
+    a = colors.make_color_map(['#ff0000', '#0000ff'], num_points=8)
+    b = colors.make_color_map(['#ff0000', '#0000ff'], num_points=8)
+    a.colors[0] = 0.5
+    assert b.colors[0][0] == 1.0
+
+
+def test_named_colormap_built_once_across_threads():
+    name = 'UCB_cmap'
+    colors.__dict__.pop(name, None)
+    if 'ucb' in matplotlib.colormaps:
+        matplotlib.colormaps.unregister('ucb')
+    barrier, results, errors = threading.Barrier(8), [], []
+
+    def build():
+        barrier.wait()
+        try:
+            results.append(colors._build_cmap(name))
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=build) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert all(cmap is results[0] for cmap in results)
+    assert 'ucb' in matplotlib.colormaps
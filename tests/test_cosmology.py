@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from aspen.cosmology import Cosmology
+
+REDSHIFTS = np.logspace(-6, 3, 28)
+
+
+def _simpson(f, a, b, n=4001):
+    t = np.linspace(a, b, n)
+    w = np.ones(n)
+    w[1:-1:2], w[2:-1:2] = 4, 2
+    return (b - a)/(n - 1)/3*np.sum(w*f(t))
+
+
+def _E(cosmo, z):
+    zp1 = 1 + z
+    return np.sqrt(cosmo.OMEGA_RADIATION*zp1**4 + cosmo.OMEGA_M*zp1**3 + cosmo.OMEGA_K*zp1**2 + cosmo.OMEGA_LAMBDA)
+
+
+def _direct(cosmo, z):
+    """Comoving distance, lookback time and age at z by direct quadrature (Hubble units)."""
+    x = np.log1p(z)
+    comoving = _simpson(lambda t: np.exp(t)/_E(cosmo, np.expm1(t)), 0, x)
+    lookback = _simpson(lambda t: 1/_E(cosmo, np.expm1(t)), 0, x)
+    # age = int_0^a da/(a E(a)), with a = u^2: 2 du/(u E) = 2 u^3 du/sqrt(Or + Om u^2 + Ok u^4 + OL u^8)
+    u_max = np.sqrt(1/(1 + z))
+    age = _simpson(lambda u: 2*u**3/np.sqrt(cosmo.OMEGA_RADIATION + cosmo.OMEGA_M*u**2 + cosmo.OMEGA_K*u**4
+                                         + cosmo.OMEGA_LAMBDA*u**8), 0, u_max)
+    return comoving, lookback, age
+
+
+@pytest.mark.parametrize('cosmo', [Cosmology(), Cosmology(OMEGA_M=0.3, OMEGA_LAMBDA=0.6, OMEGA_K=0.1)],
+                         ids=['default', 'open'])
+def test_tables_match_direct_quadrature(cosmo):
+    d_h, t_h = cosmo.hubble_distance, cosmo.hubble_time
+    for z in REDSHIFTS:
+        comoving, lookback, age = _direct(cosmo, z)
+        if cosmo.OMEGA_K > 0:
+            sqrt_ok = np.sqrt(cosmo.OMEGA_K)
+            transverse = np.sinh(sqrt_ok*comoving)/sqrt_ok
+        else:
+            transverse = comoving
+        assert np.isclose(cosmo.comoving_distance(z), d_h*comoving, rtol=1e-8, atol=0), z
+        assert np.isclose(cosmo.luminosity_distance(z), (1 + z)*d_h*transverse, rtol=1e-8, atol=0), z
+        assert np.isclose(cosmo.lookback_time(z), t_h*lookback, rtol=1e-8, atol=0), z
+        assert np.isclose(cosmo.age(z), t_h*age, rtol=2e-8, atol=0), z
+
+
+def test_arrays_and_limits():
+    cosmo = Cosmology()
+    z = np.array([[0.0, 0.5], [2.0, 1e3]])
+    assert cosmo.comoving_distance(z).shape == z.shape
+    assert cosmo.comoving_distance(0.0) == 0 and cosmo.lookback_time(0.0) == 0
+    assert np.isclose(cosmo.age(0.0), cosmo.hubble_time*cosmo.table.age_today)
+    with pytest.raises(ValueError):
+        cosmo.comoving_distance(-0.1)
@@ -0,0 +1,21 @@
+import numpy as np
+
+from aspen.grade_corrections import corrected_scores, letter_grade_index, sorted_boundaries, sweep_corrections
+
+BOUNDARIES = [{'F': 0, 'D': 50, 'C': 60, 'B': 70, 'A': 85}, {'F': 0, 'D': 45, 'C': 55, 'B': 68, 'A': 90}]
+
+
+def test_sweep_matches_per_fraction_results():
+    rng = np.random.default_rng(1)
+    scores = rng.integers(0, 101, size=500).astype(float)
+    fracs = np.linspace(0.05, 1, 20)
+    # A tiny budget forces one fraction per block
+    sweep = sweep_corrections(scores, 100, fracs, BOUNDARIES, memory_budget=1)
+    for i, frac in enumerate(fracs):
+        new = corrected_scores(scores, 100, frac)
+        assert np.isclose(sweep.mean_score_change[i], np.mean(new - scores))
+        for k, bdys in enumerate(BOUNDARIES):
+            _, bounds = sorted_boundaries(bdys)
+            gain = letter_grade_index(new, bounds) - letter_grade_index(scores, bounds)
+            assert np.isclose(sweep.mean_grade_change[i, k], gain.mean())
+            assert np.isclose(sweep.frac_improved[i, k], np.mean(gain > 0))
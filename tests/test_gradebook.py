@@ -0,0 +1,90 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import aspen.gradebook as gb
+from aspen.plotting import gen_AssignmentAvg, gen_ParticpationAvg
+
+CANVAS_HEADER = ['Student', 'ID', 'SIS User ID', 'SIS Login ID', 'Section', 'Quiz 1 (101)', 'Quiz 2 (102)',
+                 'Quiz 3 (103)', 'HW 1 (201)']
+CANVAS_ROWS = [
+    ['Ada, A', '11', '1001', 'ada', 'PHYS 1 - 001', '8', '10', '4', '20'],
+    ['Bo, B', '12', '1002', 'bo', 'PHYS 1 - 001', '5', '', 'EX', '10'],
+    ['Cy, C', '13', '1003', 'cy', 'PHYS 1 - 002', '10', '6', '2', ''],
+]
+
+
+def _write(path, rows):
+    path.write_text('\n'.join(','.join(f'"{c}"' if ',' in c else c for c in row) for row in rows) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def canvas_csv(tmp_path):
+    points = ['    Points Possible', '', '', '', '', '10', '10', '5', '20']
+    return _write(tmp_path / 'canvas.csv', [CANVAS_HEADER, points] + CANVAS_ROWS)
+
+
+@pytest.fixture
+def canvas_csv_no_points(tmp_path):
+    return _write(tmp_path / 'canvas_no_points.csv', [CANVAS_HEADER] + CANVAS_ROWS)
+
+
+def test_load_canvas_export(canvas_csv):
+    book = gb.load_gradebook(canvas_csv, chunk_rows=2)  # several chunks
+    assert book.columns == CANVAS_HEADER[5:]
+    assert list(book.students) == ['Ada, A', 'Bo, B', 'Cy, C']
+    assert list(book.info['SIS User ID']) == ['1001', '1002', '1003']
+    assert list(book.info['Section']) == ['PHYS 1 - 001', 'PHYS 1 - 001', 'PHYS 1 - 002']
+    assert np.array_equal(book.points_possible, [10, 10, 5, 20])
+    assert np.array_equal(book.scores, [[8, 10, 4, 20], [5, 0, 0, 10], [10, 6, 2, 0]])
+    assert np.array_equal(book.missing, [[0, 0, 0, 0], [0, 1, 1, 0], [0, 0, 0, 1]])
+
+
+def test_load_without_points_possible_uses_column_maximum(canvas_csv_no_points):
+    book = gb.load_gradebook(canvas_csv_no_points)
+    assert book.columns == CANVAS_HEADER[5:]
+    assert np.array_equal(book.points_possible, [10, 10, 4, 20])
+    assert np.all(np.isfinite(gb.student_averages(book)))
+    assert np.all(np.isfinite(gb.assignment_averages(book)[0]))
+
+
+def test_explicit_columns(canvas_csv):
+    book = gb.load_gradebook(canvas_csv, id_columns=('Student',), score_columns=['HW 1 (201)'])
+    assert book.columns == ['HW 1 (201)'] and book.info == {}
+    with pytest.raises(AssertionError):
+        gb.load_gradebook(canvas_csv, id_columns=('Name',))
+
+
+def test_drop_lowest_and_weights(canvas_csv):
+    quizzes = gb.load_gradebook(canvas_csv).select(r'^Quiz')
+    fractions = np.array([[0.8, 1.0, 0.8], [0.5, 0.0, 0.0], [1.0, 0.6, 0.4]])
+    assert np.allclose(gb.student_averages(quizzes), fractions.mean(axis=1))
+    # Missing excluded: Bo only has Quiz 1
+    assert np.allclose(gb.student_averages(quizzes, missing_as_zero=False), [13/15, 0.5, 2/3])
+    # Lowest dropped (ties: the first lowest), but one valid score is always kept
+    assert np.allclose(gb.student_averages(quizzes, drop_lowest=1), [0.9, 0.25, 0.8])
+    assert np.allclose(gb.student_averages(quizzes, drop_lowest=5), [1.0, 0.5, 1.0])
+    assert np.allclose(gb.student_averages(quizzes, drop_lowest=1, missing_as_zero=False), [0.9, 0.5, 0.8])
+    assert np.allclose(gb.student_averages(quizzes, weights=[1, 2, 1]), (fractions @ [1, 2, 1])/4)
+
+
+def test_weighted_grade(canvas_csv):
+    book = gb.load_gradebook(canvas_csv)
+    grade = gb.weighted_grade(book, {'quiz': gb.GradeCategory(r'^Quiz', 3, drop_lowest=1),
+                                     'hw': gb.GradeCategory(['HW 1 (201)'], 1)})
+    assert np.allclose(grade, (3*np.array([0.9, 0.25, 0.8]) + np.array([1.0, 0.5, 0.0]))/4)
+
+
+@pytest.mark.parametrize('plot', [gen_ParticpationAvg, gen_AssignmentAvg])
+@pytest.mark.parametrize('fixture', ['canvas_csv', 'canvas_csv_no_points'])
+def test_plots_from_canvas_file(plot, fixture, request, tmp_path):
+    plot_info = {'columns': None, 'bar_color': 'gray', 'title_fs': 12, 'missing_as_zero': False}
+    plt.figure()
+    plot(request.getfixturevalue(fixture), plot_info, 'Test', outname=str(tmp_path / 'out.png'))
+    ax = plt.gca()
+    labels = [t.get_text() for t in ax.get_xticklabels()]
+    heights = [p.get_height() for p in ax.patches]
+    plt.close('all')
+    assert labels == CANVAS_HEADER[5:]
+    assert len(heights) == 4 and np.all(np.isfinite(heights)) and max(heights) > 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import aspen.orbits as orb
+
+
+@pytest.mark.parametrize('e_max', [0.5, 0.9, 0.99])
+def test_kepler_residual_within_tolerance(e_max):
+    rng = np.random.default_rng(4)
+    M = rng.uniform(-50, 50, 200_000)
+    e = rng.uniform(0, e_max, M.size)
+    E = orb.solve_kepler(M, e)
+    M_reduced = np.remainder(M + np.pi, 2*np.pi) - np.pi
+    assert np.max(np.abs(E - e*np.sin(E) - M_reduced)) <= orb.KEPLER_TOL
+    assert np.all((E >= -np.pi - 1e-12) & (E <= np.pi + 1e-12))
+
+
+def test_kepler_edge_cases():
+    assert np.array_equal(orb.solve_kepler(np.zeros(3), [0.0, 0.5, 0.9]), np.zeros(3))
+    assert np.allclose(orb.solve_kepler([0.3, -2.0], 0.0), [0.3, -2.0])  # circular: E = M
+    with pytest.raises(RuntimeError):
+        orb.solve_kepler(np.linspace(-3, 3, 101), 0.999, max_iter=1)
+    with pytest.raises(AssertionError):
+        orb.solve_kepler(0.1, 1.0)
+
+
+def test_energy_and_angular_momentum_conserved():
+    t = np.linspace(0, 250, 20_001)
+    pos, vel = orb.propagate_solar_system(t)
+    astro = orb.AstroConstantsAndUsefulNumbers()
+    a = np.asarray(astro.A_SOLAR_SYSTEM_AU_ARR)[:, None]
+    P = np.asarray(astro.P_SOLAR_SYSTEM_YR_ARR)[:, None]
+    mu = 4*np.pi**2*a**3/P**2  # Kepler's third law, AU^3/yr^2
+
+    r = np.hypot(pos[..., 0], pos[..., 1])
+    energy = 0.5*np.sum(vel**2, axis=-1) - mu/r
+    assert np.allclose(energy, -mu/(2*a), rtol=1e-9, atol=0)  # vis-viva
+    h = pos[..., 0]*vel[..., 1] - pos[..., 1]*vel[..., 0]
+    e = np.asarray(astro.E_SOLAR_SYSTEM_ARR)[:, None]
+    assert np.allclose(h, np.sqrt(mu*a*(1 - e**2)), rtol=1e-9, atol=0)
+
+
+def test_periodic_and_contiguous():
+    pos, vel = orb.propagate_orbits([0.0, 3.0], semi_major=[2.0], eccentricity=[0.3], period=[3.0],
+                                    mean_anomaly_epoch=[40.0])
+    assert pos.shape == vel.shape == (1, 2, 2) and pos.flags.c_contiguous
+    assert np.allclose(pos[:, 0], pos[:, 1]) and np.allclose(vel[:, 0], vel[:, 1])
+    # Perihelion along +x at M = 0
+    pos, _ = orb.propagate_orbits([0.0], [2.0], [0.3], [3.0], [0.0])
+    assert np.allclose(pos[0, 0], [2.0*(1 - 0.3), 0.0])
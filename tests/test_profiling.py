@@ -0,0 +1,38 @@
+import os
+
+import matplotlib.pyplot as plt
+
+from aspen.profiling import profile_plots, profiled
+from aspen.saving import async_saving, save_figure
+
+
+@profiled
+def draw_lines(n, outname=None):
+    fig = plt.figure()
+    ax = fig.add_subplot()
+    for i in range(n):
+        ax.plot([0, 1], [i, i])
+    save_figure(fig, outname)
+
+
+def test_async_save_records_its_own_figure(tmp_path):
+    outnames = [str(tmp_path / f'{n}.png') for n in (1, 20)]
+    with profile_plots() as sync_prof:
+        for n, outname in zip((1, 20), outnames):
+            draw_lines(n, outname=outname)
+    plt.close('all')
+    with profile_plots() as async_prof:
+        with async_saving(max_workers=2):
+            plt.figure()  # an unrelated open figure must not be counted
+            for n, outname in zip((1, 20), outnames):
+                draw_lines(n, outname=outname)
+    plt.close('all')
+
+    sync_records = {r['outname']: r for r in sync_prof.records}
+    async_records = {r['outname']: r for r in async_prof.records}
+    assert set(async_records) == set(outnames)
+    for outname in outnames:
+        assert async_records[outname]['num_artists'] == sync_records[outname]['num_artists']
+        assert async_records[outname]['file_bytes'] == os.path.getsize(outname) > 0
+        assert not any(k.startswith('_') for k in async_records[outname])
+    assert async_records[outnames[1]]['num_artists'] > async_records[outnames[0]]['num_artists']
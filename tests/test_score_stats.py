@@ -0,0 +1,25 @@
+import numpy as np
+
+from aspen.score_stats import ScoreAccumulator, compute_score_stats
+
+LETTERS = {'A': 17, 'B': 14, 'C': 10, 'D': 7, 'F': 0}
+
+
+def test_accumulator_matches_batch_stats():
+    rng = np.random.default_rng(2)
+    # Fine bins put many edges right at attainable means, where an inexact mean lands in the wrong bin
+    bins = np.round(np.arange(0, 20.05, 0.05), 2)
+    for _ in range(300):
+        scores = rng.integers(0, 21, size=rng.integers(1, 200))
+        acc = ScoreAccumulator(20, LETTERS, bins)
+        split = rng.integers(0, len(scores) + 1)
+        for s in scores[:split]:
+            acc.add(s)
+        acc.add_many(scores[split:])
+
+        expected, got = compute_score_stats(scores, 20, LETTERS, bins), acc.stats()
+        assert got.mean == expected.mean
+        assert got.mean_bin == expected.mean_bin
+        assert got.median_bin == expected.median_bin
+        assert np.allclose(got.bars, expected.bars)
+        assert np.isclose(acc.variance, np.var(scores))
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from aspen.simple_calculations import (round_uncertainty, round_uncertainty_array, scientific_notation,
+                                       scientific_notation_array)
+
+
+def _cases(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    pbest = rng.lognormal(0, 6, n) * rng.choice([-1, 1], n)
+    dp = rng.lognormal(-2, 4, n)
+    # Decimal half-way cases (0.35, 1.25, 0.0045, ...) where numpy's rounding differs from round()
+    halves = (np.arange(1, 2001) + 0.5) * 10.0**rng.integers(-6, 4, 2000)
+    pbest[:2000], dp[:2000] = halves, halves / rng.integers(2, 50, 2000)
+    return pbest, dp
+
+
+@pytest.mark.parametrize("cast", [float, np.float64], ids=["float", "np.float64"])
+def test_round_uncertainty_array_matches_scalar(cast):
+    pbest, dp = _cases()
+    p_arr, dp_arr = round_uncertainty_array(pbest, dp)
+    for i in range(pbest.size):
+        p_ref, dp_ref = round_uncertainty(cast(pbest[i]), cast(dp[i]))
+        assert (p_arr[i], dp_arr[i]) == (p_ref, dp_ref), (pbest[i], dp[i])
+
+
+@pytest.mark.parametrize("cast", [float, np.float64], ids=["float", "np.float64"])
+def test_scientific_notation_array_matches_scalar(cast):
+    values = np.concatenate([_cases()[0], [0.0, 1.0, -1e-300, 9.999999999999999e22]])
+    coefficient, exponent = scientific_notation_array(values)
+    for i, v in enumerate(values):
+        assert (coefficient[i], exponent[i]) == scientific_notation(cast(v)), v
+
+
+def test_zero_dimensional_inputs():
+    p, dp = round_uncertainty_array(1.0, 0.3)
+    assert (p, dp) == round_uncertainty(1.0, 0.3)
+    p, dp = round_uncertainty_array(np.float64(0.35), np.float64(0.05))  # half-way: takes the exact-round path
+    assert (p, dp) == round_uncertainty(0.35, 0.05)
+    assert scientific_notation_array(np.float64(-250.0)) == scientific_notation(-250.0)
+
+
+def test_non_finite_raises():
+    with pytest.raises(ValueError):
+        scientific_notation_array([1.0, np.nan])
@@ -0,0 +1,94 @@
+import threading
+
+import matplotlib
+import pytest
+
+from aspen import themes
+from aspen.saving import FigureWriter, async_saving, save_figure
+from aspen.themes import SMC_THEME, UCB_THEME
+
+
+def _run_with_timeout(target, timeout=30):
+    errors = []
+
+    def run():
+        try:
+            target()
+        except BaseException as err:
+            errors.append(err)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'deadlocked'
+    if errors:
+        raise errors[0]
+
+
+def _themed_figure(theme):
+    fig = theme.figure()
+    fig.add_subplot().plot([0, 1], [0, 1])
+    return fig
+
+
+def test_flush_inside_theme_context(tmp_path):
+    def work():
+        with SMC_THEME.context():
+            writer = FigureWriter(max_workers=1, max_pending=1)
+            for i in range(3):  # more than max_pending, so submit waits for the writer too
+                writer.submit(_themed_figure(UCB_THEME), str(tmp_path / f'{i}.png'))
+            assert all(r.ok for r in writer.flush())
+            # this thread's theme is back in effect after waiting
+            assert matplotlib.rcParams['axes.prop_cycle'] == SMC_THEME.cycler
+            writer.close()
+        assert not themes.in_context()
+    _run_with_timeout(work)
+    assert all((tmp_path / f'{i}.png').stat().st_size > 0 for i in range(3))
+
+
+def test_async_saving_exit_inside_theme_context(tmp_path):
+    def work():
+        with SMC_THEME.context():
+            with async_saving(max_workers=2):
+                for i in range(4):
+                    save_figure(_themed_figure(SMC_THEME), str(tmp_path / f'{i}.png'))
+    _run_with_timeout(work)
+    assert all((tmp_path / f'{i}.png').stat().st_size > 0 for i in range(4))
+
+
+def test_released_outside_context_is_a_no_op():
+    with themes.released():
+        assert not themes.in_context()
+    with pytest.raises(RuntimeError):
+        themes._RC_LOCK.release()  # not held
+
+
+def _render(theme, seed):
+    import io
+
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    with theme.context():
+        fig = theme.figure()
+        ax = fig.add_subplot()
+        ax.hist(rng.normal(size=500), bins=20)
+        ax.plot(rng.uniform(-3, 3, 10), rng.uniform(0, 60, 10))
+        ax.set_title(theme.name)
+    buffer = io.BytesIO()
+    theme.savefig(fig, buffer, format='png')
+    return buffer.getvalue()
+
+
+def test_threads_with_mixed_themes_match_sequential():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aspen.themes import THEMES
+    polluted = {'font.size': 30, 'lines.linewidth': 7, 'xtick.labelsize': 3, 'figure.dpi': 40,
+                'axes.prop_cycle': matplotlib.cycler(color=['k'])}
+    jobs = [(theme, seed) for seed in range(6) for theme in THEMES.values()]  # 24 figures, 4 themes
+    with matplotlib.rc_context(polluted):
+        expected = [_render(theme, seed) for theme, seed in jobs]
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            got = list(pool.map(lambda job: _render(*job), jobs))
+        assert matplotlib.rcParams['font.size'] == 30  # the caller's settings are untouched
+    assert len({len(b) for b in expected}) > 1  # the themes do differ
+    assert got == expected
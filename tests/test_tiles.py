@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import aspen.tiles as tl
+from aspen.colorize import colorize, data_limits, make_lut
+from aspen.colors import SMC_cmap
+
+
+def _stitch(paths, shape, tile_size):
+    out = np.zeros(shape + (4,), dtype=np.uint8)
+    for path in paths:
+        row, col = (int(v) for v in os.path.basename(path)[:-4].split('_'))
+        tile = np.asarray(Image.open(path))
+        out[row*tile_size:row*tile_size + tile.shape[0], col*tile_size:col*tile_size + tile.shape[1]] = tile
+    return out
+
+
+def _downsample(a):
+    a = a.astype(np.float32)
+    if a.shape[0] % 2:
+        a = np.concatenate([a, a[-1:]], axis=0)
+    if a.shape[1] % 2:
+        a = np.concatenate([a, a[:, -1:]], axis=1)
+    return a.reshape(a.shape[0]//2, 2, a.shape[1]//2, 2).mean(axis=(1, 3))
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(5)
+    data = rng.lognormal(0, 2, size=(301, 517)).astype(np.float32)
+    data[rng.random(data.shape) < 0.01] = np.nan
+    np.save(tmp_path / 'data.npy', data)
+    return tl.open_dataset(str(tmp_path / 'data.npy'))
+
+
+@pytest.mark.parametrize('norm', ['linear', 'log', 'asinh'])
+def test_tiles_match_colorize(dataset, tmp_path, norm):
+    vmin, vmax = tl.streaming_limits(dataset, norm, strip_rows=37)
+    assert (vmin, vmax) == data_limits(np.asarray(dataset), norm)
+    paths = tl.write_tiles(dataset, SMC_cmap, str(tmp_path / 'tiles'), tile_size=128, norm=norm, workers=3)
+    assert len(paths) == 3*5
+    expected = colorize(np.asarray(dataset), SMC_cmap, norm=norm, vmin=vmin, vmax=vmax)
+    assert np.array_equal(_stitch(paths, dataset.shape, 128), expected)
+
+
+def test_pyramid_levels_match_colorize(dataset, tmp_path):
+    vmin, vmax = tl.streaming_limits(dataset, 'log')
+    tiles = tl.write_tile_pyramid(dataset, make_lut(SMC_cmap), str(tmp_path / 'pyr'), tile_size=128, norm='log',
+                                  workers=2)
+    assert sorted(tiles) == [0, 1, 2, 3]
+    level = np.asarray(dataset)
+    for k in sorted(tiles):
+        expected = colorize(level, SMC_cmap, norm='log', vmin=vmin, vmax=vmax)
+        assert np.array_equal(_stitch(tiles[k], level.shape, 128), expected), k
+        level = _downsample(level)
+    assert not (tmp_path / 'pyr' / 'levels').exists()
+
+
+def test_downsample2_streams_strips(dataset, tmp_path):
+    out = tl.downsample2(dataset, str(tmp_path / 'half.npy'), strip_rows=7)
+    assert np.array_equal(np.asarray(out), _downsample(np.asarray(dataset)), equal_nan=True)
@@ -0,0 +1,82 @@
+import re
+
+import numpy as np
+import pytest
+
+import aspen.uncertainty_tables as ut
+from aspen.simple_calculations import round_uncertainty
+
+
+def _rows(values, errors, style, chunk_size=ut.DEFAULT_CHUNK_SIZE):
+    return list(ut.format_uncertainty_rows(ut.iter_array_pairs(np.asarray(values, dtype=float),
+                                                               np.asarray(errors, dtype=float), chunk_size),
+                                           style=style))
+
+
+@pytest.mark.parametrize("style, expected", [
+    ("siunitx", [r"0 & \num{3.142 \pm 0.021} \\", r"1 & \num{12346 \pm 23} \\",
+                 r"2 & \num{0.000123 \pm 0.000003} \\", r"3 & \num{1.23 \pm 0.05 e-7} \\",
+                 r"4 & \num{-5.6780 \pm 0.0023 e12} \\", r"5 & \num{1.235 \pm 0.012 e5} \\"]),
+    ("latex", [r"0 & $3.142 \pm 0.021$ \\", r"1 & $12346 \pm 23$ \\", r"2 & $0.000123 \pm 0.000003$ \\",
+               r"3 & $(1.23 \pm 0.05) \times 10^{-7}$ \\", r"4 & $(-5.6780 \pm 0.0023) \times 10^{12}$ \\",
+               r"5 & $(1.235 \pm 0.012) \times 10^{5}$ \\"]),
+    ("markdown", ["| 0 | 3.142 ± 0.021 |", "| 1 | 12346 ± 23 |", "| 2 | 0.000123 ± 0.000003 |",
+                  "| 3 | (1.23 ± 0.05)e-7 |", "| 4 | (-5.6780 ± 0.0023)e12 |", "| 5 | (1.235 ± 0.012)e5 |"]),
+])
+def test_known_rows(style, expected):
+    values = [3.14159, 12345.6, 0.00012345, 1.234e-7, -5.678e12, 123456.7]
+    errors = [0.0213, 23, 0.0000031, 5.1e-9, 2.3e9, 1234]
+    assert _rows(values, errors, style) == expected
+
+
+def test_rows_round_trip_to_round_uncertainty():
+    rng = np.random.default_rng(3)
+    values = rng.lognormal(0, 12, 5000) * rng.choice([-1, 1], 5000)
+    errors = np.abs(values) * rng.lognormal(-4, 2, 5000)
+    pattern = re.compile(r"\| (\d+) \| \(?(-?[\d.]+) ± ([\d.]+)\)?(?:e(-?\d+))? \|")
+    for i, row in enumerate(_rows(values, errors, "markdown", chunk_size=777)):
+        label, value, error, exponent = pattern.fullmatch(row).groups()
+        assert int(label) == i
+        # value and error end on the same digit, and the mantissa is readable
+        assert len(value.partition('.')[2]) == len(error.partition('.')[2]), row
+        v_ref, e_ref = round_uncertainty(values[i], errors[i])
+        scale = 10.0**int(exponent or 0)
+        if exponent is not None:
+            assert abs(int(exponent)) > ut.EXPONENT_LIMIT and 1 <= max(abs(float(value)), float(error)) < 10, row
+        else:  # decided on the rounded pair
+            assert 10.0**-ut.EXPONENT_LIMIT <= max(abs(v_ref), e_ref) < 10.0**(ut.EXPONENT_LIMIT + 1), row
+        assert float(value)*scale == pytest.approx(v_ref, rel=1e-12), row
+        assert float(error)*scale == pytest.approx(e_ref, rel=1e-12), row
+
+
+def test_non_finite_and_zero_stay_fixed_point():
+    assert _rows([np.nan, 0.0], [1.0, 0.0], "markdown") == ["| 0 | nan ± 1.0 |", "| 1 | 0.0 ± 0.0 |"]
+
+
+@pytest.mark.parametrize("style", list(ut.TABLE_STYLES))
+def test_write_uncertainty_table_from_csv(tmp_path, style):
+    rng = np.random.default_rng(8)
+    values = rng.lognormal(0, 8, 250)
+    errors = values * rng.lognormal(-3, 1, 250)
+    csv_name = tmp_path / 'results.csv'
+    with open(csv_name, 'w') as f:
+        f.write('value,error\n')
+        for i, (v, e) in enumerate(zip(values, errors)):
+            f.write(f'{float(v)!r},{float(e)!r}\n' + ('\n' if i % 50 == 0 else ''))  # blank lines are skipped
+
+    out = tmp_path / f'table_{style}.txt'
+    assert ut.write_uncertainty_table(ut.iter_csv_pairs(str(csv_name), skip_header=1, chunk_size=64),
+                                      str(out), style=style) == 250
+    header, _, footer = ut.TABLE_STYLES[style]
+    lines = out.read_text().splitlines()
+    assert lines == list(header) + _rows(values, errors, style) + list(footer)
+
+    bare = tmp_path / 'bare.txt'
+    assert ut.write_uncertainty_table(ut.iter_array_pairs(values, errors, 7), str(bare), style=style,
+                                      include_header=False) == 250
+    assert bare.read_text().splitlines() == _rows(values, errors, style)
+
+
+def test_unknown_style():
+    with pytest.raises(AssertionError):
+        _rows([1.0], [0.1], "html")
@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+import pytest
+
+import aspen.unit_conversions as uc
+from aspen.constants_conversions import AstroConstantsAndUsefulNumbers, PhysicsConstants
+
+ASTRO = AstroConstantsAndUsefulNumbers()
+YEAR = 365.25*86400
+
+# (from, to, factor worked out by hand); the repo's mile is 1609.34 m, hence rel_tol 1e-5
+FACTORS = [
+    ('mi', 'Å', 1609.344*1e10),
+    ('mi', 'km', 1.609344),
+    ('erg/s/cm^2', 'W/m^2', 1e-3),
+    ('Msun/pc^3', 'g/cm^3', ASTRO.M_SUN*1e3/(ASTRO.PARSEC*1e2)**3),
+    ('km/s', 'AU/yr', 1e3*YEAR/ASTRO.AU),
+    ('G', 'T', 1e-4),
+    ('eV', 'J', PhysicsConstants.E_CHARGE),
+    ('MeV', 'erg', 1e6*PhysicsConstants.E_CHARGE*1e7),
+    ('nm', 'Å', 10.0),
+    ('deg', 'arcsec', 3600.0),
+    ('L', 'cm^3', 1e3),
+    ('atm', 'Pa', 101325.0),
+    ('dyn', 'N', 1e-5),
+    ('kcal', 'cal', 1e3),
+    ('Gyr', 'yr', 1e9),
+    ('Lsun', 'erg/s', ASTRO.L_SUN*1e7),
+    ('km^2', 'cm^2', 1e10),
+    ('N m', 'erg', 1e7),
+    ('Hz', '1/s', 1.0),
+    ('g cm^-3', 'kg/m^3', 1e3),
+]
+
+
+@pytest.mark.parametrize('src, dst, expected', FACTORS)
+def test_conversion_factor(src, dst, expected):
+    assert math.isclose(uc.conversion_factor(src, dst), expected, rel_tol=1e-5)
+    assert math.isclose(uc.conversion_factor(dst, src), 1/expected, rel_tol=1e-5)
+
+
+@pytest.mark.parametrize('src, dst', [('m', 's'), ('erg', 'W'), ('Hz', 's'), ('km/s', 'km'), ('G', 'kg')])
+def test_dimension_mismatch_raises(src, dst):
+    with pytest.raises(ValueError, match='Incompatible units'):
+        uc.conversion_factor(src, dst)
+
+
+def test_unknown_unit_raises():
+    with pytest.raises(ValueError, match='Unknown unit'):
+        uc.conversion_factor('furlong', 'm')
+
+
+def test_graph_paths():
+    graph = uc.default_graph()
+    for src, dst in [('mi', 'Å'), ('stone', 'Msun'), ('gal', 'cm^3'), ('BTU', 'eV')]:
+        chain = graph.path(src, dst)
+        assert chain[0] == src and chain[-1] == dst
+        assert all(b in graph.edges[a] for a, b in zip(chain[:-1], chain[1:]))
+    assert graph.path('m', 'm') == ['m']
+    assert graph.to_si('erg/s/cm^2')[1] == (0, 1, -3, 0, 0)
+
+
+@pytest.mark.parametrize('src, dst, expected', [('km', 'm', 1e3), ('m', 'km', 1e-3), ('kg', 'g', 1e3),
+                                                ('Gyr', 'yr', 1e9), ('kcal', 'cal', 1e3), ('cm', 'm', 1e-2)])
+def test_metric_prefixes_are_exact(src, dst, expected):
+    # Prefixed nodes have direct edges to their base unit (no detour through e.g. miles)
+    assert uc.conversion_factor(src, dst) == expected
+    assert len(uc.default_graph().path(src, dst)) == 2
+
+
+def test_convert_array_in_place():
+    values = np.array([1.0, 2.0, 3.0])
+    out = uc.convert(values, 'km', 'm', out=values)
+    assert out is values and np.array_equal(values, [1e3, 2e3, 3e3])
+
+
+# UnitArray
+# =-=-=-=-=-=--==-=-==-=-=-=-==-=-===-=-=-
+
+def _values():
+    return np.random.default_rng(3).uniform(1, 100, 1000)
+
+
+def test_unit_array_chain_matches_explicit_multiplies():
+    x = _values()
+    arr = uc.UnitArray(x, 'mi').to('km').to('cm')*2
+    assert arr.data is x  # nothing computed yet
+    explicit = x*uc.conversion_factor('mi', 'km')*uc.conversion_factor('km', 'cm')*2
+    assert np.allclose(np.asarray(arr), explicit, rtol=1e-14, atol=0)
+    assert np.allclose(arr.value, x*1609.34*100*2, rtol=1e-12, atol=0)
+    assert arr.unit == 'cm'
+
+
+@pytest.mark.parametrize('chain, src, expected', [
+    (['erg/s/cm^2', 'W/m^2', 'erg/s/cm^2'], 'erg/s/cm^2', 1.0),
+    (['Msun/pc^3', 'kg/m^3', 'g/cm^3'], 'Msun/pc^3', ASTRO.M_SUN*1e3/(ASTRO.PARSEC*1e2)**3),
+    (['km/s', 'm/s', 'AU/yr'], 'km/s', 1e3*YEAR/ASTRO.AU),
+])
+def test_unit_array_folded_scale(chain, src, expected):
+    x = _values()
+    arr = uc.UnitArray(x, src)
+    explicit = x.copy()
+    for a, b in zip([src] + chain[:-1], chain):
+        arr = arr.to(b)
+        explicit = explicit*uc.conversion_factor(a, b)
+    assert math.isclose(arr.scale, expected, rel_tol=1e-12)
+    assert np.allclose(np.asarray(arr), explicit, rtol=1e-13, atol=0)
+
+
+def test_unit_array_products_and_sums():
+    d = uc.UnitArray(_values(), 'km')
+    t = uc.UnitArray(_values(), 'min')
+    v = (d/t).to('m/s')
+    assert v.dimension == (1, 0, -1, 0, 0)
+    assert np.allclose(np.asarray(v), d.data*1e3/(t.data*60), rtol=1e-13)
+    area = (d**2).to('cm^2')
+    assert np.allclose(np.asarray(area), (d.data*1e5)**2, rtol=1e-13)
+    total = d + uc.UnitArray(_values(), 'm')
+    assert total.unit == 'km' and np.allclose(np.asarray(total), d.data + _values()/1e3, rtol=1e-13)
+    assert np.allclose(np.asarray(d - d), 0)
+    assert np.allclose(np.asarray(-d*3), -3*d.data)
+
+
+@pytest.mark.parametrize('operation', [lambda a: a.to('s'), lambda a: a + uc.UnitArray(np.ones(3), 'kg'),
+                                       lambda a: a - 1.0, lambda a: (a*a).to('km')])
+def test_unit_array_mismatch_raises(operation):
+    with pytest.raises(ValueError):
+        operation(uc.UnitArray(np.ones(3), 'km'))
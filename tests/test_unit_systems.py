@@ -0,0 +1,86 @@
+import math
+
+import pytest
+
+from aspen import constants_cgs, constants_geometric, constants_natural
+from aspen.constants_conversions import AstroConstantsAndUsefulNumbers, PhysicsConstants
+
+PHY, ASTRO = PhysicsConstants(), AstroConstantsAndUsefulNumbers()
+C_SI = PhysicsConstants.C_LIGHT
+
+# Written out by hand, independently of unit_systems: SI -> CGS-Gaussian factor of each constant, and
+# the exponents of (cm, g, s) of its CGS unit (statC = cm^3/2 g^1/2 s^-1, G = cm^-1/2 g^1/2 s^-1).
+LENGTH, MASS, TIME = (1e2, (1, 0, 0)), (1e3, (0, 1, 0)), (1.0, (0, 0, 1))
+CGS_UNITS = {
+    **dict.fromkeys(['AMU', 'M_PROTON', 'M_NEUTRON', 'M_ELECTRON', 'M_MUON', 'M_ALPHA'], MASS),
+    **dict.fromkeys(['G_NEWTON', 'G_EINSTEIN'], (1e3, (3, -1, -2))),  # cm^3 g^-1 s^-2
+    'C_LIGHT': (1e2, (1, 0, -1)),  # cm/s
+    **dict.fromkeys(['E_CHARGE', 'FARADAY_CHARGE'], (10*C_SI, (1.5, 0.5, -1))),  # statC (per mol)
+    'BOHR_MAGNETON': (1e3, (2.5, 0.5, -1)),  # erg/G
+    **dict.fromkeys(['R_ELECTRON', 'BOHR_RADIUS', 'WIEN_DISPLACEMENT'], LENGTH),  # cm (cm K)
+    **dict.fromkeys(['N_AVOGADRO', 'ALPHA', 'G_FAC_ELECTRON', 'G_FAC_PROTON', 'G_FAC_NEUTRON', 'G_FAC_MUON'],
+                    (1.0, (0, 0, 0))),
+    **dict.fromkeys(['K_BOLTZMANN', 'R_GAS'], (1e7, (2, 1, -2))),  # erg/K (per mol)
+    **dict.fromkeys(['H_PLANCK', 'H_PLANCK_REDUCED'], (1e7, (2, 1, -1))),  # erg s
+    **dict.fromkeys(['SB_CONSTANT', 'SIGMA_SB'], (1e3, (0, 1, -3))),  # erg s^-1 cm^-2 K^-4
+    'A_RADIATION': (10.0, (-1, 1, -2)),  # erg cm^-3 K^-4
+    **dict.fromkeys(['AU', 'PARSEC', 'LIGHT_YEAR', 'R_SUN', 'R_EARTH', 'R_JUPITER', 'R_MOON', 'A_EARTH',
+                     'A_JUPITER', 'A_MOON', 'MW_RADIUS', 'MW_SCALE_LENGTH', 'R_UNIVERSE'], LENGTH),
+    **dict.fromkeys(['SOLAR_DAY', 'SIDEREAL_DAY', 'SOLAR_YEAR', 'SIDEREAL_YEAR', 'AGE_SUN', 'HUBBLE_TIME_SI',
+                     'AGE_UNIVERSE'], TIME),
+    'H0_HUBBLE_SI': (1.0, (0, 0, -1)),
+    **dict.fromkeys(['M_SUN', 'M_EARTH', 'M_JUPITER', 'M_MOON', 'MW_MASS_HIGH', 'MW_MASS_LOW',
+                     'MW_DARKMATTER_MASS_HIGH', 'MW_DARKMATTER_MASS_LOW', 'MW_STELLAR_MASS_HIGH',
+                     'MW_STELLAR_MASS_LOW', 'MW_BLACKHOLE_MASS'], MASS),
+    **dict.fromkeys(['L_SUN', 'MW_LUMINOSITY'], (1e7, (2, 1, -3))),  # erg/s
+    **dict.fromkeys(['G_SUN', 'MW_BRIGHTNESS'], (1e3, (0, 1, -3))),  # erg s^-1 cm^-2
+    **dict.fromkeys(['DEN_SUN', 'DEN_EARTH', 'DEN_JUPITER', 'DEN_MOON'], (1e-3, (-3, 1, 0))),  # g/cm^3
+    'MU_SUN': (1e6, (3, 0, -2)),  # cm^3/s^2
+    **dict.fromkeys(['B_SUN', 'B_EARTH', 'B_JUPITER'], (1e4, (-0.5, 0.5, -1))),  # G
+}
+
+
+def _si_value(name):
+    return float(getattr(PHY, name) if hasattr(PHY, name) else getattr(ASTRO, name))
+
+
+def _expected_cgs():
+    values = {name: _si_value(name)*factor for name, (factor, _) in CGS_UNITS.items()}
+    values['K_COULOMB'] = 1.0
+    return values
+
+
+# (cm, g, s) of each system's units of length, mass and time
+HBAR_CGS, C_CGS, G_CGS, EV_CGS = (1e7*PHY.H_PLANCK_REDUCED, 1e2*C_SI, 1e3*PHY.G_NEWTON, 1e7*PHY.E_CHARGE)
+SYSTEM_UNITS = {
+    'cgs': (1.0, 1.0, 1.0),
+    'natural': (HBAR_CGS*C_CGS/EV_CGS, EV_CGS/C_CGS**2, HBAR_CGS/EV_CGS),  # 1/eV, eV, 1/eV
+    'geometric': (1e2, 1e2*C_CGS**2/G_CGS, 1e2/C_CGS),  # 1 m
+}
+MODULES = {'cgs': constants_cgs, 'natural': constants_natural, 'geometric': constants_geometric}
+
+
+@pytest.mark.parametrize('system', list(MODULES))
+def test_every_constant_matches_hand_written_factors(system):
+    module, (length, mass, time) = MODULES[system], SYSTEM_UNITS[system]
+    cgs = _expected_cgs()
+    assert set(module.__all__) == set(cgs)
+    for name in module.__all__:
+        value = getattr(module, name)
+        assert type(value) is float, name
+        if name == 'K_COULOMB':
+            assert value == 1.0
+            continue
+        a, b, c = CGS_UNITS[name][1]
+        assert math.isclose(value, cgs[name] / (length**a * mass**b * time**c), rel_tol=1e-9), name
+
+
+def test_known_values():
+    assert math.isclose(constants_cgs.C_LIGHT, 2.99792458e10)
+    assert math.isclose(constants_cgs.E_CHARGE, 4.80320e-10, rel_tol=1e-5)  # statC
+    assert math.isclose(constants_cgs.M_ELECTRON, 9.1093837e-28, rel_tol=1e-6)
+    assert math.isclose(constants_natural.M_ELECTRON, 0.51099895e6, rel_tol=1e-6)  # eV
+    assert math.isclose(constants_natural.E_CHARGE, math.sqrt(constants_natural.ALPHA), rel_tol=1e-9)
+    assert math.isclose(constants_natural.C_LIGHT, 1.0) and math.isclose(constants_natural.H_PLANCK_REDUCED, 1.0)
+    assert math.isclose(constants_geometric.C_LIGHT, 1.0) and math.isclose(constants_geometric.G_NEWTON, 1.0)
+    assert math.isclose(constants_geometric.M_SUN, 1476.6, rel_tol=1e-3)  # GM/c^2 in m